@@ -13,8 +13,11 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_SERVER = os.getenv("DB_SERVER")
 DB_NAME = os.getenv("DB_NAME")
 
+# A full DATABASE_URL in .env takes precedence over the individual settings
+DATABASE_URL = os.getenv("DATABASE_URL")
+
 # Validate required environment variables
-if not all([DB_USERNAME, DB_PASSWORD, DB_SERVER, DB_NAME]):
+if not DATABASE_URL and not all([DB_USERNAME, DB_PASSWORD, DB_SERVER, DB_NAME]):
     raise ValueError(
         "Missing database configuration. Please set these in backend/.env:\n"
         "  DB_USERNAME=your_username\n"
@@ -23,20 +26,76 @@ if not all([DB_USERNAME, DB_PASSWORD, DB_SERVER, DB_NAME]):
         "  DB_NAME=your_database"
     )
 
-DATABASE_URL = f"mssql+pyodbc://{DB_USERNAME}:{DB_PASSWORD}@{DB_SERVER}/{DB_NAME}?driver=ODBC+Driver+17+for+SQL+Server"
+DATABASE_URL = DATABASE_URL or f"mssql+pyodbc://{DB_USERNAME}:{DB_PASSWORD}@{DB_SERVER}/{DB_NAME}?driver=ODBC+Driver+17+for+SQL+Server"
 SQLALCHEMY_DATABASE_URL = DATABASE_URL
 
+# Async driver for the same database, used by the read endpoints
+ASYNC_DRIVERS = {
+    "mssql+pyodbc://": "mssql+aioodbc://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or next(
+    (async_prefix + DATABASE_URL[len(prefix):] for prefix, async_prefix in ASYNC_DRIVERS.items() if DATABASE_URL.startswith(prefix)),
+    DATABASE_URL,
+)
+
+# Connection Pool Settings (per worker process: at most workers x (size + overflow) connections)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))  # connections kept open
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))  # extra connections opened under load
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # reconnect after this many seconds; -1 to disable
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "True") == "True"  # test each connection on checkout
+DB_FAST_EXECUTEMANY = os.getenv("DB_FAST_EXECUTEMANY", "True") == "True"  # pyodbc bulk parameter binding
+
 # Application Settings
 APP_NAME = "USSI Legal Document Tracker API"
 APP_VERSION = "1.0.0"
 DEBUG = os.getenv("DEBUG", "False") == "True"
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "True") == "True"  # encode responses with pydantic-core
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", 1024))  # bytes; smaller responses are sent uncompressed
+GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", 6))  # 1 (fastest) to 9 (smallest)
 
 # File Upload Settings
 UPLOAD_DIRECTORY = os.getenv("UPLOAD_DIRECTORY", "uploads/")
 MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50 MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB blocks when copying uploads to disk
 ALLOWED_PDF_EXTENSIONS = {".pdf"}
 ALLOWED_DOCX_EXTENSIONS = {".docx", ".doc"}
 
+# PDF Extraction Settings
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", os.cpu_count() or 1))
+PDF_PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", 50))  # below this, extract in-process
+
+# Excel Export Settings
+EXPORT_SPOOL_MAX_SIZE = int(os.getenv("EXPORT_SPOOL_MAX_SIZE", 5 * 1024 * 1024))  # larger workbooks spill to disk
+EXPORT_CHUNK_SIZE = 64 * 1024  # bytes per streamed response chunk
+EXPORT_MAX_WORKERS = int(os.getenv("EXPORT_MAX_WORKERS", 2))  # worker processes for batch exports
+
+# Extraction Cache Settings
+EXTRACTION_CACHE_DIRECTORY = os.getenv("EXTRACTION_CACHE_DIRECTORY", "cache/extractions/")
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", 100 * 1024 * 1024))  # 100 MB
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", 5000))
+
+# Template Cache Settings
+TEMPLATE_CACHE_MAX_BYTES = int(os.getenv("TEMPLATE_CACHE_MAX_BYTES", 64 * 1024 * 1024))  # 64 MB of template files
+TEMPLATE_CACHE_MAX_ENTRIES = int(os.getenv("TEMPLATE_CACHE_MAX_ENTRIES", 64))
+
+# Lookup Cache Settings (per worker process; other workers see a change after the TTL)
+LOOKUP_CACHE_TTL = float(os.getenv("LOOKUP_CACHE_TTL", 300))  # seconds
+
+# Project Search Settings (the index is per worker process and rebuilt after this many seconds)
+PROJECT_SEARCH_REFRESH = float(os.getenv("PROJECT_SEARCH_REFRESH", 300))  # seconds
+
+# Document Generation Settings
+GENERATED_DOCUMENT_DIRECTORY = os.getenv("GENERATED_DOCUMENT_DIRECTORY", "generated/")
+DOCUMENT_MAX_WORKERS = int(os.getenv("DOCUMENT_MAX_WORKERS", 2))  # worker processes for batch generation
+DOCUMENT_LEASE_SECONDS = int(os.getenv("DOCUMENT_LEASE_SECONDS", 600))  # a batch without progress for this long may be restarted
+
+# Title Ingestion Job Settings
+INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", 2))
+INGEST_PROGRESS_INTERVAL = int(os.getenv("INGEST_PROGRESS_INTERVAL", 10))  # pages between progress updates
+INGEST_LEASE_SECONDS = int(os.getenv("INGEST_LEASE_SECONDS", 1800))  # a claimed job is taken over after this long without progress
+
 # CORS Settings
 ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -46,5 +105,7 @@ ALLOWED_ORIGINS = [
     "http://127.0.0.1:5173",
 ]
 
-# Create upload directory if it doesn't exist
+# Create upload, cache and output directories if they don't exist
 os.makedirs(UPLOAD_DIRECTORY, exist_ok=True)
+os.makedirs(EXTRACTION_CACHE_DIRECTORY, exist_ok=True)
+os.makedirs(GENERATED_DOCUMENT_DIRECTORY, exist_ok=True)
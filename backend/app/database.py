@@ -1,20 +1,112 @@
 """
 SQLAlchemy database configuration and session management.
 """
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Dict, Any
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import StaticPool
-from app.config import SQLALCHEMY_DATABASE_URL, DEBUG
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from app.config import (
+    SQLALCHEMY_DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DEBUG,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_FAST_EXECUTEMANY,
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that counts checkouts, waits for a free connection and timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._timeouts = 0
+        self._peak_checked_out = 0
+
+    def _do_get(self):
+        # Every connection is checked out and no overflow is left: this
+        # checkout has to wait for another request to return one
+        exhausted = (
+            self.checkedin() == 0
+            and self._max_overflow > -1
+            and self.overflow() >= self._max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            with self._metrics_lock:
+                self._waits += 1
+                self._wait_seconds += time.perf_counter() - start
+                self._timeouts += 1
+            raise
+
+        with self._metrics_lock:
+            self._checkouts += 1
+            if exhausted:
+                self._waits += 1
+                self._wait_seconds += time.perf_counter() - start
+            self._peak_checked_out = max(self._peak_checked_out, self.checkedout())
+        return record
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return current pool usage and counters since the pool was created."""
+        with self._metrics_lock:
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "peak_checked_out": self._peak_checked_out,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_seconds": round(self._wait_seconds, 3),
+                "timeouts": self._timeouts,
+            }
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool for the asyncio engine."""
+
+
+def _engine_options(url: str, poolclass: type = InstrumentedQueuePool) -> Dict[str, Any]:
+    """Pool and driver options for the configured database."""
+    connect_args = {"check_same_thread": False} if "sqlite" in url else {}
+    if "sqlite" in url and (":memory:" in url or url.endswith("://")):
+        # In-memory SQLite keeps the dialect's default single-connection pool
+        return {"connect_args": connect_args}
+
+    options = {
+        "connect_args": connect_args,
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,  # Validate connections before using them
+    }
+    if url.startswith("mssql+pyodbc"):
+        options["fast_executemany"] = DB_FAST_EXECUTEMANY
+    return options
+
 
 # Create engine
 # For MSSQL: use pyodbc
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     echo=DEBUG,  # Log SQL queries if DEBUG=True
-    connect_args={
-        "check_same_thread": False,
-    } if "sqlite" in SQLALCHEMY_DATABASE_URL else {},
-    pool_pre_ping=True,  # Validate connections before using them
+    **_engine_options(SQLALCHEMY_DATABASE_URL),
 )
 
 # Session factory
@@ -24,6 +116,21 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# Async engine and session factory for the async read endpoints; each has
+# its own pool sized by the same settings
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=DEBUG,
+    **_engine_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool),
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base class for all models
 Base = declarative_base()
 
@@ -37,6 +144,20 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency for FastAPI to inject an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_metrics() -> Dict[str, Any]:
+    """Report connection pool usage of both engines for tuning the pool settings."""
+    return {
+        name: pool.metrics() if isinstance(pool, InstrumentedQueuePool) else {"status": pool.status()}
+        for name, pool in (("sync", engine.pool), ("async", async_engine.pool))
+    }
+
+
 def create_all_tables():
     """Create all tables defined in models."""
     Base.metadata.create_all(bind=engine)
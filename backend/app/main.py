@@ -4,11 +4,29 @@ Main entry point for the backend server.
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import APP_NAME, APP_VERSION, ALLOWED_ORIGINS, DEBUG
-from app.database import create_all_tables
+from fastapi.responses import JSONResponse
+from app.config import (
+    APP_NAME,
+    APP_VERSION,
+    ALLOWED_ORIGINS,
+    DEBUG,
+    FAST_JSON_RESPONSES,
+    GZIP_MINIMUM_SIZE,
+    GZIP_COMPRESS_LEVEL,
+)
+from app.database import AsyncSessionLocal, async_engine, create_all_tables, pool_metrics
 # Import models to register them with Base.metadata before create_all_tables()
 import app.models  # noqa: F401
 from app.routes import projects, titles, documents, lookups
+from app.services.compression import CompressionMiddleware
+from app.services.document_batch import DocumentBatchService
+from app.services.ingest_jobs import TitleIngestJobService
+from app.services.json_response import FastJSONResponse
+from app.services.lookup_cache import LookupCacheService
+from app.services.pagination import PAGINATION_HEADERS
+from app.services.project_search import ProjectSearchService
+from app.services.pdf_processor import PDFProcessorService
+from app.services.project_export import ProjectExportService
 
 # Create FastAPI app
 app = FastAPI(
@@ -16,6 +34,8 @@ app = FastAPI(
     version=APP_VERSION,
     description="API for managing legal documents and encumbrances",
     debug=DEBUG,
+    # Routes on FastJSONRoute routers encode their response_model straight to bytes
+    default_response_class=FastJSONResponse if FAST_JSON_RESPONSES else JSONResponse,
 )
 
 # Add CORS middleware
@@ -25,22 +45,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=PAGINATION_HEADERS + ["ETag"],
 )
 
+# Compress large responses (project detail and title lists are big, repetitive JSON)
+app.add_middleware(CompressionMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
+
 
 # Event handlers
 @app.on_event("startup")
 async def startup():
     """Initialize database on startup."""
     # create_all_tables()  # Commented out - tables already exist in database
+    requeued = TitleIngestJobService.resume_pending()
+    async with AsyncSessionLocal() as db:
+        await LookupCacheService.load(db)
+        indexed = await ProjectSearchService.rebuild(db)
     print(f"✓ {APP_NAME} v{APP_VERSION} started")
     print(f"✓ Database connected")
+    print(f"✓ Indexed {indexed} project(s) for search")
     print(f"✓ API docs available at: http://localhost:8000/docs")
+    if requeued:
+        print(f"✓ Requeued {requeued} title ingestion job(s)")
 
 
 @app.on_event("shutdown")
 async def shutdown():
     """Cleanup on shutdown."""
+    TitleIngestJobService.shutdown()
+    PDFProcessorService.shutdown()
+    ProjectExportService.shutdown()
+    DocumentBatchService.shutdown()
+    await async_engine.dispose()
     print(f"✓ {APP_NAME} shutting down")
 
 
@@ -55,6 +91,12 @@ async def health_check():
     }
 
 
+@app.get("/health/db-pool")
+def db_pool_health():
+    """Database connection pool usage: checkouts, waits, timeouts and overflow."""
+    return pool_metrics()
+
+
 # Include routers
 app.include_router(projects.router)
 app.include_router(titles.router)
@@ -8,9 +8,9 @@ from app.models.lookups import (
     DocumentCategory,
     LegalDocumentTemplate,
 )
-from app.models.title import TitleDocument, Encumbrance
+from app.models.title import TitleDocument, Encumbrance, EncumbranceSearchTerm, TitleIngestJob
 from app.models.project import SurveyorALS, Project
-from app.models.document import LegalDocument, DocumentTask
+from app.models.document import LegalDocument, DocumentTask, DocumentGenerationRun
 
 __all__ = [
     # Lookups
@@ -22,10 +22,13 @@ __all__ = [
     # Title
     "TitleDocument",
     "Encumbrance",
+    "EncumbranceSearchTerm",
+    "TitleIngestJob",
     # Project
     "SurveyorALS",
     "Project",
     # Document
     "LegalDocument",
     "DocumentTask",
+    "DocumentGenerationRun",
 ]
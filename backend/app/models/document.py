@@ -1,8 +1,9 @@
 """
 SQLAlchemy models for legal documents and document tasks.
 """
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, DateTime
 from sqlalchemy.orm import relationship
+from datetime import datetime
 from app.database import Base
 
 
@@ -11,7 +12,7 @@ class LegalDocument(Base):
     __tablename__ = "LegalDocument"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("Project.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("Project.id"), nullable=False, index=True)
     file_path = Column(String(500), nullable=False)
     document_type = Column(String(100), nullable=True)
     registered_number = Column(String(100), nullable=True)
@@ -27,17 +28,18 @@ class DocumentTask(Base):
     __tablename__ = "DocumentTaskRow"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("Project.id"), nullable=False)
-    category_id = Column(Integer, ForeignKey("DocumentCategory.id"), nullable=True)  # NULL = New Agreements
+    project_id = Column(Integer, ForeignKey("Project.id"), nullable=False, index=True)
+    category_id = Column(Integer, ForeignKey("DocumentCategory.id"), nullable=True, index=True)  # NULL = New Agreements
     item_no = Column(Integer, nullable=False)
     doc_desc = Column(String(500), nullable=True)
     copies_dept = Column(String(200), nullable=True)
     signatories = Column(String(500), nullable=True)
     condition_of_approval = Column(Text, nullable=True)
     circulation_notes = Column(Text, nullable=True)
-    document_status_id = Column(Integer, ForeignKey("DocumentTaskStatus.id"), nullable=True)
-    legal_document_template_id = Column(Integer, ForeignKey("LegalDocumentTemplate.id"), nullable=True)
-    legal_document_id = Column(Integer, ForeignKey("LegalDocument.id"), nullable=True)
+    document_status_id = Column(Integer, ForeignKey("DocumentTaskStatus.id"), nullable=True, index=True)
+    legal_document_template_id = Column(Integer, ForeignKey("LegalDocumentTemplate.id"), nullable=True, index=True)
+    legal_document_id = Column(Integer, ForeignKey("LegalDocument.id"), nullable=True, index=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped on every update
 
     # Relationships
     project = relationship("Project", back_populates="document_tasks")
@@ -46,3 +48,16 @@ class DocumentTask(Base):
     legal_document_template = relationship("LegalDocumentTemplate")
     legal_document = relationship("LegalDocument")
 
+
+class DocumentGenerationRun(Base):
+    """The latest document generation batch of a project, shared by every worker process"""
+    __tablename__ = "DocumentGenerationRun"
+
+    project_id = Column(Integer, ForeignKey("Project.id", ondelete="CASCADE"), primary_key=True)
+    state = Column(String(20), nullable=False)  # running, complete, failed
+    total = Column(Integer, nullable=False, default=0)
+    done = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    lease_until = Column(DateTime, nullable=True)  # A running batch not renewed by then is treated as abandoned
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
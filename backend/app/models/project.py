@@ -1,7 +1,7 @@
 """
 SQLAlchemy models for project, and surveyor.
 """
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -29,9 +29,18 @@ class Project(Base):
     name = Column(String(300), nullable=False)
     surveyor_id = Column(Integer, ForeignKey("SurveyorALS.id"), nullable=True)
     municipality = Column(String(200), nullable=True)
+    # Bumped on every write to the project, its titles, encumbrances or tasks
+    data_version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relationships
     surveyor = relationship("SurveyorALS", back_populates="projects")
     title_documents = relationship("TitleDocument", back_populates="project", cascade="all, delete-orphan")
     legal_documents = relationship("LegalDocument", back_populates="project", cascade="all, delete-orphan")
     document_tasks = relationship("DocumentTask", back_populates="project", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Project search by surveyor in number order, and the name sort of the project list
+        Index("ix_Project_surveyor_id_proj_num", "surveyor_id", "proj_num"),
+        Index("ix_Project_name", "name"),
+        Index("ix_Project_municipality", "municipality"),
+    )
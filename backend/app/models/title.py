@@ -1,7 +1,7 @@
 """
 SQLAlchemy models for title documents and encumbrances.
 """
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Date
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Date, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -12,7 +12,7 @@ class TitleDocument(Base):
     __tablename__ = "TitleDocument"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("Project.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("Project.id"), nullable=False, index=True)
     file_path = Column(String(500), nullable=False)
     uploaded_by = Column(String(200), nullable=True)
     uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -27,19 +27,57 @@ class Encumbrance(Base):
     __tablename__ = "EncumbranceRow"
 
     id = Column(Integer, primary_key=True, index=True)
-    title_document_id = Column(Integer, ForeignKey("TitleDocument.id"), nullable=False)
+    title_document_id = Column(Integer, ForeignKey("TitleDocument.id"), nullable=False, index=True)
     item_no = Column(Integer, nullable=False)
     document_number = Column(String(100), nullable=True)
     encumbrance_date = Column(Date, nullable=True)
     description = Column(Text, nullable=True)
     signatories = Column(String(500), nullable=True)
-    action_id = Column(Integer, ForeignKey("EncumbranceAction.id"), nullable=True)
-    status_id = Column(Integer, ForeignKey("EncumbranceStatus.id"), nullable=True)
+    action_id = Column(Integer, ForeignKey("EncumbranceAction.id"), nullable=True, index=True)
+    status_id = Column(Integer, ForeignKey("EncumbranceStatus.id"), nullable=True, index=True)
     circulation_notes = Column(Text, nullable=True)
-    legal_document_id = Column(Integer, ForeignKey("LegalDocument.id"), nullable=True)
+    legal_document_id = Column(Integer, ForeignKey("LegalDocument.id"), nullable=True, index=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped on every update
 
     # Relationships
     title_document = relationship("TitleDocument", back_populates="encumbrances")
     action = relationship("EncumbranceAction")
     status = relationship("EncumbranceStatus")
     legal_document = relationship("LegalDocument")
+
+
+class EncumbranceSearchTerm(Base):
+    """Inverted index over encumbrance document numbers, descriptions and signatories"""
+    __tablename__ = "EncumbranceSearchTerm"
+
+    # Clustered on term, so each term's postings are read in one range scan
+    term = Column(String(100), primary_key=True)
+    encumbrance_id = Column(
+        Integer, ForeignKey("EncumbranceRow.id", ondelete="CASCADE"), primary_key=True
+    )
+    weight = Column(Integer, nullable=False)  # Occurrences, weighted by field
+
+    __table_args__ = (
+        # Top hits for one term, read in weight order without a sort
+        Index("ix_EncumbranceSearchTerm_term_weight", "term", "weight", "encumbrance_id"),
+        # Reindexing and deleting one encumbrance's terms
+        Index("ix_EncumbranceSearchTerm_encumbrance_id", "encumbrance_id"),
+    )
+
+
+class TitleIngestJob(Base):
+    """Background ingestion job for an uploaded title certificate PDF"""
+    __tablename__ = "TitleIngestJob"
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("Project.id", ondelete="CASCADE"), nullable=False, index=True)
+    file_path = Column(String(500), nullable=False)
+    state = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, complete, failed
+    pages_total = Column(Integer, nullable=True)
+    pages_done = Column(Integer, nullable=False, default=0)
+    title_document_id = Column(Integer, nullable=True)  # Set once the TitleDocument is created
+    owner = Column(String(100), nullable=True)  # Worker process that claimed the job
+    lease_until = Column(DateTime, nullable=True)  # Claim expires unless renewed by progress before then
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
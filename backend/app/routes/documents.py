@@ -1,23 +1,38 @@
 """
 API routes for document task and document generation endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import DocumentTask, LegalDocument, DocumentCategory
+from app.database import get_db, get_async_db
+from app.models import DocumentTask, LegalDocument, DocumentCategory, Project
 from app.schemas.document import (
     DocumentTaskCreate,
     DocumentTaskUpdate,
+    DocumentTaskBulkUpdate,
+    DocumentTaskBulkCreate,
+    DocumentTaskReorder,
     DocumentTaskResponse,
     DocumentCategoryCreate,
     DocumentCategoryResponse,
 )
-from typing import List
+from app.services.bulk_update import BulkUpdateService, MAX_STATEMENT_PARAMETERS
+from app.services.document_tasks import DocumentTaskService
+from app.services.json_response import FastJSONRoute
+from app.services.lookup_cache import LookupCacheService, DOCUMENT_CATEGORIES
+from app.services.pagination import paginate
+from app.services.project_version import ProjectVersionService
+from app.services.query_profiles import DOCUMENT_TASK_RESPONSE
+from typing import List, Optional
 
-router = APIRouter(prefix="/api/documents", tags=["documents"])
+router = APIRouter(prefix="/api/documents", tags=["documents"], route_class=FastJSONRoute)
 
 EXISTING_ENCUMBRANCES_CATEGORY_ID = 3
 
+# Document task fields a client may edit
+UPDATABLE_FIELDS = list(DocumentTaskUpdate.model_fields)
+
 @router.post("", response_model=DocumentTaskResponse)
 def create_document_task(
     doc_task: DocumentTaskCreate,
@@ -28,47 +43,163 @@ def create_document_task(
     if db_task.category_id is None:
         db_task.category_id=EXISTING_ENCUMBRANCES_CATEGORY_ID
     db.add(db_task)
+    ProjectVersionService.bump(db, db_task.project_id)
     db.commit()
     db.refresh(db_task)
     return db_task
 
 
+def _load_tasks(db: Session, task_ids: List[int]) -> List[DocumentTask]:
+    """Load tasks for DocumentTaskResponse, in the order of task_ids (a reordered section can be long)."""
+    tasks = {}
+    for start in range(0, len(task_ids), MAX_STATEMENT_PARAMETERS):
+        chunk = task_ids[start:start + MAX_STATEMENT_PARAMETERS]
+        query = db.query(DocumentTask).options(*DOCUMENT_TASK_RESPONSE).filter(DocumentTask.id.in_(chunk))
+        tasks.update((task.id, task) for task in query)
+    return [tasks[task_id] for task_id in task_ids]
+
+
+@router.post("/bulk", response_model=List[DocumentTaskResponse])
+def create_document_tasks(
+    section: DocumentTaskBulkCreate,
+    db: Session = Depends(get_db),
+):
+    """
+    Create several tasks in one section (project and category) in one statement.
+
+    Tasks without an item_no are numbered after the section's last task.
+    Returns the created tasks in the order given.
+    """
+    category_id = section.category_id
+    if category_id is None:
+        category_id = EXISTING_ENCUMBRANCES_CATEGORY_ID
+    task_ids = DocumentTaskService.create_many(
+        db,
+        section.project_id,
+        category_id,
+        [task.dict() for task in section.tasks],
+    )
+    if not task_ids:
+        return []
+    ProjectVersionService.bump(db, section.project_id)
+    db.commit()
+    return _load_tasks(db, task_ids)
+
+
+@router.post("/reorder", response_model=List[DocumentTaskResponse])
+def reorder_document_tasks(
+    section: DocumentTaskReorder,
+    db: Session = Depends(get_db),
+):
+    """
+    Renumber a section's tasks 1..n in the order given, in one statement
+    (one per MAX_STATEMENT_PARAMETERS // 3 renumbered tasks).
+
+    Tasks of the section that are not listed follow in their current order.
+    Returns the whole section in its new order.
+    """
+    category_id = section.category_id
+    if category_id is None:
+        category_id = EXISTING_ENCUMBRANCES_CATEGORY_ID
+    task_ids = DocumentTaskService.reorder(db, section.project_id, category_id, section.task_ids)
+    ProjectVersionService.bump(db, section.project_id)
+    db.commit()
+    return _load_tasks(db, task_ids)
+
+
 @router.get("", response_model=List[DocumentTaskResponse])
-def list_document_tasks(
+async def list_document_tasks(
     project_id: int,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get all document tasks for a project (cursor pagination as in list_projects).
+    Returns 304 if the client's ETag for this page is still current.
+    """
+    not_modified = await ProjectVersionService.not_modified(
+        db, request, response, Project.id == project_id, variant=request.url.query
+    )
+    if not_modified:
+        return not_modified
+
+    page = await paginate(
+        db,
+        select(DocumentTask)
+        .options(*DOCUMENT_TASK_RESPONSE)
+        .filter(DocumentTask.project_id == project_id),
+        DocumentTask,
+        sort="id",
+        sort_columns={"id": DocumentTask.id},
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        include_total=include_total,
+    )
+    return page.apply_headers(response)
+
+
+@router.patch("", response_model=List[DocumentTaskResponse])
+def bulk_update_document_tasks(
+    project_id: int,
+    updates: List[DocumentTaskBulkUpdate],
     db: Session = Depends(get_db),
 ):
-    """Get all document tasks for a project."""
-    tasks = (
-        db.query(DocumentTask).order_by(DocumentTask.id)
-        .filter(DocumentTask.project_id == project_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    """
+    Update many document tasks of a project in one transaction.
+
+    Same contract as PATCH /api/titles/{title_id}/encumbrances: all rows are
+    saved or none are, and only the rows that changed are returned.
+    """
+    rows = []
+    for row in updates:
+        update_data = row.dict(exclude_unset=True)
+        if "category_id" in update_data and update_data["category_id"] is None:
+            update_data["category_id"] = EXISTING_ENCUMBRANCES_CATEGORY_ID
+        rows.append(update_data)
+
+    changes = BulkUpdateService.apply(
+        db,
+        DocumentTask,
+        DocumentTask.project_id == project_id,
+        rows,
+        UPDATABLE_FIELDS,
     )
-    return tasks
+    if not changes:
+        return []
+    ProjectVersionService.bump(db, project_id)
+    db.commit()
+    return _load_tasks(db, [change.id for change in changes])
 
 @router.post("/category", response_model=DocumentCategoryResponse)
 def create_category(category: DocumentCategoryCreate, db: Session = Depends(get_db)):
     db_category = DocumentCategory(**category.dict())
     db.add(db_category)
     db.commit()
+    LookupCacheService.invalidate(DOCUMENT_CATEGORIES)
     db.refresh(db_category)
     return db_category
 
 
 @router.get("/category", response_model=List[DocumentCategoryResponse])
-def list_document_categories(db: Session = Depends(get_db)):
+async def list_document_categories(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get all document categories."""
-    categories = db.query(DocumentCategory).order_by(DocumentCategory.id).all()
-    return categories
+    return LookupCacheService.response(request, await LookupCacheService.get(db, DOCUMENT_CATEGORIES))
 
 @router.get("/{task_id}", response_model=DocumentTaskResponse)
-def get_document_task(task_id: int, db: Session = Depends(get_db)):
+async def get_document_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific document task."""
-    task = db.query(DocumentTask).filter(DocumentTask.id == task_id).first()
+    result = await db.execute(
+        select(DocumentTask)
+        .options(*DOCUMENT_TASK_RESPONSE)
+        .filter(DocumentTask.id == task_id)
+    )
+    task = result.scalars().first()
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -96,6 +227,8 @@ def update_document_task(
         update_data["category_id"] = EXISTING_ENCUMBRANCES_CATEGORY_ID
     for field, value in update_data.items():
         setattr(db_task, field, value)
+    db_task.version = DocumentTask.version + 1
+    ProjectVersionService.bump(db, db_task.project_id)
 
     db.commit()
     db.refresh(db_task)
@@ -112,5 +245,6 @@ def delete_document_task(task_id: int, db: Session = Depends(get_db)):
             detail="Document task not found",
         )
 
+    ProjectVersionService.bump(db, db_task.project_id)
     db.delete(db_task)
     db.commit()
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.lookups import EncumbranceAction, EncumbranceStatus, DocumentTaskStatus
 from app.schemas.lookups import (
     EncumbranceActionCreate,
@@ -11,9 +12,16 @@ from app.schemas.lookups import (
     DocumentStatusCreate,
     DocumentStatusResponse,
 )
+from app.services.json_response import FastJSONRoute
+from app.services.lookup_cache import (
+    LookupCacheService,
+    ENCUMBRANCE_ACTIONS,
+    ENCUMBRANCE_STATUSES,
+    DOCUMENT_TASK_STATUSES,
+)
 from typing import List
 
-router = APIRouter(prefix="/api/lookups", tags=["Lookups"])
+router = APIRouter(prefix="/api/lookups", tags=["Lookups"], route_class=FastJSONRoute)
 
 
 @router.post(
@@ -44,6 +52,7 @@ def create_encumbrance_action(
 
     db.add(action)
     db.commit()
+    LookupCacheService.invalidate(ENCUMBRANCE_ACTIONS)
     db.refresh(action)
     return action
 
@@ -76,6 +85,7 @@ def create_encumbrance_status(
 
     db.add(status_obj)
     db.commit()
+    LookupCacheService.invalidate(ENCUMBRANCE_STATUSES)
     db.refresh(status_obj)
     return status_obj
 
@@ -84,28 +94,18 @@ def create_encumbrance_status(
     "/encumbrance-actions",
     response_model=List[EncumbranceActionResponse],
 )
-def list_encumbrance_actions(db: Session = Depends(get_db)):
+async def list_encumbrance_actions(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get all encumbrance actions."""
-    actions = (
-        db.query(EncumbranceAction)
-        .order_by(EncumbranceAction.id)
-        .all()
-    )
-    return actions
+    return LookupCacheService.response(request, await LookupCacheService.get(db, ENCUMBRANCE_ACTIONS))
 
 
 @router.get(
     "/encumbrance-statuses",
     response_model=List[EncumbranceStatusResponse],
 )
-def list_encumbrance_statuses(db: Session = Depends(get_db)):
+async def list_encumbrance_statuses(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get all encumbrance statuses."""
-    statuses = (
-        db.query(EncumbranceStatus)
-        .order_by(EncumbranceStatus.id)
-        .all()
-    )
-    return statuses
+    return LookupCacheService.response(request, await LookupCacheService.get(db, ENCUMBRANCE_STATUSES))
 
 @router.post(
     "/new-document-statuses",
@@ -134,6 +134,7 @@ def create_document_status(
 
     db.add(status_obj)
     db.commit()
+    LookupCacheService.invalidate(DOCUMENT_TASK_STATUSES)
     db.refresh(status_obj)
     return status_obj
 
@@ -142,11 +143,6 @@ def create_document_status(
     "/new-document-statuses",
     response_model=List[DocumentStatusResponse],
 )
-def list_document_actions(db: Session = Depends(get_db)):
+async def list_document_actions(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get all document actions."""
-    actions = (
-        db.query(DocumentTaskStatus)
-        .order_by(DocumentTaskStatus.id)
-        .all()
-    )
-    return actions
\ No newline at end of file
+    return LookupCacheService.response(request, await LookupCacheService.get(db, DOCUMENT_TASK_STATUSES))
\ No newline at end of file
@@ -1,37 +1,53 @@
 """
 API routes for project management endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.project import Project, SurveyorALS
 from app.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
     ProjectResponse,
+    ProjectSummary,
     ProjectDetailResponse,
+    ProjectExportRequest,
     SurveyorCreate,
     SurveyorResponse,
 )
-from typing import List, Dict
-import io
-from app.services.excel_generator import ExcelGeneratorService
-router = APIRouter(prefix="/api/projects", tags=["projects"])
+from app.schemas.document import DocumentGenerationRequest, DocumentGenerationProgressResponse
+from typing import List, Optional
+from app.services.project_export import (
+    ProjectExportService,
+    LookupSnapshot,
+    XLSX_MEDIA_TYPE,
+    iter_file_chunks,
+)
+from app.services.document_batch import DocumentBatchService
+from app.services.encumbrance_search import EncumbranceSearchService
+from app.services.json_response import FastJSONRoute
+from app.services.pagination import paginate
+from app.services.project_search import ProjectSearchService
+from app.services.project_version import ProjectVersionService
+from app.services.query_profiles import PROJECT_RESPONSE, PROJECT_DETAIL_RESPONSE, PROJECT_SUMMARY
+router = APIRouter(prefix="/api/projects", tags=["projects"], route_class=FastJSONRoute)
 
 
 # Surveyor Endpoints
 @router.get("/surveyors", response_model=List[SurveyorResponse])
-def list_surveyors(db: Session = Depends(get_db)):
+async def list_surveyors(db: AsyncSession = Depends(get_async_db)):
     """Get all surveyors in the system."""
-    surveyors = db.query(SurveyorALS).all()
-    return surveyors
+    result = await db.execute(select(SurveyorALS))
+    return result.scalars().all()
 
 
 @router.get("/surveyors/{surveyor_id}", response_model=SurveyorResponse)
-def get_surveyor(surveyor_id: int, db: Session = Depends(get_db)):
+async def get_surveyor(surveyor_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific surveyor by ID."""
-    surveyor = db.query(SurveyorALS).filter(SurveyorALS.id == surveyor_id).first()
+    surveyor = await db.get(SurveyorALS, surveyor_id)
     if not surveyor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -48,6 +64,7 @@ def delete_surveyor(surveyor_id: int, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Surveyor not found",
         )
+    ProjectVersionService.bump_for_surveyor(db, surveyor_id)
     db.delete(surveyor)
     db.commit()
 
@@ -63,33 +80,184 @@ def create_surveyor(surveyor: SurveyorCreate, db: Session = Depends(get_db)):
 
 
 # Project Endpoints
+@router.post(
+    "/export-excel",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/zip": {}},
+            "description": "ZIP archive of Excel exports",
+        }
+    },
+)
+def export_projects_excel(
+    export_request: ProjectExportRequest,
+    db: Session = Depends(get_db),
+):
+    """Export the tracking workbooks of several projects as one ZIP archive."""
+    if not export_request.project_ids and not export_request.municipality:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide project_ids and/or municipality",
+        )
+
+    query = db.query(Project.id)
+    if export_request.project_ids:
+        query = query.filter(Project.id.in_(export_request.project_ids))
+    if export_request.municipality:
+        query = query.filter(Project.municipality == export_request.municipality)
+    project_ids = [project_id for (project_id,) in query.order_by(Project.id)]
+
+    if not project_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No matching projects found",
+        )
+
+    missing_ids = []
+    if export_request.project_ids and not export_request.municipality:
+        missing_ids = sorted(set(export_request.project_ids) - set(project_ids))
+
+    # One snapshot of the lookup tables is shared by every workbook
+    lookups = LookupSnapshot.load(db)
+
+    return StreamingResponse(
+        ProjectExportService.export_projects_zip(project_ids, lookups, missing_ids),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": 'attachment; filename="document_tracking_export.zip"'
+        },
+    )
+
+
+# Sort keys accepted by list_projects (prefix with "-" for descending)
+PROJECT_SORT_COLUMNS = {
+    "id": Project.id,
+    "proj_num": Project.proj_num,
+    "name": Project.name,
+}
+
+
 @router.get("", response_model=List[ProjectResponse])
-def list_projects(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    """Get all projects with pagination."""
-    projects = db.query(Project).order_by(Project.id).offset(skip).limit(limit).all()
-    return projects
+async def list_projects(
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get all projects with pagination.
+
+    Pass the X-Next-Cursor header of one page as cursor to get the next;
+    skip still works but gets slower the deeper it goes. X-Total-Count is
+    only sent when include_total is set.
+    """
+    page = await paginate(
+        db,
+        select(Project).options(*PROJECT_RESPONSE),
+        Project,
+        sort=sort,
+        sort_columns=PROJECT_SORT_COLUMNS,
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        include_total=include_total,
+    )
+    return page.apply_headers(response)
+
+
+@router.get("/summary", response_model=List[ProjectSummary])
+async def list_project_summaries(
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get projects as compact rows for list views (paging and sorting as in list_projects).
+
+    Each row has the surveyor's name and the number of title documents and
+    document tasks, read in one statement without loading any related rows.
+    """
+    page = await paginate(
+        db,
+        select(*PROJECT_SUMMARY).outerjoin(SurveyorALS, Project.surveyor_id == SurveyorALS.id),
+        Project,
+        sort=sort,
+        sort_columns=PROJECT_SORT_COLUMNS,
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        include_total=include_total,
+    )
+    return page.apply_headers(response)
+
+
+@router.get("/search", response_model=List[ProjectResponse])
+async def search_projects(
+    q: str = "",
+    surveyor_id: Optional[int] = None,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Search projects by number prefix or by words in the name or municipality."""
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    return await ProjectSearchService.search(db, q, surveyor_id=surveyor_id, limit=limit)
 
 
 @router.get("/{project_id}", response_model=ProjectDetailResponse)
-def get_project(project_id: int, db: Session = Depends(get_db)):
-    """Get a specific project with all related data."""
-    project = db.query(Project).filter(Project.id == project_id).first()
+async def get_project(
+    project_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get a specific project with all related data (304 if the client's ETag is current)."""
+    if ProjectVersionService.is_conditional(request):
+        not_modified = await ProjectVersionService.not_modified(db, request, response, Project.id == project_id)
+        if not_modified:
+            return not_modified
+
+    result = await db.execute(
+        select(Project)
+        .options(*PROJECT_DETAIL_RESPONSE)
+        .filter(Project.id == project_id)
+    )
+    project = result.scalars().first()
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
+    ProjectVersionService.tag(response, project)
     return project
 
 @router.get("/by-number/{project_num}", response_model=ProjectDetailResponse)
-def get_project_by_number(project_num: str, db: Session = Depends(get_db)):
-    """Get a specific project by project number"""
-
-    project = (
-        db.query(Project)
+async def get_project_by_number(
+    project_num: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get a specific project by project number (304 if the client's ETag is current)"""
+    if ProjectVersionService.is_conditional(request):
+        not_modified = await ProjectVersionService.not_modified(db, request, response, Project.proj_num == project_num)
+        if not_modified:
+            return not_modified
+
+    result = await db.execute(
+        select(Project)
+        .options(*PROJECT_DETAIL_RESPONSE)
         .filter(Project.proj_num == project_num)
-        .first()
     )
+    project = result.scalars().first()
 
     if not project:
         raise HTTPException(
@@ -97,6 +265,7 @@ def get_project_by_number(project_num: str, db: Session = Depends(get_db)):
             detail="Project not found",
         )
 
+    ProjectVersionService.tag(response, project)
     return project
 
 @router.post("", response_model=ProjectResponse)
@@ -114,6 +283,7 @@ def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
     db.add(db_project)
     db.commit()
     db.refresh(db_project)
+    ProjectSearchService.index_project(db_project)
     return db_project
 
 
@@ -134,9 +304,11 @@ def update_project(
     update_data = project_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_project, field, value)
+    db_project.data_version = Project.data_version + 1
 
     db.commit()
     db.refresh(db_project)
+    ProjectSearchService.index_project(db_project)
     return db_project
 
 
@@ -150,8 +322,12 @@ def delete_project(project_id: int, db: Session = Depends(get_db)):
             detail="Project not found",
         )
 
+    # Search terms are removed explicitly, as in delete_title_document, so
+    # databases that do not enforce the cascade keep no orphan postings
+    EncumbranceSearchService.remove_project(db, project_id)
     db.delete(db_project)
     db.commit()
+    ProjectSearchService.remove_project(project_id)
 
 
 @router.get(
@@ -160,85 +336,97 @@ def delete_project(project_id: int, db: Session = Depends(get_db)):
     responses={
         200: {
             "content": {
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": {}
+                XLSX_MEDIA_TYPE: {}
             },
             "description": "Excel export",
         }
     },
 )
 def export_project_excel(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    proj_num, workbook_file = ProjectExportService.export_project_spooled(db, project_id)
+    if proj_num is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    filename = f"{proj_num}_document_tracking.xlsx"
+
+    return StreamingResponse(
+        iter_file_chunks(workbook_file),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        },
+    )
+
+
+@router.post(
+    "/{project_id}/generate-documents",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/zip": {}},
+            "description": "ZIP archive of the generated documents",
+        }
+    },
+)
+def generate_project_documents(
+    project_id: int,
+    generation_request: Optional[DocumentGenerationRequest] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Generate the legal documents for every templated task and encumbrance of a project.
 
+    Poll GET /{project_id}/generate-documents/progress while the batch renders.
+    """
+    project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    encumbrances = {}
-
-    for title_doc in project.title_documents:
-        plan_name = f"Title Document {title_doc.id}"
-
-        encumbrances[plan_name] = [
-            {
-                "Document #": e.document_number,
-                "Description": e.description,
-                "Signatories": e.signatories,
-                "Circulation Notes": e.circulation_notes,
-                "Action": e.action.code if e.action else "",
-                "Status": e.status.code if e.status else "",
-            }
-            for e in title_doc.encumbrances
-        ]
-
-    plans: Dict[str, list[dict]] = {}
-    exist_enc = []
-
-    for d in project.document_tasks:
-        if d.category.id == 3:
-            #Hardcoded existing encumbrances
-            exist_enc.append(
-                {
-                    "Document/Desc": d.doc_desc,
-                    "Copies/Dept": d.copies_dept,
-                    "Signatories": d.signatories,
-                    "Condition of Approval": d.condition_of_approval,
-                    "Circulation Notes": d.circulation_notes,
-                    "Status": d.document_status.code if d.document_status else "",
-                }
-            )
-        else:
-            category_code = d.category.code if d.category else "UNCATEGORIZED"
-            print(category_code)
-            if category_code not in plans:
-                plans[category_code] = []
-            plans[category_code].append(
-                {
-                    "Document/Desc": d.doc_desc,
-                    "Copies/Dept": d.copies_dept,
-                    "Signatories": d.signatories,
-                    "Condition of Approval": d.condition_of_approval,
-                    "Circulation Notes": d.circulation_notes,
-                    "Status": d.document_status.code if d.document_status else "",
-                }
-            )
-
-    buffer = io.BytesIO()
-
-    ExcelGeneratorService.export_as_excel(
-        buffer,
-        encumbrances=encumbrances,
-        plans=plans,
-        new_agreements=exist_enc,        # per your note
-        proj_num=project.proj_num,
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+
+    generation_request = generation_request or DocumentGenerationRequest()
+    items = DocumentBatchService.collect_items(
+        db,
+        project,
+        legal_desc=generation_request.legal_desc,
+        plan_type=generation_request.plan_type,
+        regenerate=generation_request.regenerate,
     )
+    if not items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No document tasks or encumbrances with a template to generate",
+        )
 
-    buffer.seek(0)
+    if not DocumentBatchService.start(db, project_id, len(items)):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Document generation is already running for this project",
+        )
 
-    filename = f"{project.proj_num}_document_tracking.xlsx"
+    archive_file = DocumentBatchService.generate(db, project, items)
+    filename = f"{project.proj_num}_documents.zip"
 
     return StreamingResponse(
-        buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        iter_file_chunks(archive_file),
+        media_type="application/zip",
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"'
         },
     )
+
+
+@router.get(
+    "/{project_id}/generate-documents/progress",
+    response_model=DocumentGenerationProgressResponse,
+)
+async def get_document_generation_progress(project_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get the progress of the latest document generation batch for a project."""
+    progress = await DocumentBatchService.get_progress(db, project_id)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No document generation for this project",
+        )
+    return progress
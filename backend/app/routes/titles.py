@@ -1,24 +1,63 @@
 """
 API routes for title document and encumbrance management.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.title import TitleDocument, Encumbrance
+from app.database import get_db, get_async_db
+from app.models.project import Project
+from app.models.title import TitleDocument, Encumbrance, TitleIngestJob
 from app.schemas.title import (
     TitleDocumentCreate,
     TitleDocumentResponse,
+    TitleDocumentSummary,
     EncumbranceCreate,
     EncumbranceUpdate,
+    EncumbranceBulkUpdate,
     EncumbranceResponse,
+    EncumbranceSearchHit,
+    TitleIngestJobResponse,
+    ExtractionCacheStatsResponse,
 )
-from app.services.pdf_processor import PDFProcessorService, TitleDocumentService
-from pypdf import PdfReader
+from app.services.bulk_update import BulkUpdateService
+from app.services.pdf_processor import TitleDocumentService
+from app.services.ingest_jobs import TitleIngestJobService
+from app.services.encumbrance_search import EncumbranceSearchService, FIELD_WEIGHTS
+from app.services.extraction_cache import ExtractionCacheService
+from app.services.json_response import FastJSONRoute
+from app.services.pagination import paginate
+from app.services.project_version import ProjectVersionService
+from app.services.query_profiles import TITLE_DOCUMENT_RESPONSE, TITLE_DOCUMENT_SUMMARY, ENCUMBRANCE_RESPONSE
+from app.services.upload_writer import UploadWriterService, UploadTooLargeError, SavedUpload
 import os
-from typing import List
+from typing import List, Optional
 from app.config import UPLOAD_DIRECTORY
 
-router = APIRouter(prefix="/api/titles", tags=["titles"])
+router = APIRouter(prefix="/api/titles", tags=["titles"], route_class=FastJSONRoute)
+
+# Encumbrance fields covered by the search index
+SEARCHED_FIELDS = set(FIELD_WEIGHTS)
+
+# Encumbrance fields a client may edit
+UPDATABLE_FIELDS = list(EncumbranceUpdate.model_fields)
+
+
+def _save_upload(file: UploadFile) -> SavedUpload:
+    """Validate an uploaded title PDF and stream it to the upload directory."""
+    if not file.filename.endswith(".pdf"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only PDF files are allowed",
+        )
+
+    try:
+        return UploadWriterService.save(file.file, UPLOAD_DIRECTORY, file.filename)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
 
 
 @router.post("", response_model=TitleDocumentResponse)
@@ -31,36 +70,30 @@ def create_title_document(
     Upload and process a title document PDF.
     Automatically extracts encumbrances and stores them.
     """
-    if not file.filename.endswith(".pdf"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only PDF files are allowed",
-        )
+    upload = _save_upload(file)
 
     try:
-        # Save uploaded file
-        file_path = os.path.join(UPLOAD_DIRECTORY, file.filename)
-        with open(file_path, "wb") as f:
-            contents = file.file.read()
-            f.write(contents)
+        # Process PDF and extract encumbrances
+        extracted_data = ExtractionCacheService.get_or_extract(upload.file_path, upload.sha256)
 
-        # Create title document record
+        # Create title document record and its encumbrances in one transaction
         title_doc = TitleDocument(
             project_id=project_id,
-            file_path=file_path,
+            file_path=upload.file_path,
             uploaded_by="system",  # TODO: Get from auth context
         )
         db.add(title_doc)
-        db.commit()
-        db.refresh(title_doc)
-
-        # Process PDF and extract encumbrances
-        pdf_reader = PdfReader(file_path)
-        extracted_data = PDFProcessorService.process_title_cert(pdf_reader)
-        TitleDocumentService.save_extracted_data(db, title_doc.id, extracted_data)
-
-        db.refresh(title_doc)
-        return title_doc
+        db.flush()
+        title_doc_id = title_doc.id
+        ProjectVersionService.bump(db, project_id)
+        TitleDocumentService.save_extracted_data(db, title_doc_id, extracted_data)
+
+        return (
+            db.query(TitleDocument)
+            .options(*TITLE_DOCUMENT_RESPONSE)
+            .filter(TitleDocument.id == title_doc_id)
+            .first()
+        )
 
     except Exception as e:
         db.rollback()
@@ -70,10 +103,81 @@ def create_title_document(
         )
 
 
+@router.post(
+    "/jobs",
+    response_model=TitleIngestJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def create_title_ingest_job(
+    project_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    """
+    Upload a title document PDF for background processing.
+    Returns a job immediately; poll GET /api/titles/jobs/{job_id} for progress.
+    """
+    upload = _save_upload(file)
+    return TitleIngestJobService.submit(db, project_id, upload.file_path, upload.sha256)
+
+
+@router.get("/jobs/{job_id}", response_model=TitleIngestJobResponse)
+async def get_title_ingest_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get the state and page progress of a title ingestion job."""
+    job = await db.get(TitleIngestJob, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ingestion job not found",
+        )
+    return job
+
+
+@router.get("/extraction-cache/stats", response_model=ExtractionCacheStatsResponse)
+def get_extraction_cache_stats():
+    """Get extraction cache hit/miss counters for this worker process."""
+    return ExtractionCacheService.stats()
+
+
+@router.get("/summary", response_model=List[TitleDocumentSummary])
+async def list_title_document_summaries(
+    project_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get a project's title documents as compact rows for list views.
+
+    Each row has the number of encumbrances on the title instead of the
+    encumbrances themselves; paging as in list_title_documents.
+    """
+    page = await paginate(
+        db,
+        select(*TITLE_DOCUMENT_SUMMARY).filter(TitleDocument.project_id == project_id),
+        TitleDocument,
+        sort="id",
+        sort_columns={"id": TitleDocument.id},
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        include_total=include_total,
+    )
+    return page.apply_headers(response)
+
+
 @router.get("/{title_id}", response_model=TitleDocumentResponse)
-def get_title_document(title_id: int, db: Session = Depends(get_db)):
+async def get_title_document(title_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific title document with its encumbrances."""
-    title_doc = db.query(TitleDocument).filter(TitleDocument.id == title_id).first()
+    result = await db.execute(
+        select(TitleDocument)
+        .options(*TITLE_DOCUMENT_RESPONSE)
+        .filter(TitleDocument.id == title_id)
+    )
+    title_doc = result.scalars().first()
     if not title_doc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -83,44 +187,123 @@ def get_title_document(title_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("", response_model=List[TitleDocumentResponse])
-def list_title_documents(
+async def list_title_documents(
     project_id: int,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get all title documents for a project."""
-    title_docs = (
-        db.query(TitleDocument)
-        .filter(TitleDocument.project_id == project_id)
-        .order_by(TitleDocument.id.asc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    """
+    Get all title documents for a project (cursor pagination as in list_projects).
+    Returns 304 if the client's ETag for this page is still current.
+    """
+    not_modified = await ProjectVersionService.not_modified(
+        db, request, response, Project.id == project_id, variant=request.url.query
+    )
+    if not_modified:
+        return not_modified
+
+    page = await paginate(
+        db,
+        select(TitleDocument)
+        .options(*TITLE_DOCUMENT_RESPONSE)
+        .filter(TitleDocument.project_id == project_id),
+        TitleDocument,
+        sort="id",
+        sort_columns={"id": TitleDocument.id},
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        include_total=include_total,
     )
-    return title_docs
+    return page.apply_headers(response)
 
 
 # Encumbrance Endpoints
 @router.get("/{title_id}/encumbrances", response_model=List[EncumbranceResponse])
-def get_encumbrances(title_id: int, db: Session = Depends(get_db)):
+async def get_encumbrances(title_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get all encumbrances for a title document."""
-    encumbrances = (
-        db.query(Encumbrance)
+    result = await db.execute(
+        select(Encumbrance)
+        .options(*ENCUMBRANCE_RESPONSE)
         .filter(Encumbrance.title_document_id == title_id)
+    )
+    return result.scalars().all()
+
+
+@router.patch("/{title_id}/encumbrances", response_model=List[EncumbranceResponse])
+def bulk_update_encumbrances(
+    title_id: int,
+    updates: List[EncumbranceBulkUpdate],
+    db: Session = Depends(get_db),
+):
+    """
+    Update many encumbrances of a title in one transaction.
+
+    Each row carries its id, the version it was read at and only the fields
+    to change. If any row is not on this title (404) or has been changed
+    since it was read (409, with the current versions), nothing is saved.
+    Returns only the rows that changed, with their new versions.
+    """
+    changes = BulkUpdateService.apply(
+        db,
+        Encumbrance,
+        Encumbrance.title_document_id == title_id,
+        [row.dict(exclude_unset=True) for row in updates],
+        UPDATABLE_FIELDS,
+    )
+    if not changes:
+        return []
+
+    EncumbranceSearchService.reindex_encumbrances(db, [
+        (change.id, change.after["document_number"], change.after["description"], change.after["signatories"])
+        for change in changes
+        if SEARCHED_FIELDS.intersection(change.values)
+    ])
+    ProjectVersionService.bump_for_title(db, title_id)
+    db.commit()
+
+    order = {change.id: index for index, change in enumerate(changes)}
+    changed = (
+        db.query(Encumbrance)
+        .options(*ENCUMBRANCE_RESPONSE)
+        .filter(Encumbrance.id.in_(order))
         .all()
     )
-    return encumbrances
+    return sorted(changed, key=lambda encumbrance: order[encumbrance.id])
+
+
+@router.get("/encumbrances/search", response_model=List[EncumbranceSearchHit])
+async def search_encumbrances(
+    q: str,
+    project_id: Optional[int] = None,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Search encumbrances in every project by instrument number, company or description words.
+
+    Every word of q must appear in the encumbrance; hits are ranked with
+    document number matches first, then signatories, then descriptions.
+    """
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    return await EncumbranceSearchService.search(db, q, project_id=project_id, limit=limit)
 
 
 @router.get("/encumbrances/{encumbrance_id}", response_model=EncumbranceResponse)
-def get_encumbrance(encumbrance_id: int, db: Session = Depends(get_db)):
+async def get_encumbrance(encumbrance_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific encumbrance."""
-    encumbrance = (
-        db.query(Encumbrance)
+    result = await db.execute(
+        select(Encumbrance)
+        .options(*ENCUMBRANCE_RESPONSE)
         .filter(Encumbrance.id == encumbrance_id)
-        .first()
     )
+    encumbrance = result.scalars().first()
     if not encumbrance:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -150,7 +333,11 @@ def update_encumbrance(
     update_data = encumbrance_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_encumbrance, field, value)
+    db_encumbrance.version = Encumbrance.version + 1
 
+    if SEARCHED_FIELDS.intersection(update_data):
+        EncumbranceSearchService.reindex_encumbrance(db, db_encumbrance)
+    ProjectVersionService.bump_for_title(db, db_encumbrance.title_document_id)
     db.commit()
     db.refresh(db_encumbrance)
     return db_encumbrance
@@ -176,7 +363,8 @@ def delete_title_document(title_id: int, db: Session = Depends(get_db)):
         )
 
     try:
-        # Delete encumbrances explicitly
+        # Delete encumbrances explicitly, and their search terms first
+        EncumbranceSearchService.remove_title(db, title_id)
         db.query(Encumbrance).filter(
             Encumbrance.title_document_id == title_id
         ).delete(synchronize_session=False)
@@ -186,6 +374,7 @@ def delete_title_document(title_id: int, db: Session = Depends(get_db)):
             os.remove(title_doc.file_path)
 
         # Delete the title document
+        ProjectVersionService.bump(db, title_doc.project_id)
         db.delete(title_doc)
         db.commit()
 
@@ -210,31 +399,13 @@ def delete_encumbrance(
         .first()
     )
 
-    if not title_doc:
+    if not db_encumbrance:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Title document not found",
+            detail="Encumbrance not found",
         )
 
-    try:
-        # Delete encumbrances explicitly
-        db.query(Encumbrance).filter(
-            Encumbrance.title_document_id == title_id
-        ).delete(synchronize_session=False)
-
-        # Optionally delete the file from disk
-        if title_doc.file_path and os.path.exists(title_doc.file_path):
-            os.remove(title_doc.file_path)
-
-        # Delete the title document
-        db.delete(title_doc)
-        db.commit()
-
-        return None  
-
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete title document: {str(e)}",
-        )
+    EncumbranceSearchService.remove_encumbrance(db, encumbrance_id)
+    ProjectVersionService.bump_for_title(db, db_encumbrance.title_document_id)
+    db.delete(db_encumbrance)
+    db.commit()
@@ -3,7 +3,7 @@ Pydantic schemas for document task and legal document request/response models.
 """
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import date
+from datetime import date, datetime
 
 EXISTING_ENCUMBRANCES_CATEGORY_ID = 3
 
@@ -95,6 +95,59 @@ class DocumentTaskUpdate(BaseModel):
     legal_document_template_id: Optional[int] = None
     legal_document_id: Optional[int] = None
 
+
+class DocumentTaskSectionItem(BaseModel):
+    """One task of a bulk create (project and category come from the section)"""
+    item_no: Optional[int] = None  # Numbered after the section's last task if omitted
+    doc_desc: Optional[str] = None
+    copies_dept: Optional[str] = None
+    signatories: Optional[str] = None
+    condition_of_approval: Optional[str] = None
+    circulation_notes: Optional[str] = None
+    document_status_id: Optional[int] = None
+    legal_document_template_id: Optional[int] = None
+    legal_document_id: Optional[int] = None
+
+
+class DocumentTaskBulkCreate(BaseModel):
+    """Schema for creating several tasks in one section"""
+    project_id: int
+    category_id: Optional[int] = None  # NULL = New Agreements
+    tasks: List[DocumentTaskSectionItem]
+
+
+class DocumentTaskReorder(BaseModel):
+    """Schema for renumbering the tasks of one section"""
+    project_id: int
+    category_id: Optional[int] = None  # NULL = New Agreements
+    task_ids: List[int]  # New order; tasks left out follow in their current order
+
+
+class DocumentTaskBulkUpdate(DocumentTaskUpdate):
+    """One row of a bulk document task update"""
+    id: int
+    version: int  # As last read; the row is rejected if it has changed since
+
+class DocumentGenerationRequest(BaseModel):
+    """Schema for generating all documents of a project"""
+    legal_desc: str = ""
+    plan_type: str = ""  # Used for encumbrance documents; tasks use their category name
+    regenerate: bool = False  # Also render rows that already have a legal document
+
+
+class DocumentGenerationProgressResponse(BaseModel):
+    """Schema for the progress of a project's document generation batch"""
+    project_id: int
+    state: str
+    total: int
+    done: int
+    failed: int
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 from pydantic import BaseModel, field_serializer
 from typing import Optional
 
@@ -102,6 +155,7 @@ class DocumentTaskResponse(DocumentTaskBase):
     """Schema for document task response"""
     id: int
     project_id: int
+    version: int
     category: Optional[DocumentCategoryResponse] = None
     document_status: Optional[DocumentTaskStatusResponse] = None
     legal_document_template: Optional[LegalDocumentTemplateResponse] = None
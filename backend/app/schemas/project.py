@@ -50,6 +50,12 @@ class ProjectUpdate(BaseModel):
     surveyor_id: Optional[int] = None
 
 
+class ProjectExportRequest(BaseModel):
+    """Schema for a batch Excel export; give project ids, a municipality, or both"""
+    project_ids: Optional[List[int]] = None
+    municipality: Optional[str] = None
+
+
 class ProjectResponse(ProjectBase):
     """Schema for project response"""
     id: int
@@ -59,6 +65,17 @@ class ProjectResponse(ProjectBase):
         from_attributes = True
 
 
+class ProjectSummary(ProjectBase):
+    """Compact project row for list views, without nested objects"""
+    id: int
+    surveyor_name: Optional[str] = None
+    title_document_count: int
+    document_task_count: int
+
+    class Config:
+        from_attributes = True
+
+
 class ProjectDetailResponse(ProjectResponse):
     """Detailed project response with related data"""
     title_documents: List["TitleDocumentResponse"] = []
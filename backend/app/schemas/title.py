@@ -55,11 +55,18 @@ class EncumbranceUpdate(BaseModel):
     status_id: Optional[int] = None
 
 
+class EncumbranceBulkUpdate(EncumbranceUpdate):
+    """One row of a bulk encumbrance update"""
+    id: int
+    version: int  # As last read; the row is rejected if it has changed since
+
+
 class EncumbranceResponse(EncumbranceBase):
     """Schema for encumbrance response"""
     id: int
     title_document_id: int
     legal_document_id: Optional[int] = None
+    version: int
     action: Optional[EncumbranceActionResponse] = None
     status: Optional[EncumbranceStatusResponse] = None
 
@@ -67,6 +74,19 @@ class EncumbranceResponse(EncumbranceBase):
         from_attributes = True
 
 
+class EncumbranceSearchHit(BaseModel):
+    """Schema for one encumbrance search result"""
+    id: int
+    title_document_id: int
+    project_id: int
+    proj_num: str
+    item_no: int
+    document_number: Optional[str] = None
+    description: Optional[str] = None
+    signatories: Optional[str] = None
+    score: float
+
+
 class TitleDocumentBase(BaseModel):
     """Base title document information"""
     file_path: str
@@ -87,3 +107,41 @@ class TitleDocumentResponse(TitleDocumentBase):
 
     class Config:
         from_attributes = True
+
+
+class TitleDocumentSummary(TitleDocumentBase):
+    """Compact title document row for list views, without its encumbrances"""
+    id: int
+    project_id: int
+    uploaded_at: datetime
+    encumbrance_count: int
+
+    class Config:
+        from_attributes = True
+
+
+class TitleIngestJobResponse(BaseModel):
+    """Schema for title ingestion job status"""
+    id: int
+    project_id: int
+    state: str
+    pages_total: Optional[int] = None
+    pages_done: int = 0
+    title_document_id: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ExtractionCacheStatsResponse(BaseModel):
+    """Schema for extraction cache counters"""
+    parser_version: str
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    entries: int
+    bytes: int
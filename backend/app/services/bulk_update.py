@@ -0,0 +1,144 @@
+"""
+Set-based bulk updates with optimistic concurrency.
+Spreadsheet-style editing saves many partial row updates at once. They are
+applied in one transaction: the rows are read once, the whole batch is
+rejected if any row is missing or its version has moved on, and the changes
+are written with one UPDATE per combination of edited fields, choosing each
+row's value with CASE on its id. Every UPDATE also matches the versions that
+were read, so a row edited concurrently between the read and the write fails
+the batch instead of being overwritten. Written rows get their version bumped.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Sequence
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, case, literal, select, update
+from sqlalchemy.orm import Session
+
+MAX_BULK_ROWS = 500
+
+# SQL Server accepts at most 2100 parameters per statement
+MAX_STATEMENT_PARAMETERS = 2000
+
+
+@dataclass
+class RowChange:
+    """The fields of one row that a bulk update changes."""
+    id: int
+    before: Dict[str, Any]  # Every updatable field, as read
+    values: Dict[str, Any]  # Changed fields only
+
+    @property
+    def after(self) -> Dict[str, Any]:
+        return {**self.before, **self.values}
+
+
+def _conflict(versions: Dict[int, int]) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": "Rows were changed by someone else; reload them and try again",
+            "conflicts": [{"id": row_id, "version": version} for row_id, version in sorted(versions.items())],
+        },
+    )
+
+
+class BulkUpdateService:
+    """Applies partial updates to many rows of one table in a single transaction."""
+
+    @staticmethod
+    def apply(
+        db: Session,
+        model: type,
+        scope: ColumnElement,
+        updates: List[Dict[str, Any]],
+        fields: Sequence[str],
+    ) -> List[RowChange]:
+        """
+        Write a batch of partial updates, all or nothing, without committing.
+
+        Args:
+            db: Database session
+            model: Mapped class with id and version columns
+            scope: Condition the rows must meet, e.g. belonging to one title
+            updates: Per row, its "id", the "version" the client read, and the fields to set
+            fields: Columns a client may update
+
+        Returns:
+            The rows that changed, in request order (rows whose fields already
+            had the submitted values are left out and keep their version)
+
+        Raises:
+            HTTPException: 400 if the batch is too large or repeats a row,
+                404 if a row does not exist within scope, 409 with the current
+                versions if any row's version does not match (nothing is written)
+        """
+        if len(updates) > MAX_BULK_ROWS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ROWS} rows can be updated at once")
+        ids = [row["id"] for row in updates]
+        if len(set(ids)) != len(ids):
+            raise HTTPException(status_code=400, detail="Each row can only be updated once per request")
+        if not updates:
+            return []
+
+        columns = [getattr(model, field) for field in fields]
+        current = {
+            row.id: row
+            for row in db.execute(
+                select(model.id, model.version, *columns).where(scope, model.id.in_(ids))
+            )
+        }
+        missing = [row_id for row_id in ids if row_id not in current]
+        if missing:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Rows not found: {missing}")
+        stale = {row["id"]: current[row["id"]].version for row in updates if current[row["id"]].version != row["version"]}
+        if stale:
+            raise _conflict(stale)
+
+        changes: List[RowChange] = []
+        read_versions: Dict[int, int] = {}
+        for row in updates:
+            before = {field: getattr(current[row["id"]], field) for field in fields}
+            values = {field: value for field, value in row.items() if field in before and before[field] != value}
+            if values:
+                changes.append(RowChange(row["id"], before, values))
+                read_versions[row["id"]] = row["version"]
+
+        groups: Dict[FrozenSet[str], List[RowChange]] = defaultdict(list)
+        for change in changes:
+            groups[frozenset(change.values)].append(change)
+
+        for edited, group in groups.items():
+            per_statement = max(1, MAX_STATEMENT_PARAMETERS // (3 + 2 * len(edited)))
+            for start in range(0, len(group), per_statement):
+                chunk = group[start:start + per_statement]
+                chunk_ids = [change.id for change in chunk]
+                values: Dict[str, Any] = {"version": model.version + 1}
+                for field in edited:
+                    column_type = getattr(model, field).type
+                    distinct = {change.values[field] for change in chunk}
+                    if len(distinct) == 1:
+                        values[field] = chunk[0].values[field]  # e.g. a status sweep
+                    else:
+                        values[field] = case(
+                            {change.id: literal(change.values[field], column_type) for change in chunk},
+                            value=model.id,
+                        )
+                result = db.execute(
+                    update(model)
+                    .where(
+                        model.id.in_(chunk_ids),
+                        model.version == case({row_id: read_versions[row_id] for row_id in chunk_ids}, value=model.id),
+                    )
+                    .values(values)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount != len(chunk):
+                    # Another request updated some of these rows after they were read
+                    db.rollback()
+                    moved = dict(db.execute(select(model.id, model.version).where(model.id.in_(chunk_ids))).all())
+                    raise _conflict({
+                        row_id: version for row_id, version in moved.items() if version != read_versions[row_id]
+                    })
+
+        return changes
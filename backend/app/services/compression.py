@@ -0,0 +1,38 @@
+"""
+Response compression.
+Starlette's GZipMiddleware with one change: responses that are already
+compressed (Excel workbooks, ZIP archives, PDFs and DOCX files) are passed
+through as they are, so large exports do not spend CPU shrinking nothing.
+Bodies below the minimum size are also sent uncompressed.
+"""
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Formats that are ZIP or deflate containers already
+PRECOMPRESSED_MEDIA_TYPES = {
+    "application/zip",
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+class _Responder(GZipResponder):
+    async def send_with_gzip(self, message: Message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            media_type = Headers(raw=message["headers"]).get("content-type", "").split(";")[0].strip()
+            if media_type in PRECOMPRESSED_MEDIA_TYPES:
+                self.content_encoding_set = True  # Sent through unchanged
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Gzip responses of at least minimum_size bytes for clients that accept it."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _Responder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
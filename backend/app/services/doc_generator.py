@@ -2,14 +2,151 @@
 Service for document generation from templates.
 Wraps the existing templateGen.py logic for use in the FastAPI routes.
 """
-from typing import Dict, Any, Optional
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Any, Optional, Iterator, List, Tuple
 from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
 from docx.shared import Pt
+from docx.text.run import Run
+from app.services.template_cache import TemplateCacheService
+
+
+HEADER_FOOTER_RELTYPES = (RT.HEADER, RT.FOOTER)
+
+
+@lru_cache(maxsize=64)
+def _placeholder_pattern(placeholders: Tuple[str, ...]) -> "re.Pattern":
+    """Compile one alternation for a set of placeholders, longest first."""
+    return re.compile("|".join(re.escape(p) for p in sorted(placeholders, key=len, reverse=True)))
 
 
 class DocumentGeneratorService:
     """Handles generation of legal documents from templates."""
 
+    @staticmethod
+    def _iter_paragraph_elements(doc: Document) -> Iterator:
+        """
+        Yield every w:p element in the document body, headers and footers.
+
+        Walking the XML reaches paragraphs in nested tables and text boxes
+        as well, and each header/footer part is visited exactly once.
+        """
+        yield from doc.element.body.iter(qn("w:p"))
+        for rel in doc.part.rels.values():
+            if rel.reltype in HEADER_FOOTER_RELTYPES and not rel.is_external:
+                yield from rel.target_part.element.iter(qn("w:p"))
+
+    @staticmethod
+    def _replace_split_placeholders(runs: List[Run], pattern, values: Dict[str, str]) -> None:
+        """
+        Replace placeholders whose text spans several runs.
+
+        The replacement takes the formatting of the run the placeholder
+        starts in; the remainder of the last run is left in place.
+        """
+        texts = [run.text for run in runs]
+        full_text = "".join(texts)
+        matches = list(pattern.finditer(full_text))
+        if not matches:
+            return
+
+        run_starts = []
+        position = 0
+        for text in texts:
+            run_starts.append(position)
+            position += len(text)
+
+        new_texts = list(texts)
+        # Right to left, so offsets of earlier matches stay valid
+        for match in reversed(matches):
+            start, end = match.span()
+            first = bisect_right(run_starts, start) - 1
+            last = bisect_right(run_starts, end - 1) - 1
+            prefix = new_texts[first][:start - run_starts[first]]
+            suffix = new_texts[last][end - run_starts[last]:]
+            if first == last:
+                new_texts[first] = prefix + values[match.group()] + suffix
+                continue
+            new_texts[first] = prefix + values[match.group()]
+            for i in range(first + 1, last):
+                new_texts[i] = ""
+            new_texts[last] = suffix
+
+        for run, old_text, new_text in zip(runs, texts, new_texts):
+            if new_text != old_text:
+                run.text = new_text
+
+    @staticmethod
+    def render_template(doc: Document, values: Dict[str, Any]) -> None:
+        """
+        Substitute every placeholder in a Word document in a single traversal.
+
+        Covers body paragraphs, tables (including nested tables), headers and
+        footers. Each run is rewritten with one regex pass over all
+        placeholders; placeholders split across runs are also replaced.
+        When every placeholder contains "%", runs without one are skipped
+        without running the pattern; other find texts are searched in the
+        whole text of every paragraph.
+
+        Args:
+            doc: Open DOCX document
+            values: Mapping of placeholder text (e.g. "%SURVEYOR%") to replacement
+        """
+        values = {
+            placeholder: "" if value is None else str(value)
+            for placeholder, value in values.items()
+            if placeholder  # An empty find text matches nothing
+        }
+        if not values:
+            return
+        pattern = _placeholder_pattern(tuple(values))
+        replace = lambda match: values[match.group()]  # noqa: E731
+        percent_only = all("%" in placeholder for placeholder in values)
+
+        for p in DocumentGeneratorService._iter_paragraph_elements(doc):
+            runs = [Run(r, None) for r in p.xpath("./w:r | ./w:hyperlink/w:r")]
+            if not runs:
+                continue
+
+            if not percent_only:
+                # Any run may hold part of a match; one pass over the paragraph text
+                DocumentGeneratorService._replace_split_placeholders(runs, pattern, values)
+                continue
+
+            split_candidate = False
+            for run in runs:
+                text = run.text
+                if "%" not in text:
+                    continue
+                new_text = pattern.sub(replace, text)
+                if new_text != text:
+                    run.text = new_text
+                    text = new_text
+                if "%" in text:
+                    split_candidate = True
+
+            if split_candidate:
+                DocumentGeneratorService._replace_split_placeholders(runs, pattern, values)
+
+    @staticmethod
+    def render_to_file(template_path: str, output_path: str, values: Dict[str, Any]) -> None:
+        """
+        Render a template file with the given placeholder values and save it.
+
+        The template is parsed once and served from TemplateCacheService.
+
+        Args:
+            template_path: Path to the template DOCX file
+            output_path: Path where the generated document will be saved
+            values: Mapping of placeholder text to replacement
+        """
+        doc = TemplateCacheService.load(template_path)
+        DocumentGeneratorService.render_template(doc, values)
+        doc.save(output_path)
+
     @staticmethod
     def doc_find_and_replace(doc: Document, find_text: str, replace_text: str) -> None:
         """
@@ -20,20 +157,7 @@ class DocumentGeneratorService:
             find_text: Text to find
             replace_text: Text to replace with
         """
-        # Replace in paragraphs
-        for paragraph in doc.paragraphs:
-            for run in paragraph.runs:
-                if find_text in run.text:
-                    run.text = run.text.replace(find_text, replace_text)
-
-        # Replace in tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        for run in paragraph.runs:
-                            if find_text in run.text:
-                                run.text = run.text.replace(find_text, replace_text)
+        DocumentGeneratorService.render_template(doc, {find_text: replace_text})
 
     @staticmethod
     def generate_surveyor_aff(
@@ -63,18 +187,20 @@ class DocumentGeneratorService:
             end_date: End date
             surveyor_city: City where surveyor is based
         """
-        doc = Document(template_path)
-
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%SURVEYOR%", surveyor)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%FTP%", ftp)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%FILE%", file_num)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%DRAWING%", drawing)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%LEGALDESC%", legal_desc)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%STARTDATE%", start_date)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%ENDDATE%", end_date)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%SURVEYORCITY%", surveyor_city)
-
-        doc.save(output_path)
+        DocumentGeneratorService.render_to_file(
+            template_path,
+            output_path,
+            {
+                "%SURVEYOR%": surveyor,
+                "%FTP%": ftp,
+                "%FILE%": file_num,
+                "%DRAWING%": drawing,
+                "%LEGALDESC%": legal_desc,
+                "%STARTDATE%": start_date,
+                "%ENDDATE%": end_date,
+                "%SURVEYORCITY%": surveyor_city,
+            },
+        )
 
     @staticmethod
     def generate_consent_with_seal(
@@ -98,15 +224,17 @@ class DocumentGeneratorService:
             file_number: File number
             legal_desc: Legal description
         """
-        doc = Document(template_path)
-
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%SURVEYOR%", surveyor)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%CORPORATION%", corporation)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%FILENUMBER%", file_number)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%LEGAL%", legal_desc)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%PLANTYPE%", plan_type)
-
-        doc.save(output_path)
+        DocumentGeneratorService.render_to_file(
+            template_path,
+            output_path,
+            {
+                "%SURVEYOR%": surveyor,
+                "%CORPORATION%": corporation,
+                "%FILENUMBER%": file_number,
+                "%LEGAL%": legal_desc,
+                "%PLANTYPE%": plan_type,
+            },
+        )
 
     @staticmethod
     def generate_general_doc(
@@ -132,13 +260,15 @@ class DocumentGeneratorService:
             legal_desc: Legal description
             doc_number: Document number
         """
-        doc = Document(template_path)
-
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%SURVEYOR%", surveyor)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%CORPORATION%", corporation)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%FILENUMBER%", file_number)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%LEGAL%", legal_desc)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%PLANTYPE%", plan_type)
-        DocumentGeneratorService.doc_find_and_replace(doc, r"%DOCNUMBER%", doc_number)
-
-        doc.save(output_path)
+        DocumentGeneratorService.render_to_file(
+            template_path,
+            output_path,
+            {
+                "%SURVEYOR%": surveyor,
+                "%CORPORATION%": corporation,
+                "%FILENUMBER%": file_number,
+                "%LEGAL%": legal_desc,
+                "%PLANTYPE%": plan_type,
+                "%DOCNUMBER%": doc_number,
+            },
+        )
@@ -0,0 +1,414 @@
+"""
+Service for generating every legal document of a project in one batch.
+Templates are rendered in a bounded process pool, the resulting LegalDocument
+rows are inserted in one statement and linked back to their document tasks
+and encumbrances, and the files are returned as a ZIP archive.
+
+Each project's latest batch is a DocumentGenerationRun row, so its progress
+can be read from any worker process, and starting a batch is one conditional
+write, so only one process can run a project at a time. A batch that stops
+making progress (its process died) may be restarted once its lease runs out.
+"""
+import os
+import re
+import tempfile
+import zipfile
+from concurrent.futures import as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Any, BinaryIO, List, Optional, Set, Tuple
+from sqlalchemy import bindparam, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import (
+    GENERATED_DOCUMENT_DIRECTORY,
+    DOCUMENT_MAX_WORKERS,
+    DOCUMENT_LEASE_SECONDS,
+    EXPORT_SPOOL_MAX_SIZE,
+)
+from app.models import (
+    Project,
+    SurveyorALS,
+    TitleDocument,
+    Encumbrance,
+    EncumbranceAction,
+    DocumentTask,
+    DocumentCategory,
+    DocumentGenerationRun,
+    LegalDocument,
+    LegalDocumentTemplate,
+)
+from app.services.doc_generator import DocumentGeneratorService
+from app.services.project_version import ProjectVersionService
+from app.services.worker_pool import WorkerPool
+
+GENERATION_RUNNING = "running"
+GENERATION_COMPLETE = "complete"
+GENERATION_FAILED = "failed"
+
+
+@dataclass
+class RenderItem:
+    """One document to render, and the row it will be linked back to."""
+    model: type  # DocumentTask or Encumbrance
+    row_id: int
+    document_type: str
+    template_path: str
+    output_path: str
+    values: Dict[str, Any]
+
+
+def _render_document(template_path: str, output_path: str, values: Dict[str, Any]) -> str:
+    """Worker process entry point: render one template to a file."""
+    DocumentGeneratorService.render_to_file(template_path, output_path, values)
+    return output_path
+
+
+def _safe_filename(text: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", text).strip("_")
+
+
+def _first_line(text: Optional[str]) -> str:
+    return text.strip().splitlines()[0] if text and text.strip() else ""
+
+
+def _lease_until() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=DOCUMENT_LEASE_SECONDS)
+
+
+def _linked_documents(db: Session, project_id: int) -> Dict[Tuple[type, int], int]:
+    """{(model, row id): legal document id} for the project's linked tasks and encumbrances."""
+    tasks = db.execute(
+        select(DocumentTask.id, DocumentTask.legal_document_id)
+        .where(DocumentTask.project_id == project_id, DocumentTask.legal_document_id.isnot(None))
+    )
+    encumbrances = db.execute(
+        select(Encumbrance.id, Encumbrance.legal_document_id)
+        .join(TitleDocument, Encumbrance.title_document_id == TitleDocument.id)
+        .where(TitleDocument.project_id == project_id, Encumbrance.legal_document_id.isnot(None))
+    )
+    linked = {(DocumentTask, row_id): document_id for row_id, document_id in tasks}
+    linked.update({(Encumbrance, row_id): document_id for row_id, document_id in encumbrances})
+    return linked
+
+
+class DocumentBatchService:
+    """Renders, records and packages all documents of a project."""
+
+    _pool = WorkerPool(DOCUMENT_MAX_WORKERS)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the document generation worker pool."""
+        cls._pool.shutdown()
+
+    @staticmethod
+    def _templates_by_type(db: Session, municipality: Optional[str]) -> Dict[str, LegalDocumentTemplate]:
+        """Pick one template per document type, preferring the project's municipality."""
+        templates: Dict[str, LegalDocumentTemplate] = {}
+        for template in db.query(LegalDocumentTemplate).order_by(LegalDocumentTemplate.id):
+            current = templates.get(template.document_type)
+            if template.municipality not in (None, municipality):
+                continue
+            if current is None or (current.municipality is None and template.municipality is not None):
+                templates[template.document_type] = template
+        return templates
+
+    @staticmethod
+    def collect_items(
+        db: Session,
+        project: Project,
+        legal_desc: str = "",
+        plan_type: str = "",
+        regenerate: bool = False,
+    ) -> List[RenderItem]:
+        """
+        List the documents to generate for a project.
+
+        Document tasks use their own template; encumbrances use the template
+        whose document type matches their action code. Rows that already
+        have a legal document are skipped unless regenerate is set.
+
+        Args:
+            db: Database session
+            project: Project to generate documents for
+            legal_desc: Legal description for the %LEGAL%/%LEGALDESC% placeholders
+            plan_type: Plan type for encumbrance documents (tasks use their category)
+            regenerate: Also render rows that are already linked to a document
+
+        Returns:
+            The documents to render, tasks first
+        """
+        surveyor = db.query(SurveyorALS).filter(SurveyorALS.id == project.surveyor_id).first()
+        directory = os.path.join(GENERATED_DOCUMENT_DIRECTORY, _safe_filename(project.proj_num))
+        common = {
+            "%SURVEYOR%": surveyor.name if surveyor else "",
+            "%SURVEYORCITY%": surveyor.city if surveyor else "",
+            "%FTP%": surveyor.ftp_number if surveyor else "",
+            "%FILE%": project.proj_num,
+            "%FILENUMBER%": project.proj_num,
+            "%LEGAL%": legal_desc,
+            "%LEGALDESC%": legal_desc,
+        }
+        items: List[RenderItem] = []
+
+        tasks = (
+            db.query(DocumentTask, LegalDocumentTemplate, DocumentCategory.name)
+            .join(LegalDocumentTemplate, DocumentTask.legal_document_template_id == LegalDocumentTemplate.id)
+            .outerjoin(DocumentCategory, DocumentTask.category_id == DocumentCategory.id)
+            .filter(DocumentTask.project_id == project.id)
+            .order_by(DocumentTask.id)
+        )
+        if not regenerate:
+            tasks = tasks.filter(DocumentTask.legal_document_id.is_(None))
+        for task, template, category_name in tasks:
+            filename = f"{template.document_type}_task_{task.item_no}_{task.id}.docx"
+            items.append(RenderItem(
+                model=DocumentTask,
+                row_id=task.id,
+                document_type=template.document_type,
+                template_path=template.file_path,
+                output_path=os.path.join(directory, _safe_filename(filename)),
+                values={
+                    **common,
+                    "%CORPORATION%": _first_line(task.signatories),
+                    "%PLANTYPE%": category_name or plan_type,
+                    "%DOCNUMBER%": task.doc_desc or "",
+                },
+            ))
+
+        templates = DocumentBatchService._templates_by_type(db, project.municipality)
+        encumbrances = (
+            db.query(Encumbrance, EncumbranceAction.code)
+            .join(TitleDocument, Encumbrance.title_document_id == TitleDocument.id)
+            .join(EncumbranceAction, Encumbrance.action_id == EncumbranceAction.id)
+            .filter(TitleDocument.project_id == project.id)
+            .order_by(Encumbrance.title_document_id, Encumbrance.id)
+        )
+        if not regenerate:
+            encumbrances = encumbrances.filter(Encumbrance.legal_document_id.is_(None))
+        for encumbrance, action_code in encumbrances:
+            template = templates.get(action_code)
+            if template is None:
+                continue  # No document is produced for this action
+            filename = f"{template.document_type}_{encumbrance.document_number or 'encumbrance'}_{encumbrance.id}.docx"
+            items.append(RenderItem(
+                model=Encumbrance,
+                row_id=encumbrance.id,
+                document_type=template.document_type,
+                template_path=template.file_path,
+                output_path=os.path.join(directory, _safe_filename(filename)),
+                values={
+                    **common,
+                    "%CORPORATION%": _first_line(encumbrance.signatories),
+                    "%PLANTYPE%": plan_type,
+                    "%DOCNUMBER%": encumbrance.document_number or "",
+                },
+            ))
+
+        return items
+
+    @staticmethod
+    def start(db: Session, project_id: int, total: int) -> bool:
+        """
+        Register a running batch, committing it at once.
+
+        The project's run row is taken over with one conditional UPDATE, or
+        inserted if the project has none, so two processes starting a batch
+        together cannot both succeed.
+
+        Returns:
+            False if a batch is already running for the project
+        """
+        now = datetime.utcnow()
+        values = {
+            "state": GENERATION_RUNNING,
+            "total": total,
+            "done": 0,
+            "failed": 0,
+            "lease_until": _lease_until(),
+            "started_at": now,
+            "finished_at": None,
+        }
+        taken = db.execute(
+            update(DocumentGenerationRun)
+            .where(
+                DocumentGenerationRun.project_id == project_id,
+                or_(DocumentGenerationRun.state != GENERATION_RUNNING, DocumentGenerationRun.lease_until < now),
+            )
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        if taken.rowcount == 1:
+            db.commit()
+            return True
+        try:
+            db.execute(insert(DocumentGenerationRun).values(project_id=project_id, **values))
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # The project has a run row, and it is still running
+            return False
+        return True
+
+    @staticmethod
+    def _update_run(db: Session, project_id: int, **values) -> None:
+        db.execute(
+            update(DocumentGenerationRun)
+            .where(DocumentGenerationRun.project_id == project_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    @classmethod
+    def _advance(cls, db: Session, project_id: int, failed: bool = False) -> None:
+        cls._update_run(
+            db,
+            project_id,
+            done=DocumentGenerationRun.done + 1,
+            failed=DocumentGenerationRun.failed + (1 if failed else 0),
+            lease_until=_lease_until(),
+        )
+
+    @classmethod
+    def _finish(cls, db: Session, project_id: int, state: str) -> None:
+        cls._update_run(db, project_id, state=state, lease_until=None, finished_at=datetime.utcnow())
+
+    @staticmethod
+    async def get_progress(db: AsyncSession, project_id: int) -> Optional[DocumentGenerationRun]:
+        """Return the latest batch for a project, if any."""
+        return await db.get(DocumentGenerationRun, project_id)
+
+    @classmethod
+    def _render_all(
+        cls, db: Session, project_id: int, items: List[RenderItem]
+    ) -> Tuple[List[RenderItem], List[str]]:
+        """Render every item in the worker pool, updating progress as each one finishes."""
+        for directory in {os.path.dirname(item.output_path) for item in items}:
+            os.makedirs(directory, exist_ok=True)
+
+        futures = {
+            cls._pool.submit(_render_document, item.template_path, item.output_path, item.values): item
+            for item in items
+        }
+        rendered: List[RenderItem] = []
+        errors: List[str] = []
+        try:
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append(f"{item.model.__name__} {item.row_id}: {e}")
+                    cls._advance(db, project_id, failed=True)
+                    continue
+                rendered.append(item)
+                cls._advance(db, project_id)
+        finally:
+            for future in futures:
+                future.cancel()
+
+        # Keep the archive and the inserted rows in a stable order
+        order = {id(item): index for index, item in enumerate(items)}
+        rendered.sort(key=lambda item: order[id(item)])
+        return rendered, errors
+
+    @staticmethod
+    def _record(db: Session, project_id: int, rendered: List[RenderItem]) -> None:
+        """
+        Insert the LegalDocument rows in one statement and link them to their source rows.
+
+        Documents the new ones replace (when regenerating) are deleted, with
+        their files, unless another row still links to them.
+        """
+        if not rendered:
+            return
+        previous = _linked_documents(db, project_id)
+        replaced: Set[int] = {
+            previous[(item.model, item.row_id)] for item in rendered if (item.model, item.row_id) in previous
+        }
+
+        # Output paths are unique within a batch, so they map the returned ids
+        # back to their items whatever order the batched insert returns them in
+        document_ids = dict(db.execute(
+            insert(LegalDocument).returning(LegalDocument.file_path, LegalDocument.id),
+            [
+                {
+                    "project_id": project_id,
+                    "file_path": item.output_path,
+                    "document_type": item.document_type,
+                }
+                for item in rendered
+            ],
+        ).all())
+
+        links: Dict[type, List[Dict[str, int]]] = {DocumentTask: [], Encumbrance: []}
+        for item in rendered:
+            links[item.model].append({"row_id": item.row_id, "document_id": document_ids[item.output_path]})
+        for model, rows in links.items():
+            if rows:
+                table = model.__table__
+                db.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("row_id"))
+                    .values(legal_document_id=bindparam("document_id"), version=table.c.version + 1),
+                    rows,
+                )
+
+        orphaned = replaced - set(_linked_documents(db, project_id).values())
+        orphaned_paths: List[str] = []
+        if orphaned:
+            orphaned_paths = [
+                file_path
+                for document_id, file_path in db.execute(
+                    select(LegalDocument.id, LegalDocument.file_path).where(LegalDocument.project_id == project_id)
+                )
+                if document_id in orphaned and file_path not in document_ids
+            ]
+            table = LegalDocument.__table__
+            db.execute(
+                delete(table).where(table.c.id == bindparam("orphan_id")),
+                [{"orphan_id": document_id} for document_id in orphaned],
+            )
+        ProjectVersionService.bump(db, project_id)
+        db.commit()
+
+        # Files are only removed once the rows are gone; paths reused by the
+        # new documents were overwritten when they were rendered
+        for file_path in orphaned_paths:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    @classmethod
+    def generate(cls, db: Session, project: Project, items: List[RenderItem]) -> BinaryIO:
+        """
+        Render, record and package a batch registered with start().
+
+        Args:
+            db: Database session
+            project: Project the documents belong to
+            items: Documents to render, from collect_items()
+
+        Returns:
+            Spooled ZIP archive of the generated documents (stream it with
+            iter_file_chunks, which closes it); failures are listed in ERRORS.txt
+        """
+        try:
+            rendered, errors = cls._render_all(db, project.id, items)
+            cls._record(db, project.id, rendered)
+
+            archive_file = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+            # Documents are already compressed; store them as-is
+            with zipfile.ZipFile(archive_file, "w", compression=zipfile.ZIP_STORED) as archive:
+                for item in rendered:
+                    archive.write(item.output_path, os.path.basename(item.output_path))
+                if errors:
+                    archive.writestr("ERRORS.txt", "\n".join(errors) + "\n")
+        except BaseException:
+            db.rollback()
+            cls._finish(db, project.id, GENERATION_FAILED)
+            raise
+
+        cls._finish(db, project.id, GENERATION_COMPLETE)
+        return archive_file
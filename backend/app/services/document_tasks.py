@@ -0,0 +1,147 @@
+"""
+Section-level operations on document tasks.
+A section is one project's tasks in one category (a plan, or New
+Agreements), numbered by item_no. A whole section can be created with one
+batched INSERT, and renumbered with one UPDATE that picks each task's new
+number with CASE on its id.
+"""
+from typing import Any, Dict, List
+from fastapi import HTTPException, status
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.orm import Session
+from app.models import DocumentTask, Project
+from app.services.bulk_update import MAX_BULK_ROWS, MAX_STATEMENT_PARAMETERS
+
+
+def _check_size(count: int) -> None:
+    if count > MAX_BULK_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ROWS} tasks can be changed at once")
+
+
+def _lock_project(db: Session, project_id: int) -> None:
+    # Held until commit, so concurrent creates and reorders in the project's
+    # sections read each other's item numbers instead of interleaving them.
+    # SQL Server ignores FOR UPDATE, hence the hint.
+    db.execute(
+        select(Project.id)
+        .where(Project.id == project_id)
+        .with_for_update()
+        .with_hint(Project, "WITH (UPDLOCK, ROWLOCK)", "mssql")
+    )
+
+
+class DocumentTaskService:
+    """Creates and renumbers the tasks of a section in bulk."""
+
+    @staticmethod
+    def create_many(db: Session, project_id: int, category_id: int, tasks: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insert tasks into a section in one statement, without committing.
+
+        Tasks without an item_no are numbered after the section's last task,
+        in the order given. The project row is locked first, so a concurrent
+        create in the same section waits for this transaction.
+
+        Args:
+            db: Database session
+            project_id: Project the tasks belong to
+            category_id: Category of the section
+            tasks: Task fields, item_no optional
+
+        Returns:
+            IDs of the created tasks, in the order given
+
+        Raises:
+            HTTPException: 400 if the batch is too large, repeats an item_no
+                or gives one the section already uses
+        """
+        _check_size(len(tasks))
+        if not tasks:
+            return []
+
+        given = [task["item_no"] for task in tasks if task.get("item_no") is not None]
+        if len(set(given)) != len(given):
+            raise HTTPException(status_code=400, detail="Each item_no can only be used once per request")
+
+        _lock_project(db, project_id)
+        existing = set(db.scalars(
+            select(DocumentTask.item_no).where(
+                DocumentTask.project_id == project_id,
+                DocumentTask.category_id == category_id,
+            )
+        ))
+        taken = sorted(existing.intersection(given))
+        if taken:
+            raise HTTPException(
+                status_code=400,
+                detail=f"item_no already used in this section: {', '.join(map(str, taken))}",
+            )
+
+        rows = [{**task, "project_id": project_id, "category_id": category_id} for task in tasks]
+        if len(given) < len(rows):
+            next_item_no = max([0] + list(existing) + given) + 1
+            for row in rows:
+                if row.get("item_no") is None:
+                    row["item_no"] = next_item_no
+                    next_item_no += 1
+
+        # Item numbers are unique within the batch, so they map the returned
+        # ids back to the rows whatever order the batched insert returns them in
+        ids_by_item = dict(db.execute(
+            insert(DocumentTask).returning(DocumentTask.item_no, DocumentTask.id),
+            rows,
+        ).all())
+        return [ids_by_item[row["item_no"]] for row in rows]
+
+    @staticmethod
+    def reorder(db: Session, project_id: int, category_id: int, task_ids: List[int]) -> List[int]:
+        """
+        Renumber a section's tasks 1..n, without committing.
+
+        Tasks of the section missing from task_ids follow the listed ones, in
+        their current order. Only tasks whose number changes are written
+        (and get their version bumped), in one UPDATE per
+        MAX_STATEMENT_PARAMETERS // 3 tasks. The project row is locked
+        first, as in create_many.
+
+        Args:
+            db: Database session
+            project_id: Project of the section
+            category_id: Category of the section
+            task_ids: Task ids in their new order
+
+        Returns:
+            IDs of every task in the section, in the new order
+
+        Raises:
+            HTTPException: 400 if the list is too large or repeats a task,
+                404 if a task is not in the section
+        """
+        _check_size(len(task_ids))
+        if len(set(task_ids)) != len(task_ids):
+            raise HTTPException(status_code=400, detail="Each task can only be listed once")
+
+        _lock_project(db, project_id)
+        current = dict(db.execute(
+            select(DocumentTask.id, DocumentTask.item_no)
+            .where(DocumentTask.project_id == project_id, DocumentTask.category_id == category_id)
+            .order_by(DocumentTask.item_no, DocumentTask.id)
+        ).all())
+        missing = [task_id for task_id in task_ids if task_id not in current]
+        if missing:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Tasks not in this section: {missing}")
+
+        listed = set(task_ids)
+        order = task_ids + [task_id for task_id in current if task_id not in listed]
+        changed = [(task_id, item_no) for item_no, task_id in enumerate(order, start=1) if current[task_id] != item_no]
+        # Each task costs three parameters: its id and number in the CASE, and its id in the IN list
+        per_statement = MAX_STATEMENT_PARAMETERS // 3
+        for start in range(0, len(changed), per_statement):
+            numbers = dict(changed[start:start + per_statement])
+            db.execute(
+                update(DocumentTask)
+                .where(DocumentTask.id.in_(numbers))
+                .values(item_no=case(numbers, value=DocumentTask.id), version=DocumentTask.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+        return order
@@ -0,0 +1,286 @@
+"""
+Full-text search over encumbrances across every project.
+Document numbers, descriptions and signatories are split into terms and
+stored in the EncumbranceSearchTerm table, one row per (term, encumbrance)
+with a field-weighted occurrence count. Rows are indexed in the same
+transaction that writes the encumbrance, so the index never lags the data.
+A search walks the postings of its rarest term, looks the other terms up
+by key, and ranks the encumbrances that contain every term by weighted
+tf-idf.
+"""
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from app.models import Project, TitleDocument, Encumbrance, EncumbranceSearchTerm
+
+# An instrument number match outranks a company name, which outranks a description word
+FIELD_WEIGHTS = {
+    "document_number": 3,
+    "signatories": 2,
+    "description": 1,
+}
+
+MAX_TERM_LENGTH = 100
+MAX_QUERY_TERMS = 10
+REINDEX_BATCH_SIZE = 1000
+
+# The encumbrance count only scales idf, so it is re-read at most this often
+DOCUMENT_COUNT_TTL = 300  # seconds
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# (id, document_number, description, signatories)
+EncumbranceText = Tuple[int, Optional[str], Optional[str], Optional[str]]
+
+
+def _tokens(text: str) -> List[str]:
+    """Lowercased words, dropping single letters but keeping single digits."""
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in _TOKEN_RE.findall(text.lower())
+        if len(token) > 1 or token.isdigit()
+    ]
+
+
+def _compact_number(document_number: str) -> str:
+    """An instrument number without separators, e.g. '062 123 456' -> '062123456'."""
+    return "".join(_TOKEN_RE.findall(document_number.lower()))[:MAX_TERM_LENGTH]
+
+
+def encumbrance_terms(
+    document_number: Optional[str],
+    description: Optional[str],
+    signatories: Optional[str],
+) -> Dict[str, int]:
+    """Return the weighted terms of one encumbrance."""
+    weights: Counter = Counter()
+    for field, text in (
+        ("document_number", document_number),
+        ("description", description),
+        ("signatories", signatories),
+    ):
+        if text:
+            for token in _tokens(text):
+                weights[token] += FIELD_WEIGHTS[field]
+
+    # Instrument numbers are written with and without spaces; index both forms
+    if document_number:
+        compact = _compact_number(document_number)
+        if compact and compact not in weights:
+            weights[compact] = FIELD_WEIGHTS["document_number"]
+    return dict(weights)
+
+
+def query_terms(query: str) -> List[str]:
+    """Split a search query into the terms every hit must contain."""
+    tokens = _tokens(query)
+    # A spaced-out instrument number is looked up in its compact form, built
+    # from the kept tokens so a dropped single letter cannot end up in it
+    if len(tokens) > 1 and all(token.isdigit() for token in tokens):
+        return ["".join(tokens)[:MAX_TERM_LENGTH]]
+    return list(dict.fromkeys(tokens))[:MAX_QUERY_TERMS]
+
+
+class EncumbranceSearchService:
+    """Maintains the encumbrance search index and answers search queries."""
+
+    _lock = threading.Lock()
+    _document_count: Optional[int] = None
+    _document_count_at = 0.0
+
+    @staticmethod
+    def index_encumbrances(db: Session, rows: Iterable[EncumbranceText]) -> int:
+        """
+        Add the terms of newly written encumbrances in the current transaction.
+
+        Args:
+            db: Database session
+            rows: (id, document_number, description, signatories) per encumbrance
+
+        Returns:
+            Number of index rows inserted
+        """
+        postings = [
+            {"term": term, "encumbrance_id": encumbrance_id, "weight": weight}
+            for encumbrance_id, document_number, description, signatories in rows
+            for term, weight in encumbrance_terms(document_number, description, signatories).items()
+        ]
+        if postings:
+            db.execute(insert(EncumbranceSearchTerm), postings)
+        return len(postings)
+
+    @staticmethod
+    def reindex_encumbrance(db: Session, encumbrance: Encumbrance) -> None:
+        """Replace the terms of an edited encumbrance in the current transaction."""
+        EncumbranceSearchService.reindex_encumbrances(
+            db,
+            [(encumbrance.id, encumbrance.document_number, encumbrance.description, encumbrance.signatories)],
+        )
+
+    @staticmethod
+    def reindex_encumbrances(db: Session, rows: List[EncumbranceText]) -> None:
+        """Replace the terms of several edited encumbrances in the current transaction."""
+        if not rows:
+            return
+        db.execute(
+            delete(EncumbranceSearchTerm).where(EncumbranceSearchTerm.encumbrance_id.in_([row[0] for row in rows]))
+        )
+        EncumbranceSearchService.index_encumbrances(db, rows)
+
+    @staticmethod
+    def remove_encumbrance(db: Session, encumbrance_id: int) -> None:
+        """Drop the terms of an encumbrance before it is deleted."""
+        db.execute(delete(EncumbranceSearchTerm).where(EncumbranceSearchTerm.encumbrance_id == encumbrance_id))
+
+    @staticmethod
+    def remove_title(db: Session, title_document_id: int) -> None:
+        """Drop the terms of every encumbrance of a title before it is deleted."""
+        db.execute(
+            delete(EncumbranceSearchTerm).where(
+                EncumbranceSearchTerm.encumbrance_id.in_(
+                    select(Encumbrance.id).where(Encumbrance.title_document_id == title_document_id)
+                )
+            )
+        )
+
+    @staticmethod
+    def remove_project(db: Session, project_id: int) -> None:
+        """Drop the terms of every encumbrance of a project before it is deleted."""
+        db.execute(
+            delete(EncumbranceSearchTerm).where(
+                EncumbranceSearchTerm.encumbrance_id.in_(
+                    select(Encumbrance.id)
+                    .join(TitleDocument, Encumbrance.title_document_id == TitleDocument.id)
+                    .where(TitleDocument.project_id == project_id)
+                )
+            )
+        )
+
+    @staticmethod
+    def rebuild(db: Session, batch_size: int = REINDEX_BATCH_SIZE) -> int:
+        """
+        Rebuild the whole index from the encumbrance table.
+
+        Encumbrances are read in id order one batch at a time, and each batch
+        is committed, so the rebuild can run against a live database.
+
+        Args:
+            db: Database session
+            batch_size: Encumbrances per batch
+
+        Returns:
+            Number of encumbrances indexed
+        """
+        db.execute(delete(EncumbranceSearchTerm))
+        db.commit()
+
+        last_id = 0
+        indexed = 0
+        while True:
+            rows = db.execute(
+                select(Encumbrance.id, Encumbrance.document_number, Encumbrance.description, Encumbrance.signatories)
+                .where(Encumbrance.id > last_id)
+                .order_by(Encumbrance.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return indexed
+            EncumbranceSearchService.index_encumbrances(db, rows)
+            db.commit()
+            indexed += len(rows)
+            last_id = rows[-1][0]
+
+    @classmethod
+    async def _get_document_count(cls, db: AsyncSession) -> int:
+        with cls._lock:
+            if cls._document_count is not None and time.monotonic() - cls._document_count_at < DOCUMENT_COUNT_TTL:
+                return cls._document_count
+        count = await db.scalar(select(func.count()).select_from(Encumbrance))
+        with cls._lock:
+            cls._document_count = count
+            cls._document_count_at = time.monotonic()
+        return count
+
+    @classmethod
+    async def search(
+        cls,
+        db: AsyncSession,
+        query: str,
+        project_id: Optional[int] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the encumbrances that contain every term of a query.
+
+        Args:
+            db: Async database session
+            query: Words, company names or an instrument number
+            project_id: Only search this project's titles
+            limit: Maximum number of hits
+
+        Returns:
+            Hits with their project and title ids, best score first
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        term = EncumbranceSearchTerm.term
+        document_frequency = dict((await db.execute(
+            select(term, func.count()).where(term.in_(terms)).group_by(term)
+        )).all())
+        if len(document_frequency) < len(terms):
+            return []  # Some term occurs nowhere, so nothing contains them all
+
+        total = max(await cls._get_document_count(db), 1)
+        idf = {t: math.log(1 + total / df) for t, df in document_frequency.items()}
+
+        # Walk the rarest term's postings and look each encumbrance up in the
+        # other terms' postings by primary key, so the work is bounded by the
+        # shortest posting list rather than the longest
+        by_rarity = sorted(terms, key=document_frequency.get)
+        postings = [aliased(EncumbranceSearchTerm) for _ in by_rarity]
+        first = postings[0]
+        score = sum(p.weight * idf[t] for p, t in zip(postings, by_rarity))
+        ranked = select(first.encumbrance_id.label("encumbrance_id"), score.label("score")).where(
+            first.term == by_rarity[0]
+        )
+        for p, t in zip(postings[1:], by_rarity[1:]):
+            ranked = ranked.join(p, and_(p.encumbrance_id == first.encumbrance_id, p.term == t))
+        if project_id is not None:
+            ranked = ranked.where(
+                first.encumbrance_id.in_(
+                    select(Encumbrance.id)
+                    .join(TitleDocument, Encumbrance.title_document_id == TitleDocument.id)
+                    .where(TitleDocument.project_id == project_id)
+                )
+            )
+        # Ties go to the newest encumbrance. A single term ranks by weight
+        # alone, an order read straight off the (term, weight, encumbrance_id) index.
+        rank = first.weight if len(by_rarity) == 1 else score
+        ranked = ranked.order_by(rank.desc(), first.encumbrance_id.desc()).limit(limit).subquery()
+
+        stmt = (
+            select(
+                Encumbrance.id,
+                Encumbrance.title_document_id,
+                TitleDocument.project_id,
+                Project.proj_num,
+                Encumbrance.item_no,
+                Encumbrance.document_number,
+                Encumbrance.description,
+                Encumbrance.signatories,
+                ranked.c.score,
+            )
+            .join(ranked, ranked.c.encumbrance_id == Encumbrance.id)
+            .join(TitleDocument, Encumbrance.title_document_id == TitleDocument.id)
+            .join(Project, TitleDocument.project_id == Project.id)
+            .order_by(ranked.c.score.desc(), Encumbrance.id.desc())
+        )
+        return [dict(row._mapping) for row in await db.execute(stmt)]
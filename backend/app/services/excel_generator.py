@@ -2,9 +2,16 @@
 Service for document generation from templates.
 Wraps the existing templateGen.py logic for use in the FastAPI routes.
 """
-from typing import Dict, Any, Optional
+from itertools import chain
+from typing import Dict, Any, Optional, Iterable, Sequence, Tuple
 import xlsxwriter
 
+ENCUMBRANCE_COLUMNS = ("Document #", "Description", "Signatories", "Circulation Notes", "Action", "Status")
+DOCUMENT_TASK_COLUMNS = ("Document/Desc", "Copies/Dept", "Signatories", "Condition of Approval", "Circulation Notes", "Status")
+
+# A worksheet section: (section name, row tuples in column order)
+Section = Tuple[str, Iterable[Sequence[Any]]]
+
 
 class ExcelGeneratorService:
     """Handles generation of legal documents from templates."""
@@ -13,11 +20,94 @@ class ExcelGeneratorService:
     def write_header_row(worksheet, row, col_width,format,text):
         worksheet.merge_range(row,0,row,col_width-1,text,format)
 
+    @staticmethod
+    def write_table(worksheet, row, columns, lines, title_format, base_format, a_format, upper_column=None):
+        """
+        Write a table of row tuples below a section header.
+
+        Rows are consumed one at a time, so lines can be a generator or a
+        streaming query result.
+
+        Returns:
+            (next free row, first data row, last data row)
+        """
+        lines = iter(lines)
+        first_line = next(lines, None)
+        if first_line is not None:
+            worksheet.write(row,0,"Item #",title_format)
+            for index, key in enumerate(columns):
+                worksheet.write(row,index+1,key,title_format)
+            lines = chain((first_line,), lines)
+        firstrow = row+1
+        row +=1
+        for item_no, line in enumerate(lines):
+            worksheet.write(row,0,item_no+1,a_format)
+            for index, value in enumerate(line):
+                if index == upper_column:
+                    value = value.upper()
+                if value:
+                    value = value.rstrip()
+                worksheet.write(row,index+1,value,base_format)
+            row+=1
+        lastrow = row-1
+        return row, firstrow, lastrow
+
     @staticmethod
     def export_as_excel(fileobj,encumbrances = [], plans = {}, new_agreements = [],proj_num="0000.0000.00"):
-        print("exporting")
+        """
+        Export tracker tables given as lists of dicts keyed by column name.
+
+        Args:
+            fileobj: Filename or writable binary file object
+            encumbrances: {title name: [encumbrance row dicts]}
+            plans: {category code: [document task row dicts]}
+            new_agreements: [document task row dicts]
+            proj_num: Project number for the sheet title
+        """
+        def as_rows(lines):
+            if not lines:
+                return []
+            keys = list(lines[0].keys())
+            return [tuple(line.get(key) for key in keys) for line in lines]
+
+        def columns_of(lines, default):
+            return tuple(lines[0].keys()) if lines else default
+
+        ExcelGeneratorService.write_tracker(
+            fileobj,
+            encumbrance_sections=[(name, as_rows(title)) for name, title in encumbrances.items()],
+            plan_sections=[(name, as_rows(plan)) for name, plan in plans.items()],
+            new_agreements=as_rows(new_agreements),
+            proj_num=proj_num,
+            encumbrance_columns=columns_of(next(iter(encumbrances.values()), []), ENCUMBRANCE_COLUMNS),
+            task_columns=columns_of(new_agreements or next(iter(plans.values()), []), DOCUMENT_TASK_COLUMNS),
+        )
 
-        workbook = xlsxwriter.Workbook(fileobj, {"in_memory": True})
+    @staticmethod
+    def write_tracker(
+        fileobj,
+        encumbrance_sections: Iterable[Section] = (),
+        plan_sections: Iterable[Section] = (),
+        new_agreements: Iterable[Sequence[Any]] = (),
+        proj_num: str = "0000.0000.00",
+        encumbrance_columns: Sequence[str] = ENCUMBRANCE_COLUMNS,
+        task_columns: Sequence[str] = DOCUMENT_TASK_COLUMNS,
+        workbook_options: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Write the project document tracking workbook from row tuples.
+
+        Args:
+            fileobj: Filename or writable binary file object
+            encumbrance_sections: (title name, encumbrance rows) per title document
+            plan_sections: (category code, document task rows) per category
+            new_agreements: Document task rows for new agreements
+            proj_num: Project number for the sheet title
+            encumbrance_columns: Column names of the encumbrance rows
+            task_columns: Column names of the document task rows
+            workbook_options: xlsxwriter Workbook options (defaults to in-memory)
+        """
+        workbook = xlsxwriter.Workbook(fileobj, workbook_options or {"in_memory": True})
         worksheet = workbook.add_worksheet()
 
         title_format = workbook.add_format(
@@ -69,34 +159,19 @@ class ExcelGeneratorService:
         action_options = ["NO ACTION REQUIRED","CONSENT","PARTIAL DISCHARGE","FULL_DISCHARGE"]
         options = ["---","Prepared","Complete","No Action Required","Client for Execution","City for Execution","Third party for Execution"]
 
-        firstrow = 0
-        lastrow = 0
+        action_column = list(encumbrance_columns).index("Action") if "Action" in encumbrance_columns else None
+        formats = (title_format, base_format, a_format)
 
         row = 0
         ExcelGeneratorService.write_header_row(worksheet, row,7,title_format,"%s - PROJECT - DOCUMENT TRACKING"%proj_num)
         row += 1
-        for plan_name, title in encumbrances.items():
+        for plan_name, title in encumbrance_sections:
             ExcelGeneratorService.write_header_row(worksheet, row,7,section_format,"EXISTING ENCUMBRANCES ON TITLE - %s"%plan_name)
             row += 1
-            if len(title)>0:
-                table_keys = title[0].keys()
-                worksheet.write(row,0,"Item #",title_format)
-                for index, key in enumerate(table_keys):
-                    worksheet.write(row,index+1,key,title_format)
-            firstrow = row+1
-            row +=1
-            for item_no, line in enumerate(title):
-                worksheet.write(row,0,item_no+1,a_format)
-                for index, key in enumerate(table_keys):
-                    if key in line:
-                        if key == "Action":
-                            line[key] = line[key].upper()
-                        if line[key]:
-                            line[key] = line[key].rstrip()
-                        worksheet.write(row,index+1,line[key],base_format)
-                row+=1
-            lastrow = row-1
-            
+            row, firstrow, lastrow = ExcelGeneratorService.write_table(
+                worksheet, row, encumbrance_columns, title, *formats, upper_column=action_column
+            )
+
             worksheet.data_validation(
                 "G%i:G%i"%(firstrow+1,lastrow+1),
                 {
@@ -113,26 +188,13 @@ class ExcelGeneratorService:
                 },
             )
 
-        for plan_name, plan in plans.items():
+        for plan_name, plan in plan_sections:
             ExcelGeneratorService.write_header_row(worksheet, row,7,section_format,"PLAN - %s"%plan_name)
             row += 1
-            if len(plan)>0:
-                table_keys = plan[0].keys()
-                worksheet.write(row,0,"Item #",title_format)
-                for index, key in enumerate(table_keys):
-                    worksheet.write(row,index+1,key,title_format)
-            firstrow = row+1
-            row +=1
-            for item_no, line in enumerate(plan):
-                worksheet.write(row,0,item_no+1,a_format)
-                for index, key in enumerate(table_keys):
-                    if key in line:
-                        if line[key]:
-                            line[key] = line[key].rstrip()
-                        worksheet.write(row,index+1,line[key],base_format)
-                row+=1
-            lastrow = row-1
-            
+            row, firstrow, lastrow = ExcelGeneratorService.write_table(
+                worksheet, row, task_columns, plan, *formats
+            )
+
             worksheet.data_validation(
                 "G%i:G%i"%(firstrow+1,lastrow+1),
                 {
@@ -144,24 +206,10 @@ class ExcelGeneratorService:
 
         ExcelGeneratorService.write_header_row(worksheet, row,7,section_format,"NEW AGREEMENTS CONCURRENT WITH REGISTRATION")
         row += 1
-        if len(new_agreements)>0:
-            table_keys = new_agreements[0].keys()
-            worksheet.write(row,0,"Item #",title_format)
-            for index, key in enumerate(table_keys):
-                worksheet.write(row,index+1,key,title_format)
-        firstrow = row+1
-        row +=1
-        for item_no, line in enumerate(new_agreements):
-            worksheet.write(row,0,item_no+1,a_format)
-            for index, key in enumerate(table_keys):
-                if key in line:
-                    if line[key]:
-                            line[key] = line[key].rstrip()
-                    worksheet.write(row,index+1,line[key],base_format)
-            row+=1
+        row, firstrow, lastrow = ExcelGeneratorService.write_table(
+            worksheet, row, task_columns, new_agreements, *formats
+        )
 
-        lastrow = row-1
-            
         worksheet.data_validation(
             "G%i:G%i"%(firstrow+1,lastrow+1),
             {
@@ -203,4 +251,4 @@ class ExcelGeneratorService:
             },
         )
 
-        workbook.close() 
+        workbook.close()
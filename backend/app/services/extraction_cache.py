@@ -0,0 +1,155 @@
+"""
+Content-addressed cache for title certificate extraction results.
+Entries are keyed by the SHA-256 of the uploaded PDF plus the parser version,
+stored as JSON files, and evicted least-recently-used by entry count and size.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Any, Optional
+from app.config import (
+    EXTRACTION_CACHE_DIRECTORY,
+    EXTRACTION_CACHE_MAX_BYTES,
+    EXTRACTION_CACHE_MAX_ENTRIES,
+)
+from app.services.pdf_processor import PARSER_VERSION, PDFProcessorService
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ExtractionCacheService:
+    """Reuses extraction results for PDFs that have already been parsed."""
+
+    _lock = threading.Lock()
+    _hits = 0
+    _misses = 0
+    _evictions = 0
+
+    @staticmethod
+    def file_digest(file_path: str) -> str:
+        """Return the SHA-256 hex digest of a file, read in chunks."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _entry_path(digest: str) -> str:
+        return os.path.join(EXTRACTION_CACHE_DIRECTORY, f"{digest}-v{PARSER_VERSION}.json")
+
+    @classmethod
+    def get(cls, digest: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached extraction result.
+
+        Args:
+            digest: SHA-256 hex digest of the PDF
+
+        Returns:
+            The cached extraction result, or None on a miss
+        """
+        entry_path = cls._entry_path(digest)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                extracted_data = json.load(f)
+            os.utime(entry_path)  # Mark as recently used
+        except (OSError, ValueError):
+            with cls._lock:
+                cls._misses += 1
+            return None
+
+        with cls._lock:
+            cls._hits += 1
+        return extracted_data
+
+    @classmethod
+    def put(cls, digest: str, extracted_data: Dict[str, Any]) -> None:
+        """
+        Store an extraction result and evict old entries if over budget.
+
+        Args:
+            digest: SHA-256 hex digest of the PDF
+            extracted_data: Result of PDFProcessorService title processing
+        """
+        fd, temp_path = tempfile.mkstemp(dir=EXTRACTION_CACHE_DIRECTORY, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(extracted_data, f)
+            os.replace(temp_path, cls._entry_path(digest))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        cls._evict()
+
+    @classmethod
+    def _evict(cls) -> None:
+        """Remove least-recently-used entries until within the entry and byte budgets."""
+        entries = []
+        for entry in os.scandir(EXTRACTION_CACHE_DIRECTORY):
+            if entry.is_file() and entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        entries.sort()
+        evicted = 0
+        while entries and (
+            len(entries) > EXTRACTION_CACHE_MAX_ENTRIES or total_bytes > EXTRACTION_CACHE_MAX_BYTES
+        ):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_bytes -= size
+            evicted += 1
+
+        if evicted:
+            with cls._lock:
+                cls._evictions += evicted
+
+    @classmethod
+    def get_or_extract(cls, file_path: str, digest: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return the extraction result for a title PDF, parsing it only on a cache miss.
+
+        Args:
+            file_path: Path of the PDF on disk
+            digest: SHA-256 hex digest of the PDF, if already known
+
+        Returns:
+            Dictionary with extracted data including legal_desc and inst_on_title
+        """
+        digest = digest or cls.file_digest(file_path)
+        extracted_data = cls.get(digest)
+        if extracted_data is None:
+            extracted_data = PDFProcessorService.process_title_file(file_path)
+            cls.put(digest, extracted_data)
+        return extracted_data
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Return hit/miss counters and current cache size for this process."""
+        entries = 0
+        total_bytes = 0
+        for entry in os.scandir(EXTRACTION_CACHE_DIRECTORY):
+            if entry.is_file() and entry.name.endswith(".json"):
+                entries += 1
+                total_bytes += entry.stat().st_size
+
+        with cls._lock:
+            lookups = cls._hits + cls._misses
+            return {
+                "parser_version": PARSER_VERSION,
+                "hits": cls._hits,
+                "misses": cls._misses,
+                "hit_rate": cls._hits / lookups if lookups else 0.0,
+                "evictions": cls._evictions,
+                "entries": entries,
+                "bytes": total_bytes,
+            }
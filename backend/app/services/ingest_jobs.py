@@ -0,0 +1,293 @@
+"""
+Service for background ingestion of title certificate PDFs.
+Parsing runs in a bounded process pool; job state is persisted to the
+TitleIngestJob table so clients can poll for progress.
+
+Each job is claimed by one worker process at a time: the claim sets the
+job's owner and a lease in one conditional UPDATE, page progress renews the
+lease, and every later write (progress, failure, completion) only applies
+while the writer is still the owner. A worker that restarts next
+to live ones only takes over jobs whose lease has run out.
+"""
+import os
+import socket
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from pypdf import PdfReader
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+from app.config import INGEST_LEASE_SECONDS, INGEST_MAX_WORKERS, INGEST_PROGRESS_INTERVAL
+from app.database import SessionLocal, engine
+from app.models.title import TitleDocument, TitleIngestJob
+from app.services.pdf_processor import PDFProcessorService, TitleDocumentService
+from app.services.extraction_cache import ExtractionCacheService
+from app.services.project_version import ProjectVersionService
+from app.services.worker_pool import WorkerPool
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETE = "complete"
+JOB_FAILED = "failed"
+
+# Identifies this worker process as the owner of the jobs it claims
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _lease_until() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=INGEST_LEASE_SECONDS)
+
+
+class JobTakenOver(Exception):
+    """The job's lease ran out and another worker process claimed it."""
+
+
+def _update_job(job_id: int, owner: str, **fields) -> bool:
+    """
+    Write job fields in a short-lived session of their own, if owner still
+    holds the job. Returns False (and writes nothing) once another worker
+    process has taken it over.
+    """
+    db = SessionLocal()
+    try:
+        fields["updated_at"] = datetime.utcnow()
+        updated = db.query(TitleIngestJob).filter(
+            TitleIngestJob.id == job_id,
+            TitleIngestJob.owner == owner,
+        ).update(fields, synchronize_session=False)
+        db.commit()
+        return updated == 1
+    finally:
+        db.close()
+
+
+def _extract_title(job_id: int, owner: str, file_path: str) -> Dict[str, Any]:
+    """
+    Worker process entry point: parse a title PDF and report page progress.
+
+    Parsing stops as soon as a progress update finds the job owned by
+    another worker process.
+
+    Args:
+        job_id: ID of the ingestion job being processed
+        owner: WORKER_ID of the server process that claimed the job
+        file_path: Path of the uploaded PDF
+
+    Returns:
+        Extracted data as returned by PDFProcessorService.process_title_cert
+    """
+    pdf_reader = PdfReader(file_path)
+    pages_total = len(pdf_reader.pages)
+    if not _update_job(job_id, owner, state=JOB_RUNNING, pages_total=pages_total, pages_done=0):
+        raise JobTakenOver(job_id)
+
+    def page_texts():
+        for page_no, page in enumerate(pdf_reader.pages, start=1):
+            yield page.extract_text()
+            if page_no % INGEST_PROGRESS_INTERVAL == 0 or page_no == pages_total:
+                if not _update_job(job_id, owner, pages_done=page_no, lease_until=_lease_until()):
+                    raise JobTakenOver(job_id)
+
+    return PDFProcessorService.parse_page_texts(page_texts())
+
+
+class TitleIngestJobService:
+    """Queues title PDFs for parsing and persists the results."""
+
+    _pool = WorkerPool(INGEST_MAX_WORKERS)
+
+    @staticmethod
+    def submit(
+        db: Session,
+        project_id: int,
+        file_path: str,
+        digest: Optional[str] = None,
+    ) -> TitleIngestJob:
+        """
+        Record a new ingestion job, claimed by this process, and hand it to the process pool.
+
+        Args:
+            db: Database session
+            project_id: ID of the project the title belongs to
+            file_path: Path of the uploaded PDF
+            digest: SHA-256 hex digest of the PDF, if already known
+
+        Returns:
+            The TitleIngestJob, already complete if the PDF had been parsed before
+        """
+        job = TitleIngestJob(
+            project_id=project_id,
+            file_path=file_path,
+            state=JOB_QUEUED,
+            owner=WORKER_ID,
+            lease_until=_lease_until(),
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        TitleIngestJobService._dispatch(job.id, project_id, file_path, digest)
+        # A cached extraction completes the job before _dispatch returns
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def _claim(db: Session, job_id: int) -> bool:
+        """
+        Take ownership of an unfinished job that nobody holds a live lease on.
+
+        The check and the claim are one UPDATE, so when several worker
+        processes start together each job is claimed by exactly one of them.
+        """
+        now = datetime.utcnow()
+        result = db.execute(
+            update(TitleIngestJob)
+            .where(
+                TitleIngestJob.id == job_id,
+                TitleIngestJob.state.in_([JOB_QUEUED, JOB_RUNNING]),
+                or_(TitleIngestJob.owner.is_(None), TitleIngestJob.lease_until < now),
+            )
+            .values(state=JOB_QUEUED, pages_done=0, owner=WORKER_ID, lease_until=_lease_until(), updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def _dispatch(job_id: int, project_id: int, file_path: str, digest: Optional[str] = None) -> None:
+        if digest is None:
+            try:
+                digest = ExtractionCacheService.file_digest(file_path)
+            except OSError as e:
+                _update_job(job_id, WORKER_ID, state=JOB_FAILED, error=str(e))
+                return
+
+        # Previously parsed PDFs skip the worker pool entirely
+        extracted_data = ExtractionCacheService.get(digest)
+        if extracted_data is not None:
+            TitleIngestJobService._persist(job_id, project_id, file_path, extracted_data)
+            return
+
+        future = TitleIngestJobService._pool.submit(_extract_title, job_id, WORKER_ID, file_path)
+        future.add_done_callback(
+            lambda f: TitleIngestJobService._complete(job_id, project_id, file_path, digest, f)
+        )
+
+    @staticmethod
+    def _complete(job_id: int, project_id: int, file_path: str, digest: str, future: Future) -> None:
+        """Cache and persist the parsed encumbrances once a worker finishes."""
+        if future.cancelled():
+            # Released by shutdown(); picked up again by resume_pending() on next startup
+            return
+
+        try:
+            extracted_data = future.result()
+        except JobTakenOver:
+            return
+        except Exception as e:
+            _update_job(job_id, WORKER_ID, state=JOB_FAILED, error=str(e))
+            return
+
+        ExtractionCacheService.put(digest, extracted_data)
+        TitleIngestJobService._persist(job_id, project_id, file_path, extracted_data)
+
+    @staticmethod
+    def _persist(job_id: int, project_id: int, file_path: str, extracted_data: Dict[str, Any]) -> None:
+        """
+        Create the title document and encumbrances and mark the job complete.
+
+        Nothing is written if another process has taken the job over (its
+        lease ran out) or already completed it.
+        """
+        db = SessionLocal()
+        try:
+            completed = db.execute(
+                update(TitleIngestJob)
+                .where(
+                    TitleIngestJob.id == job_id,
+                    TitleIngestJob.owner == WORKER_ID,
+                    TitleIngestJob.state.in_([JOB_QUEUED, JOB_RUNNING]),
+                )
+                .values(state=JOB_COMPLETE, updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            if completed.rowcount != 1:
+                db.rollback()
+                return
+
+            title_doc = TitleDocument(
+                project_id=project_id,
+                file_path=file_path,
+                uploaded_by="system",  # TODO: Get from auth context
+            )
+            db.add(title_doc)
+            db.flush()
+
+            db.execute(
+                update(TitleIngestJob)
+                .where(TitleIngestJob.id == job_id)
+                .values(title_document_id=title_doc.id)
+                .execution_options(synchronize_session=False)
+            )
+            ProjectVersionService.bump(db, project_id)
+
+            # Commits the title document, encumbrances and job state together
+            TitleDocumentService.save_extracted_data(db, title_doc.id, extracted_data)
+        except Exception as e:
+            db.rollback()
+            _update_job(job_id, WORKER_ID, state=JOB_FAILED, error=str(e))
+        finally:
+            db.close()
+
+    @staticmethod
+    def resume_pending() -> int:
+        """
+        Create the job table if needed and requeue jobs interrupted by a restart.
+
+        Only jobs that are unclaimed or whose lease has run out are taken,
+        each claimed atomically, so jobs still running in another worker
+        process are left alone.
+
+        Returns:
+            Number of jobs requeued
+        """
+        TitleIngestJob.__table__.create(bind=engine, checkfirst=True)
+
+        db = SessionLocal()
+        try:
+            candidates = db.execute(
+                select(TitleIngestJob.id, TitleIngestJob.project_id, TitleIngestJob.file_path)
+                .where(
+                    TitleIngestJob.state.in_([JOB_QUEUED, JOB_RUNNING]),
+                    or_(TitleIngestJob.owner.is_(None), TitleIngestJob.lease_until < datetime.utcnow()),
+                )
+                .order_by(TitleIngestJob.id)
+            ).all()
+            jobs = [
+                (job_id, project_id, file_path)
+                for job_id, project_id, file_path in candidates
+                if TitleIngestJobService._claim(db, job_id)
+            ]
+        finally:
+            db.close()
+
+        for job_id, project_id, file_path in jobs:
+            TitleIngestJobService._dispatch(job_id, project_id, file_path)
+        return len(jobs)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the worker pool and release this process's unfinished jobs for the next startup."""
+        cls._pool.shutdown()
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(TitleIngestJob)
+                .where(TitleIngestJob.owner == WORKER_ID, TitleIngestJob.state.in_([JOB_QUEUED, JOB_RUNNING]))
+                .values(owner=None, lease_until=None)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
@@ -0,0 +1,77 @@
+"""
+Fast JSON responses.
+For a response_model route FastAPI validates the returned ORM objects,
+dumps the models to plain Python data, and encodes that with the json
+module. Routes whose response class is FastJSONResponse skip the middle
+step: FastJSONRoute validates the result and writes the JSON bytes in one
+TypeAdapter.dump_json call, so a project detail with thousands of nested
+encumbrances never becomes an intermediate tree of dicts. Responses without
+a response_model (plain dicts) are encoded by pydantic-core as well.
+A route opts out with response_class=JSONResponse.
+"""
+import asyncio
+import functools
+from typing import Any, Callable, Optional
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded by pydantic-core instead of the json module."""
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def _serialized(call: Callable, adapter: TypeAdapter, status_code: int, response_param: Optional[str]) -> Callable:
+    """Wrap an endpoint so it returns its result already encoded as a Response."""
+
+    def render(result: Any, values: dict) -> Response:
+        if isinstance(result, Response):
+            return result
+        try:
+            body = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+        except ValidationError as e:
+            raise ResponseValidationError(errors=e.errors(), body=result)
+
+        response = Response(content=body, status_code=status_code, media_type="application/json")
+        # Headers and status set on the endpoint's Response parameter, e.g. pagination cursors
+        sub_response = values.get(response_param) if response_param else None
+        if sub_response is not None:
+            if sub_response.status_code:
+                response.status_code = sub_response.status_code
+            response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(**values):
+            return render(await call(**values), values)
+    else:
+        # Runs in the threadpool like the endpoint, so encoding stays off the event loop
+        @functools.wraps(call)
+        def endpoint(**values):
+            return render(call(**values), values)
+    return endpoint
+
+
+class FastJSONRoute(APIRoute):
+    """APIRoute that encodes response_model results straight to JSON bytes for FastJSONResponse routes."""
+
+    def get_route_handler(self) -> Callable:
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        if self.response_field is not None and issubclass(response_class, FastJSONResponse):
+            self.dependant.call = _serialized(
+                self.dependant.call,
+                TypeAdapter(self.response_model),
+                self.status_code or 200,
+                self.dependant.response_param_name,
+            )
+        return super().get_route_handler()
@@ -0,0 +1,151 @@
+"""
+Process-wide cache of the lookup tables.
+Each table is read once, serialized to JSON and served from memory with an
+ETag so browsers can revalidate with 304 responses. The create endpoints
+invalidate the table they change; entries also expire after
+LOOKUP_CACHE_TTL seconds so other worker processes pick up the change.
+"""
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import LOOKUP_CACHE_TTL
+from app.models import EncumbranceAction, EncumbranceStatus, DocumentTaskStatus, DocumentCategory
+from app.schemas.document import DocumentCategoryResponse
+from app.schemas.lookups import (
+    EncumbranceActionResponse,
+    EncumbranceStatusResponse,
+    DocumentStatusResponse,
+)
+
+ENCUMBRANCE_ACTIONS = "encumbrance_actions"
+ENCUMBRANCE_STATUSES = "encumbrance_statuses"
+DOCUMENT_TASK_STATUSES = "document_task_statuses"
+DOCUMENT_CATEGORIES = "document_categories"
+
+# Table name: (model, response schema)
+LOOKUP_TABLES = {
+    ENCUMBRANCE_ACTIONS: (EncumbranceAction, EncumbranceActionResponse),
+    ENCUMBRANCE_STATUSES: (EncumbranceStatus, EncumbranceStatusResponse),
+    DOCUMENT_TASK_STATUSES: (DocumentTaskStatus, DocumentStatusResponse),
+    DOCUMENT_CATEGORIES: (DocumentCategory, DocumentCategoryResponse),
+}
+
+# Browsers may store the response but must revalidate it on every use
+LOOKUP_CACHE_CONTROL = "no-cache"
+
+
+def weak_etag(etag: str) -> str:
+    """
+    The ETag header value for a tag. Tags are sent weak because
+    CompressionMiddleware serves gzip and identity bodies under the same one.
+    """
+    return f"W/{etag}"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match names this ETag (weak or strong) or "*"."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
+@dataclass
+class CachedLookup:
+    """One lookup table as rows, serialized JSON and its ETag."""
+    rows: List[Dict[str, Any]]
+    body: bytes
+    etag: str
+    loaded_at: float
+
+
+class LookupCacheService:
+    """Serves lookup tables from memory, reloading them after a change or expiry."""
+
+    _lock = threading.Lock()
+    _entries: Dict[str, CachedLookup] = {}
+
+    @staticmethod
+    def _build(name: str, records) -> CachedLookup:
+        model, schema = LOOKUP_TABLES[name]
+        adapter = TypeAdapter(List[schema])
+        rows = adapter.validate_python(list(records), from_attributes=True)
+        body = adapter.dump_json(rows)
+        return CachedLookup(
+            rows=[row.model_dump() for row in rows],
+            body=body,
+            etag=f'"{hashlib.sha1(body).hexdigest()}"',
+            loaded_at=time.monotonic(),
+        )
+
+    @classmethod
+    def _cached(cls, name: str) -> Optional[CachedLookup]:
+        with cls._lock:
+            entry = cls._entries.get(name)
+        if entry is None or time.monotonic() - entry.loaded_at > LOOKUP_CACHE_TTL:
+            return None
+        return entry
+
+    @classmethod
+    def _store(cls, name: str, entry: CachedLookup) -> CachedLookup:
+        with cls._lock:
+            cls._entries[name] = entry
+        return entry
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> None:
+        """Read every lookup table into the cache (called at startup)."""
+        for name in LOOKUP_TABLES:
+            await cls.get(db, name)
+
+    @classmethod
+    def get_sync(cls, db: Session, name: str) -> CachedLookup:
+        """Return a cached lookup table, reading it with a sync session on a miss."""
+        entry = cls._cached(name)
+        if entry is None:
+            model, _ = LOOKUP_TABLES[name]
+            entry = cls._store(name, cls._build(name, db.query(model).order_by(model.id)))
+        return entry
+
+    @classmethod
+    async def get(cls, db: AsyncSession, name: str) -> CachedLookup:
+        """Return a cached lookup table, reading it with an async session on a miss."""
+        entry = cls._cached(name)
+        if entry is None:
+            model, _ = LOOKUP_TABLES[name]
+            result = await db.execute(select(model).order_by(model.id))
+            entry = cls._store(name, cls._build(name, result.scalars()))
+        return entry
+
+    @classmethod
+    def codes(cls, db: Session, name: str) -> Dict[int, str]:
+        """Return a lookup table as {id: code}."""
+        return {row["id"]: row["code"] for row in cls.get_sync(db, name).rows}
+
+    @classmethod
+    def invalidate(cls, name: str) -> None:
+        """Drop a table from the cache after it has been changed."""
+        with cls._lock:
+            cls._entries.pop(name, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop every cached table."""
+        with cls._lock:
+            cls._entries.clear()
+
+    @staticmethod
+    def response(request: Request, entry: CachedLookup) -> Response:
+        """Return the cached JSON, or 304 Not Modified if the client's copy is current."""
+        headers = {"ETag": weak_etag(entry.etag), "Cache-Control": LOOKUP_CACHE_CONTROL}
+        if etag_matches(request, entry.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,155 @@
+"""
+Keyset (cursor) pagination for the list endpoints.
+A page is read with WHERE (sort_key, id) > (last_sort_key, last_id) instead of
+OFFSET, so fetching page 100 costs the same index seek as page 1. The cursor
+handed to the client is an opaque token holding the sort key and the last
+row's values; the list stays a plain JSON array, with the cursor and the
+optional total count returned in response headers.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+PAGINATION_HEADERS = [NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER]
+
+
+@dataclass
+class Page:
+    """One page of rows and the cursor for the page after it."""
+    items: List[Any]
+    next_cursor: Optional[str]
+    total: Optional[int] = None
+
+    def apply_headers(self, response: Response) -> List[Any]:
+        """Set the pagination headers on the response and return the rows."""
+        if self.next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = self.next_cursor
+        if self.total is not None:
+            response.headers[TOTAL_COUNT_HEADER] = str(self.total)
+        return self.items
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    """Build an opaque cursor positioned after a row."""
+    raw = json.dumps([sort, value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _is_a(value: Any, value_type: type) -> bool:
+    # JSON true/false decode to bool, which is a subclass of int
+    return isinstance(value, value_type) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str, sort: str, value_type: type) -> tuple:
+    """
+    Read the (sort value, id) a cursor points after.
+
+    Args:
+        cursor: Cursor from a previous page's X-Next-Cursor header
+        sort: The requested sort, which the cursor must have been issued for
+        value_type: Python type of the sort column (str or int)
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed, holds values of the
+            wrong type or was issued for another sort
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, row_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+    if not _is_a(value, value_type) or not _is_a(row_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, row_id
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    model: type,
+    sort: str,
+    sort_columns: Dict[str, Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    include_total: bool = False,
+) -> Page:
+    """
+    Read one page of a filtered select, by cursor or by offset.
+
+    Rows are ordered by the sort column then id, so the order is total even
+    when sort values repeat. A leading "-" on the sort name sorts descending.
+    With a cursor, skip is ignored. Every page, including offset pages,
+    returns a cursor for the next one, so clients can switch to cursors at
+    any point.
+
+    Args:
+        db: Async database session
+        stmt: select(model) with the endpoint's filters and loader options,
+            or a column projection of model that includes its id and sort columns
+        model: Mapped class being listed (must have an integer id)
+        sort: Sort name, optionally prefixed with "-"
+        sort_columns: Allowed sort names and their non-nullable columns
+        limit: Page size
+        cursor: Cursor from a previous page's X-Next-Cursor header
+        skip: Rows to skip when no cursor is given
+        include_total: Also count every row matching the filters
+
+    Returns:
+        The page of rows (model instances, or Row tuples for a projection),
+        the next cursor (None on the last page) and the total if requested
+    """
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    name = sort.lstrip("-")
+    descending = sort.startswith("-")
+    if name not in sort_columns:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sort '{name}'; use one of: {', '.join(sort_columns)}",
+        )
+    column = sort_columns[name]
+
+    total = None
+    if include_total:
+        total = await db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+
+    page = stmt
+    if cursor is not None:
+        value, row_id = decode_cursor(cursor, sort, column.type.python_type)
+        # Expanded form of (column, id) > (value, row_id); SQL Server has no row-value comparison
+        if column is model.id:
+            after = model.id < row_id if descending else model.id > row_id
+        elif descending:
+            after = or_(column < value, and_(column == value, model.id < row_id))
+        else:
+            after = or_(column > value, and_(column == value, model.id > row_id))
+        page = page.where(after)
+    elif skip:
+        page = page.offset(skip)
+
+    if column is model.id:
+        order = (model.id.desc() if descending else model.id.asc(),)
+    else:
+        order = (column.desc(), model.id.desc()) if descending else (column.asc(), model.id.asc())
+
+    # One extra row tells whether there is a next page
+    result = await db.execute(page.order_by(*order).limit(limit + 1))
+    if stmt.column_descriptions[0]["expr"] is model:
+        rows = result.scalars().unique().all()
+    else:
+        rows = result.all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, getattr(last, column.key), last.id)
+    return Page(items=rows, next_cursor=next_cursor, total=total)
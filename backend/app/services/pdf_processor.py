@@ -4,39 +4,236 @@ Wraps the existing utils.py logic for use in the FastAPI routes.
 """
 import re
 import json
-from typing import Dict, List, Any, Optional
+import math
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
 from pypdf import PdfReader
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from app.config import PDF_EXTRACT_WORKERS, PDF_PARALLEL_PAGE_THRESHOLD
 from app.models.title import TitleDocument, Encumbrance
 from app.schemas.title import EncumbranceResponse
+from app.services.encumbrance_search import EncumbranceSearchService
+from app.services.worker_pool import WorkerPool
+
+
+# Bump whenever extraction output changes; invalidates cached extraction results
+PARSER_VERSION = "3"
+
+# Instrument detection patterns
+M_RN = re.compile(r'[\d]{3} [\d]{3} [\d]{3}|\d{2,}[A-Za-z]{2,}')
+M_DATE = re.compile(r'[\d]{2}/[0-9]{2}/[\d]{4}')
+M_INST = re.compile(r'(?:[A-Z]{3,}(?: [A-Z]+)*)')
+M_INST_COUNT = re.compile(r'[\d]{3}')
+
+SIGNATORY_MARKERS = ("GRANTEE", "CAVEATOR", "MORTGAGEE")
+
+
+def _extract_page_range(page_range: Tuple[str, int, int]) -> List[str]:
+    """Worker process entry point: extract text for pages [start, stop) of a PDF."""
+    file_path, start, stop = page_range
+    pdf_reader = PdfReader(file_path)
+    return [pdf_reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+class TitleCertParser:
+    """
+    Single-pass state machine over the stripped lines of a title certificate.
+
+    Lines are fed one at a time with feed(); the legal description, the
+    instruments on title and the TOTAL INSTRUMENTS count are all picked up
+    in the same pass, and result() returns the same dictionary shape that
+    process_title_cert has always returned.
+    """
+
+    def __init__(self):
+        self._index = 0
+
+        # Legal description state: line numbers as in the original index
+        # scan (0 = not found), and every line since the last heading, since a
+        # later EXCEPTING line still moves the end of the description
+        self._legal_start = 0
+        self._legal_end = 0
+        self._legal_lines: List[str] = []
+
+        # Instrument state
+        self._inst_started = False
+        self._inst_date = ""
+        self._inst_rn = ""
+        self._inst_name = ""
+        self._inst_lines: List[str] = []
+        self.inst_on_title: List[Dict[str, Any]] = []
+
+        # TOTAL INSTRUMENTS state
+        self._inst_count_in_title: Optional[int] = None
+        self._inst_count_error = False
+
+    def feed(self, line: str) -> None:
+        """Consume the next line of the stripped document."""
+        self._feed_legal_desc(line)
+        self._feed_instrument(line)
+
+        if "TOTAL INSTRUMENTS:" in line:
+            result_inst_count = M_INST_COUNT.search(line)
+            if result_inst_count:
+                self._inst_count_in_title = int(result_inst_count.group())
+            else:
+                self._inst_count_error = True
+
+        self._index += 1
+
+    def _feed_legal_desc(self, line: str) -> None:
+        # The description starts after the last LEGAL DESCRIPTION heading and
+        # ends at the last EXCEPTING line, or before the first ATS REFERENCE
+        # line when no EXCEPTING line came before it
+        if line == "LEGAL DESCRIPTION":
+            self._legal_start = self._index + 1
+            self._legal_lines = []
+            return
+
+        if line == "EXCEPTING THEREOUT ALL MINES AND MINERALS":
+            self._legal_end = self._index
+        if "ATS REFERENCE:" in line and self._legal_end == 0:
+            self._legal_end = self._index - 1
+        if self._legal_start:
+            self._legal_lines.append(line)
+
+    def _feed_instrument(self, line: str) -> None:
+        line_for_rn = line
+        result_date = M_DATE.search(line)
+        if result_date:
+            line_for_rn = line.replace(result_date.group(), " ")
+        result_rn = M_RN.search(line_for_rn)
+        is_inst_start = bool(result_date and result_rn)
+
+        if "TOTAL INSTRUMENTS" in line or (is_inst_start and self._inst_started):
+            self._emit_instrument()
+
+        if is_inst_start:
+            # This line is the beginning of an instrument (one on the very
+            # first line is not treated as started, as in the original scan)
+            self._inst_started = self._index > 0
+            self._inst_date = result_date.group()
+            self._inst_rn = result_rn.group()
+            result_name = M_INST.search(line)
+            self._inst_name = result_name.group() if result_name else "---------------"
+            self._inst_lines = []
+        elif self._index > 0 or self._inst_started:
+            self._inst_lines.append(line)
+
+    def _emit_instrument(self) -> None:
+        sign_text = "".join(
+            line.split(' - ')[1] + "\n"
+            for line in self._inst_lines
+            if any(marker in line for marker in SIGNATORY_MARKERS)
+        )
+        self.inst_on_title.append(
+            {
+                "date": self._inst_date,
+                "reg_number": self._inst_rn,
+                "name": self._inst_name,
+                "description": "".join(l + "\n" for l in self._inst_lines),
+                "signatories": sign_text,
+                "temp_selection": 4,
+            }
+        )
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Finish parsing and build the extraction result.
+
+        Raises:
+            ValueError: If the legal description or instrument count cannot be read
+        """
+        if not self._legal_start or not self._legal_end:
+            raise ValueError("Unable to locate legal description in text!")
+
+        legal_lines = self._legal_lines[:max(0, self._legal_end - self._legal_start + 1)]
+        ret_dict = {
+            "legal_desc": "".join(l + "\n" for l in legal_lines),
+            "inst_on_title": self.inst_on_title,
+        }
+
+        if self._inst_count_error:
+            raise ValueError("Cannot decipher the number of instruments listed on the TOTAL INSTRUMENTS line")
+        if self._inst_count_in_title is not None:
+            ret_dict["inst_count_in_title"] = self._inst_count_in_title
+            ret_dict["inst_count"] = len(self.inst_on_title)
+
+        return ret_dict
 
 
 class PDFProcessorService:
     """Handles PDF title certificate processing and encumbrance extraction."""
 
+    _pool = WorkerPool(PDF_EXTRACT_WORKERS)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the page extraction worker pool."""
+        cls._pool.shutdown()
+
     @staticmethod
-    def process_title_cert(pdf_reader: PdfReader) -> Dict[str, Any]:
+    def extract_page_texts(
+        file_path: str,
+        workers: Optional[int] = None,
+        threshold: Optional[int] = None,
+    ) -> Iterator[str]:
         """
-        Process a PDF title certificate to extract legal description and instruments.
-        
+        Extract the text of every page of a PDF, in page order.
+
+        Documents with fewer pages than the threshold are extracted in this
+        process. Larger documents are split into page ranges that worker
+        processes extract in parallel, each with its own PdfReader over the
+        same file; ranges are yielded back in order as they complete.
+
         Args:
-            pdf_reader: PyPDF PdfReader instance with loaded document
-            
-        Returns:
-            Dictionary with extracted data including legal_desc and inst_on_title
+            file_path: Path of the PDF on disk
+            workers: Worker process count (defaults to PDF_EXTRACT_WORKERS)
+            threshold: Minimum page count for parallel extraction
+                (defaults to PDF_PARALLEL_PAGE_THRESHOLD)
+
+        Yields:
+            Extracted text of each page
         """
-        ret_dict = {}
+        workers = workers or PDF_EXTRACT_WORKERS
+        threshold = PDF_PARALLEL_PAGE_THRESHOLD if threshold is None else threshold
 
-        # Strip out page numbers/headers for easier processing
-        stripped_document = ""
-        for page in pdf_reader.pages:
-            formatted_page = ""
-            text = page.extract_text().splitlines()
+        pdf_reader = PdfReader(file_path)
+        page_count = len(pdf_reader.pages)
+
+        if workers <= 1 or page_count < threshold:
+            for page in pdf_reader.pages:
+                yield page.extract_text()
+            return
+
+        # Several ranges per worker so a slow range doesn't leave the others idle
+        chunk_size = max(1, math.ceil(page_count / (workers * 4)))
+        page_ranges = [
+            (file_path, start, min(start + chunk_size, page_count))
+            for start in range(0, page_count, chunk_size)
+        ]
+
+        PDFProcessorService._pool.resize(workers)
+        for page_texts in PDFProcessorService._pool.map(_extract_page_range, page_ranges):
+            yield from page_texts
+
+    @staticmethod
+    def iter_stripped_lines(page_texts: Iterable[str]) -> Iterator[str]:
+        """
+        Yield the lines of a title certificate with page numbers/headers removed.
+
+        Args:
+            page_texts: Extracted text of each page, in page order
+
+        Yields:
+            Document lines, one page at a time
+        """
+        for page_text in page_texts:
             skip_counter = 0
-            
-            for idx, line in enumerate(text):
+
+            for idx, line in enumerate(page_text.splitlines()):
                 should_include_line = True
-                
+
                 if line == "( CONTINUED )":
                     should_include_line = False
                 if "---------" in line and idx == 0:
@@ -46,117 +243,65 @@ class PDFProcessorService:
                 if skip_counter > 0:
                     skip_counter -= 1
                     should_include_line = False
-                    
+
                 if should_include_line:
-                    formatted_page = formatted_page + line + "\n"
-                    
-            stripped_document = stripped_document + formatted_page
-
-        # Extract legal description
-        text = stripped_document.splitlines()
-        legal_desc_start_index = 0
-        legal_desc_end_index = 0
-        
-        for idx, line in enumerate(text):
-            if line == "LEGAL DESCRIPTION":
-                legal_desc_start_index = idx + 1
-            if line == "EXCEPTING THEREOUT ALL MINES AND MINERALS":
-                legal_desc_end_index = idx
-            if "ATS REFERENCE:" in line and legal_desc_end_index == 0:
-                legal_desc_end_index = idx - 1
-
-        legal_desc_text = ""
-        if legal_desc_start_index != 0 and legal_desc_end_index != 0:
-            for i in range(legal_desc_start_index, legal_desc_end_index + 1):
-                legal_desc_text = legal_desc_text + text[i] + "\n"
-            ret_dict["legal_desc"] = legal_desc_text
-        else:
-            raise ValueError("Unable to locate legal description in text!")
+                    yield line
 
-        # Extract instruments on title
-        m_rn = re.compile(r'[\d]{3} [\d]{3} [\d]{3}|\d{2,}[A-Za-z]{2,}')
-        m_date = re.compile(r'[\d]{2}/[0-9]{2}/[\d]{4}')
-        m_inst = re.compile(r'(?:[A-Z]{3,}(?: [A-Z]+)*)')
-        
-        inst_start_index = 0
-        inst_end_index = 0
-
-        inst_count = 0
-
-        inst_date = ""
-        inst_rn = ""
-        inst_name = ""
-
-        inst_on_title = []
-        inst_page_number = 0
-        for idx, i in enumerate(text):
-            has_date=False
-            has_rn=False
-            end_of_inst = False
-            line_for_rn = i
-            result_date = m_date.search(i)
-            if result_date:
-                has_date=True
-                temp_date = result_date.group()
-                line_for_rn = i.replace(temp_date, " ")
-            result_rn = m_rn.search(line_for_rn)
-            if result_rn:
-                has_rn=True
-            if "TOTAL INSTRUMENTS" in i:
-                end_of_inst = True
-            if has_rn and has_date:
-                #This is an instrument
-                if inst_start_index!=0:
-                    end_of_inst = True
-
-            if end_of_inst:
-                inst_end_index=idx-1
-                inst_text = ""
-                sign_text = ""
-                for j in range(inst_start_index+1,inst_end_index+1):
-                    inst_text = inst_text + text[j] + "\n"
-                    if "GRANTEE" in text[j] or "CAVEATOR" in text[j] or "MORTGAGEE" in text[j]:
-                        signatory = text[j].split(' - ')[1]
-                        sign_text = sign_text + signatory + "\n"
-
-                new_inst = {}
-
-                new_inst["date"] = inst_date
-                new_inst["reg_number"] = inst_rn
-                new_inst["name"] = inst_name
-                new_inst["description"] = inst_text
-                new_inst["signatories"] = sign_text
-                new_inst["temp_selection"] = 4
-
-                inst_on_title.append(new_inst)
-
-            if has_rn and has_date:
-                #This line is the beginning of an instrument
-                inst_date = result_date.group()
-                inst_rn = result_rn.group()
-                inst_start_index=idx
-                result_name = m_inst.search(i)
-
-                if result_name:
-                    inst_name = result_name.group()
-                else:
-                    inst_name = "---------------"
-
-        ret_dict["inst_on_title"] = inst_on_title
-
-        # Count instruments
-        m_inst_count = re.compile(r'[\d]{3}')
-        for idx, line in enumerate(text):
-            if "TOTAL INSTRUMENTS:" in line:
-                result_inst_count = m_inst_count.search(line)
-                if result_inst_count:
-                    inst_count_in_title = int(result_inst_count.group())
-                    ret_dict["inst_count_in_title"] = inst_count_in_title
-                    ret_dict["inst_count"] = len(inst_on_title)
-                else:
-                    raise ValueError("Cannot decipher the number of instruments listed on the TOTAL INSTRUMENTS line")
+    @staticmethod
+    def parse_page_texts(page_texts: Iterable[str]) -> Dict[str, Any]:
+        """
+        Parse already-extracted page text into legal description and instruments.
 
-        return ret_dict
+        Args:
+            page_texts: Extracted text of each page, in page order
+
+        Returns:
+            Dictionary with extracted data including legal_desc and inst_on_title
+        """
+        parser = TitleCertParser()
+        for line in PDFProcessorService.iter_stripped_lines(page_texts):
+            parser.feed(line)
+        return parser.result()
+
+    @staticmethod
+    def process_title_cert(pdf_reader: PdfReader) -> Dict[str, Any]:
+        """
+        Process a PDF title certificate to extract legal description and instruments.
+
+        Pages are extracted and parsed one at a time, so the full document
+        text is never assembled in memory.
+
+        Args:
+            pdf_reader: PyPDF PdfReader instance with loaded document
+            
+        Returns:
+            Dictionary with extracted data including legal_desc and inst_on_title
+        """
+        return PDFProcessorService.parse_page_texts(
+            page.extract_text() for page in pdf_reader.pages
+        )
+
+    @staticmethod
+    def process_title_file(
+        file_path: str,
+        workers: Optional[int] = None,
+        threshold: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Process a title certificate PDF on disk, extracting large documents in parallel.
+
+        Args:
+            file_path: Path of the PDF on disk
+            workers: Worker process count (defaults to PDF_EXTRACT_WORKERS)
+            threshold: Minimum page count for parallel extraction
+                (defaults to PDF_PARALLEL_PAGE_THRESHOLD)
+
+        Returns:
+            Dictionary with extracted data including legal_desc and inst_on_title
+        """
+        return PDFProcessorService.parse_page_texts(
+            PDFProcessorService.extract_page_texts(file_path, workers, threshold)
+        )
 
 
 class TitleDocumentService:
@@ -166,32 +311,53 @@ class TitleDocumentService:
     def save_extracted_data(
         db: Session,
         title_doc_id: int,
-        extracted_data: Dict[str, Any]
-    ) -> List[Encumbrance]:
+        extracted_data: Dict[str, Any],
+        commit: bool = True,
+    ) -> List[int]:
         """
         Save extracted encumbrance data to the database.
-        
+
+        All encumbrances for the title are written as one INSERT batch in the
+        session's current transaction, together with their search index terms,
+        so they commit with the TitleDocument row when it was added in the
+        same session.
+
         Args:
             db: Database session
             title_doc_id: ID of the title document
             extracted_data: Dictionary with extracted encumbrance data
-            
+            commit: Commit the transaction once the rows are inserted
+
         Returns:
-            List of created Encumbrance objects
+            IDs of the created encumbrances, in item order
         """
-        encumbrances = []
-        
-        for idx, inst in enumerate(extracted_data.get("inst_on_title", []), start=1):
-            encumbrance = Encumbrance(
-                title_document_id=title_doc_id,
-                item_no=idx,
-                document_number=inst.get("reg_number"),
-                encumbrance_date=None,  # Parse from inst["date"] if needed
-                description=inst.get("name"),
-                signatories=inst.get("signatories"),
-            )
-            db.add(encumbrance)
-            encumbrances.append(encumbrance)
-        
-        db.commit()
-        return encumbrances
+        rows = [
+            {
+                "title_document_id": title_doc_id,
+                "item_no": idx,
+                "document_number": inst.get("reg_number"),
+                "encumbrance_date": None,  # Parse from inst["date"] if needed
+                "description": inst.get("name"),
+                "signatories": inst.get("signatories"),
+            }
+            for idx, inst in enumerate(extracted_data.get("inst_on_title", []), start=1)
+        ]
+
+        inserted = []
+        if rows:
+            # RETURNING order is not guaranteed for a batched insert, so the
+            # ids are put back in item order rather than asking the dialect to
+            # fall back to one statement per row
+            inserted = db.execute(
+                insert(Encumbrance).returning(Encumbrance.item_no, Encumbrance.id),
+                rows,
+            ).all()
+            ids_by_item = dict(inserted)
+            EncumbranceSearchService.index_encumbrances(db, [
+                (ids_by_item[row["item_no"]], row["document_number"], row["description"], row["signatories"])
+                for row in rows
+            ])
+
+        if commit:
+            db.commit()
+        return [encumbrance_id for _, encumbrance_id in sorted(inserted)]
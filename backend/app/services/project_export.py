@@ -0,0 +1,327 @@
+"""
+Service for exporting project document trackers to Excel.
+Fetches every row for a project in a few set-based queries, resolves lookup
+codes from a snapshot of the lookup tables, and streams the row tuples
+straight into the workbook. Batches of projects are exported in a worker
+pool and streamed back as a ZIP archive.
+"""
+import os
+import tempfile
+import zipfile
+from concurrent.futures import as_completed
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Dict, Any, BinaryIO, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import EXPORT_SPOOL_MAX_SIZE, EXPORT_CHUNK_SIZE, EXPORT_MAX_WORKERS
+from app.database import SessionLocal
+from app.models import (
+    Project,
+    TitleDocument,
+    Encumbrance,
+    DocumentTask,
+)
+from app.schemas.document import EXISTING_ENCUMBRANCES_CATEGORY_ID
+from app.services.excel_generator import ExcelGeneratorService
+from app.services.lookup_cache import (
+    LookupCacheService,
+    ENCUMBRANCE_ACTIONS,
+    ENCUMBRANCE_STATUSES,
+    DOCUMENT_CATEGORIES,
+    DOCUMENT_TASK_STATUSES,
+)
+from app.services.worker_pool import WorkerPool
+
+# Rows fetched per round trip when streaming encumbrances
+EXPORT_BATCH_SIZE = 1000
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+@dataclass
+class LookupSnapshot:
+    """Lookup table codes by id, loaded once and shared across workbooks."""
+    encumbrance_actions: Dict[int, str]
+    encumbrance_statuses: Dict[int, str]
+    document_categories: Dict[int, str]
+    document_task_statuses: Dict[int, str]
+
+    @classmethod
+    def load(cls, db: Session) -> "LookupSnapshot":
+        """Take the lookup codes from the lookup cache, reading only tables it does not hold."""
+        return cls(
+            encumbrance_actions=LookupCacheService.codes(db, ENCUMBRANCE_ACTIONS),
+            encumbrance_statuses=LookupCacheService.codes(db, ENCUMBRANCE_STATUSES),
+            document_categories=LookupCacheService.codes(db, DOCUMENT_CATEGORIES),
+            document_task_statuses=LookupCacheService.codes(db, DOCUMENT_TASK_STATUSES),
+        )
+
+
+class _ChunkWriter:
+    """Write-only file object that collects bytes for a streaming ZIP."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _export_project_to_file(
+    project_id: int,
+    lookups: LookupSnapshot,
+    directory: str,
+) -> Tuple[int, Optional[str], str]:
+    """Worker process entry point: write one project's workbook to a file."""
+    file_path = os.path.join(directory, f"{project_id}.xlsx")
+    db = SessionLocal()
+    try:
+        proj_num = ProjectExportService.export_project(
+            db,
+            project_id,
+            file_path,
+            lookups=lookups,
+            workbook_options={"constant_memory": True, "tmpdir": directory},
+        )
+    finally:
+        db.close()
+    return project_id, proj_num, file_path
+
+
+def iter_file_chunks(fileobj: BinaryIO, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file from the start in fixed-size chunks, closing it when done."""
+    try:
+        fileobj.seek(0)
+        for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+class ProjectExportService:
+    """Builds tracker workbooks from set-based project queries."""
+
+    _pool = WorkerPool(EXPORT_MAX_WORKERS)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the batch export worker pool."""
+        cls._pool.shutdown()
+
+    @staticmethod
+    def _encumbrance_sections(
+        db: Session,
+        project_id: int,
+        lookups: LookupSnapshot,
+    ) -> Iterator[Tuple[str, Iterator[tuple]]]:
+        """Yield (title name, encumbrance rows) for every title, rows streamed from one query."""
+        title_ids = [
+            title_id
+            for (title_id,) in db.query(TitleDocument.id)
+            .filter(TitleDocument.project_id == project_id)
+            .order_by(TitleDocument.id)
+        ]
+
+        rows = (
+            db.query(
+                Encumbrance.title_document_id,
+                Encumbrance.document_number,
+                Encumbrance.description,
+                Encumbrance.signatories,
+                Encumbrance.circulation_notes,
+                Encumbrance.action_id,
+                Encumbrance.status_id,
+            )
+            .join(TitleDocument, Encumbrance.title_document_id == TitleDocument.id)
+            .filter(TitleDocument.project_id == project_id)
+            .order_by(Encumbrance.title_document_id, Encumbrance.id)
+            .yield_per(EXPORT_BATCH_SIZE)
+        )
+        actions = lookups.encumbrance_actions
+        statuses = lookups.encumbrance_statuses
+        grouped = groupby(rows, key=lambda r: r[0])
+        current = next(grouped, None)
+
+        for title_id in title_ids:
+            if current is not None and current[0] == title_id:
+                title_rows = (
+                    (
+                        doc_num, desc, signatories, notes,
+                        actions.get(action_id) or "",
+                        statuses.get(status_id) or "",
+                    )
+                    for _, doc_num, desc, signatories, notes, action_id, status_id in current[1]
+                )
+                yield f"Title Document {title_id}", title_rows
+                current = next(grouped, None)
+            else:
+                yield f"Title Document {title_id}", iter(())
+
+    @staticmethod
+    def _document_task_sections(
+        db: Session,
+        project_id: int,
+        lookups: LookupSnapshot,
+    ) -> Tuple[Dict[str, List[tuple]], List[tuple]]:
+        """Return document task rows grouped by category code, plus the new agreement rows."""
+        rows = (
+            db.query(
+                DocumentTask.category_id,
+                DocumentTask.doc_desc,
+                DocumentTask.copies_dept,
+                DocumentTask.signatories,
+                DocumentTask.condition_of_approval,
+                DocumentTask.circulation_notes,
+                DocumentTask.document_status_id,
+            )
+            .filter(DocumentTask.project_id == project_id)
+            .order_by(DocumentTask.id)
+        )
+
+        plans: Dict[str, List[tuple]] = {}
+        new_agreements: List[tuple] = []
+        for category_id, *values, status_id in rows:
+            row = (*values, lookups.document_task_statuses.get(status_id) or "")
+            if category_id == EXISTING_ENCUMBRANCES_CATEGORY_ID:
+                new_agreements.append(row)
+            else:
+                category_code = lookups.document_categories.get(category_id)
+                plans.setdefault(category_code or "UNCATEGORIZED", []).append(row)
+        return plans, new_agreements
+
+    @staticmethod
+    def export_project(
+        db: Session,
+        project_id: int,
+        fileobj,
+        lookups: Optional[LookupSnapshot] = None,
+        workbook_options: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """
+        Write the document tracking workbook for a project.
+
+        Args:
+            db: Database session
+            project_id: ID of the project to export
+            fileobj: Filename or writable binary file object
+            lookups: Lookup codes to use (loaded from db if not given)
+            workbook_options: xlsxwriter Workbook options
+
+        Returns:
+            The project number, or None if the project does not exist
+        """
+        proj_num = db.query(Project.proj_num).filter(Project.id == project_id).scalar()
+        if proj_num is None:
+            return None
+
+        lookups = lookups or LookupSnapshot.load(db)
+
+        # Tasks are few and must be grouped by category, so they are fetched up
+        # front; encumbrances stream from the cursor while the sheet is written.
+        plans, new_agreements = ProjectExportService._document_task_sections(db, project_id, lookups)
+
+        ExcelGeneratorService.write_tracker(
+            fileobj,
+            encumbrance_sections=ProjectExportService._encumbrance_sections(db, project_id, lookups),
+            plan_sections=plans.items(),
+            new_agreements=new_agreements,
+            proj_num=proj_num,
+            workbook_options=workbook_options,
+        )
+        return proj_num
+
+    @staticmethod
+    def export_project_spooled(db: Session, project_id: int) -> Tuple[Optional[str], Optional[BinaryIO]]:
+        """
+        Write a project's workbook row by row into a spooled temporary file.
+
+        The workbook is built in xlsxwriter's constant_memory mode, so each
+        row is flushed as soon as the next one starts, and the finished file
+        stays in memory only up to EXPORT_SPOOL_MAX_SIZE before spilling to
+        disk. Stream it with iter_file_chunks(), which closes it.
+
+        Args:
+            db: Database session
+            project_id: ID of the project to export
+
+        Returns:
+            (project number, spooled file), or (None, None) if the project does not exist
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+        try:
+            proj_num = ProjectExportService.export_project(
+                db,
+                project_id,
+                spool,
+                workbook_options={"constant_memory": True},
+            )
+        except BaseException:
+            spool.close()
+            raise
+
+        if proj_num is None:
+            spool.close()
+            return None, None
+        return proj_num, spool
+
+    @staticmethod
+    def export_projects_zip(
+        project_ids: List[int],
+        lookups: LookupSnapshot,
+        missing_ids: Optional[List[int]] = None,
+    ) -> Iterator[bytes]:
+        """
+        Export several projects in the worker pool and stream them as a ZIP archive.
+
+        Each workbook is added to the archive as soon as its worker finishes,
+        so the first entries are sent while later projects are still being
+        generated. All workers share the same lookup snapshot.
+
+        Args:
+            project_ids: IDs of the projects to export
+            lookups: Lookup codes shared by every workbook
+            missing_ids: Requested IDs that were not found, listed in ERRORS.txt
+
+        Yields:
+            Chunks of the ZIP archive
+        """
+        writer = _ChunkWriter()
+        errors = [f"Project {project_id}: not found" for project_id in missing_ids or []]
+
+        with tempfile.TemporaryDirectory() as directory:
+            futures = {
+                ProjectExportService._pool.submit(_export_project_to_file, project_id, lookups, directory): project_id
+                for project_id in project_ids
+            }
+            try:
+                # Workbooks are already compressed; store them as-is
+                with zipfile.ZipFile(writer, "w", compression=zipfile.ZIP_STORED) as archive:
+                    for future in as_completed(futures):
+                        try:
+                            project_id, proj_num, file_path = future.result()
+                        except Exception as e:
+                            errors.append(f"Project {futures[future]}: {e}")
+                            continue
+                        if proj_num is None:
+                            errors.append(f"Project {project_id}: not found")
+                            continue
+
+                        archive.write(file_path, f"{proj_num}_document_tracking.xlsx")
+                        os.remove(file_path)
+                        yield writer.drain()
+
+                    if errors:
+                        archive.writestr("ERRORS.txt", "\n".join(errors) + "\n")
+                yield writer.drain()
+            finally:
+                for future in futures:
+                    future.cancel()
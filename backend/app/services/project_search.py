@@ -0,0 +1,270 @@
+"""
+Type-ahead project search.
+An in-memory index of every project's number, name and municipality answers
+a query without a table scan: project numbers are kept sorted for prefix
+lookups, and name/municipality text is indexed by trigram for substring
+matches. The index only picks candidate ids; the rows are then read from the
+database and checked again, so a stale index can miss a project but never
+return a wrong one. The project routes update the index as they change
+projects, and it is rebuilt in the background every PROJECT_SEARCH_REFRESH
+seconds to pick up changes made through other worker processes.
+"""
+import asyncio
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import PROJECT_SEARCH_REFRESH
+from app.database import AsyncSessionLocal
+from app.models import Project
+from app.services.query_profiles import PROJECT_RESPONSE
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Candidate sets up to this size are sorted; larger ones are filtered in number order
+SMALL_CANDIDATE_SET = 2000
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _tokens(query: str) -> List[str]:
+    return _TOKEN_RE.findall(query.lower())
+
+
+@dataclass
+class _IndexedProject:
+    """The searchable fields of one project, lowercased."""
+    id: int
+    proj_num: str
+    text: str  # "name municipality"
+    surveyor_id: Optional[int]
+
+    @classmethod
+    def of(cls, project_id: int, proj_num: str, name: str, municipality: Optional[str], surveyor_id: Optional[int]):
+        return cls(project_id, proj_num.lower(), f"{name} {municipality or ''}".lower(), surveyor_id)
+
+    def matches_text(self, tokens: List[str]) -> bool:
+        return all(token in self.text for token in tokens)
+
+
+class _SearchIndex:
+    """Sorted project numbers plus a trigram index over name and municipality."""
+
+    def __init__(self, projects: Iterable[_IndexedProject] = ()):
+        self.projects: Dict[int, _IndexedProject] = {}
+        self.proj_nums: List[Tuple[str, int]] = []
+        self.trigrams: Dict[str, Set[int]] = defaultdict(set)
+        self.loaded_at = time.monotonic()
+        for project in projects:
+            self.projects[project.id] = project
+            self.proj_nums.append((project.proj_num, project.id))
+            for gram in _trigrams(project.text):
+                self.trigrams[gram].add(project.id)
+        self.proj_nums.sort()
+
+    def add(self, project: _IndexedProject) -> None:
+        self.remove(project.id)
+        self.projects[project.id] = project
+        insort(self.proj_nums, (project.proj_num, project.id))
+        for gram in _trigrams(project.text):
+            self.trigrams[gram].add(project.id)
+
+    def remove(self, project_id: int) -> None:
+        project = self.projects.pop(project_id, None)
+        if project is None:
+            return
+        index = bisect_left(self.proj_nums, (project.proj_num, project.id))
+        if index < len(self.proj_nums) and self.proj_nums[index] == (project.proj_num, project.id):
+            del self.proj_nums[index]
+        for gram in _trigrams(project.text):
+            ids = self.trigrams.get(gram)
+            if ids is not None:
+                ids.discard(project_id)
+                if not ids:
+                    del self.trigrams[gram]
+
+    def _text_candidates(self, tokens: List[str]) -> Optional[Set[int]]:
+        """
+        Ids whose text contains every trigram of every token, or None if no
+        token is long enough to have a trigram (every project is a candidate).
+        """
+        candidates: Optional[Set[int]] = None
+        for token in tokens:
+            for gram in _trigrams(token):
+                ids = self.trigrams.get(gram, set())
+                candidates = set(ids) if candidates is None else candidates & ids
+                if not candidates:
+                    return set()
+        return candidates
+
+    def _in_number_order(self, candidates: Optional[Set[int]]) -> Iterable[_IndexedProject]:
+        """Candidates in project-number order, stopping as soon as the caller does."""
+        if candidates is not None and len(candidates) <= SMALL_CANDIDATE_SET:
+            entries = sorted((self.projects[project_id] for project_id in candidates), key=lambda p: p.proj_num)
+            return iter(entries)
+        # Common words match a large share of projects: walk the numbers in
+        # order instead of sorting every match, since only the first few are needed
+        return (
+            self.projects[project_id]
+            for _, project_id in self.proj_nums
+            if candidates is None or project_id in candidates
+        )
+
+    def search(self, query: str, surveyor_id: Optional[int], limit: int) -> List[int]:
+        """Project-number prefix matches first, then name/municipality matches, each in number order."""
+        prefix = query.strip().lower()
+        tokens = _tokens(query)
+        found: List[int] = []
+
+        index = bisect_left(self.proj_nums, (prefix,))
+        while index < len(self.proj_nums) and len(found) < limit:
+            proj_num, project_id = self.proj_nums[index]
+            if not proj_num.startswith(prefix):
+                break
+            if surveyor_id is None or self.projects[project_id].surveyor_id == surveyor_id:
+                found.append(project_id)
+            index += 1
+
+        if tokens and len(found) < limit:
+            seen = set(found)
+            for project in self._in_number_order(self._text_candidates(tokens)):
+                if (
+                    project.id not in seen
+                    and (surveyor_id is None or project.surveyor_id == surveyor_id)
+                    and project.matches_text(tokens)
+                ):
+                    found.append(project.id)
+                    if len(found) == limit:
+                        break
+        return found
+
+
+class ProjectSearchService:
+    """Keeps the project search index current and answers search queries."""
+
+    _lock = threading.Lock()
+    _index: Optional[_SearchIndex] = None
+    _refresh: Optional["asyncio.Task"] = None
+    # One change log per rebuild in progress: (project id, new entry or None if removed)
+    _rebuild_logs: List[List[Tuple[int, Optional[_IndexedProject]]]] = []
+
+    @classmethod
+    async def rebuild(cls, db: AsyncSession) -> int:
+        """
+        Reload the index from the database; returns the number of projects indexed.
+
+        Projects indexed or removed while the rows are being read may be
+        missing from them, so those changes are recorded and replayed onto
+        the new index before it replaces the current one.
+        """
+        log: List[Tuple[int, Optional[_IndexedProject]]] = []
+        with cls._lock:
+            cls._rebuild_logs.append(log)
+        try:
+            result = await db.execute(
+                select(Project.id, Project.proj_num, Project.name, Project.municipality, Project.surveyor_id)
+            )
+            index = _SearchIndex(_IndexedProject.of(*row) for row in result)
+        except BaseException:
+            with cls._lock:
+                cls._rebuild_logs.remove(log)
+            raise
+        with cls._lock:
+            cls._rebuild_logs.remove(log)
+            for project_id, entry in log:
+                if entry is None:
+                    index.remove(project_id)
+                else:
+                    index.add(entry)
+            cls._index = index
+        return len(index.projects)
+
+    @classmethod
+    async def _rebuild_in_background(cls) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await cls.rebuild(db)
+        except Exception as e:
+            print(f"✗ Project search index refresh failed: {e}")
+        finally:
+            cls._refresh = None
+
+    @classmethod
+    def index_project(cls, project: Project) -> None:
+        """Add or refresh one project after it has been created or updated."""
+        entry = _IndexedProject.of(project.id, project.proj_num, project.name, project.municipality, project.surveyor_id)
+        with cls._lock:
+            if cls._index is not None:
+                cls._index.add(entry)
+            for log in cls._rebuild_logs:
+                log.append((entry.id, entry))
+
+    @classmethod
+    def remove_project(cls, project_id: int) -> None:
+        """Drop a deleted project from the index."""
+        with cls._lock:
+            if cls._index is not None:
+                cls._index.remove(project_id)
+            for log in cls._rebuild_logs:
+                log.append((project_id, None))
+
+    @classmethod
+    async def search(
+        cls,
+        db: AsyncSession,
+        query: str = "",
+        surveyor_id: Optional[int] = None,
+        limit: int = 20,
+    ) -> List[Project]:
+        """
+        Find projects for a type-ahead box.
+
+        A project matches if its number starts with the query, or if every
+        word of the query appears in its name or municipality. Number matches
+        come first, in project-number order.
+
+        Args:
+            db: Async database session
+            query: Text typed so far (empty lists projects in number order)
+            surveyor_id: Only return this surveyor's projects
+            limit: Maximum number of projects
+
+        Returns:
+            Matching projects loaded for ProjectResponse
+        """
+        with cls._lock:
+            index = cls._index
+        if index is None:
+            await cls.rebuild(db)
+        elif time.monotonic() - index.loaded_at > PROJECT_SEARCH_REFRESH and cls._refresh is None:
+            # Keep answering from the current index while a fresh one is built
+            cls._refresh = asyncio.create_task(cls._rebuild_in_background())
+        with cls._lock:
+            ids = cls._index.search(query, surveyor_id, limit)
+        if not ids:
+            return []
+
+        stmt = select(Project).options(*PROJECT_RESPONSE).where(Project.id.in_(ids))
+        if surveyor_id is not None:
+            stmt = stmt.where(Project.surveyor_id == surveyor_id)
+        rows = {project.id: project for project in (await db.execute(stmt)).scalars()}
+
+        # Drop rows that changed since they were indexed and no longer match
+        prefix = query.strip().lower()
+        tokens = _tokens(query)
+        projects = []
+        for project_id in ids:
+            project = rows.get(project_id)
+            if project is None:
+                continue
+            entry = _IndexedProject.of(project.id, project.proj_num, project.name, project.municipality, project.surveyor_id)
+            if entry.proj_num.startswith(prefix) or (tokens and entry.matches_text(tokens)):
+                projects.append(project)
+        return projects
@@ -0,0 +1,116 @@
+"""
+Per-project data versions for conditional GETs.
+Project.data_version is bumped in the same transaction as every write to a
+project, its titles, encumbrances or document tasks, so one number names
+the state of everything the project's read endpoints return. They send it
+as a weak ETag (list endpoints add their query string, so every page has
+its own tag), and a request whose If-None-Match still matches gets 304 Not
+Modified after reading that one column, before any rows are loaded or
+serialized. The detail endpoints load the project row anyway, so they only
+read the version first for conditional requests and otherwise tag the
+response from the loaded row, saving a round trip.
+"""
+import hashlib
+from typing import Optional
+from fastapi import Request, Response, status
+from sqlalchemy import ColumnElement, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import APP_VERSION
+from app.models import Project, TitleDocument
+from app.services.lookup_cache import etag_matches, weak_etag
+
+# Browsers may store the response but must revalidate it on every use
+PROJECT_CACHE_CONTROL = "no-cache"
+
+
+def _bump(db: Session, condition: ColumnElement) -> None:
+    db.execute(
+        update(Project)
+        .where(condition)
+        .values(data_version=Project.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class ProjectVersionService:
+    """Bumps project data versions on writes and answers conditional GETs from them."""
+
+    @staticmethod
+    def bump(db: Session, project_id: int) -> None:
+        """Mark a project as changed, in the session's current transaction."""
+        _bump(db, Project.id == project_id)
+
+    @staticmethod
+    def bump_for_title(db: Session, title_id: int) -> None:
+        """Mark the project a title document belongs to as changed."""
+        _bump(db, Project.id == select(TitleDocument.project_id).where(TitleDocument.id == title_id).scalar_subquery())
+
+    @staticmethod
+    def bump_for_surveyor(db: Session, surveyor_id: int) -> None:
+        """Mark every project of a surveyor as changed."""
+        _bump(db, Project.surveyor_id == surveyor_id)
+
+    @staticmethod
+    def etag(project_id: int, data_version: int, variant: str = "") -> str:
+        """
+        ETag of a project's data; includes the app version so a deploy that
+        changes a schema invalidates it, and a hash of the variant (a list's
+        query string) so each page of a list is tagged separately.
+        """
+        tag = f"{APP_VERSION}-{project_id}-{data_version}"
+        if variant:
+            tag += "-" + hashlib.sha1(variant.encode()).hexdigest()[:16]
+        return f'"{tag}"'
+
+    @staticmethod
+    def _headers(etag: str) -> dict:
+        return {"ETag": weak_etag(etag), "Cache-Control": PROJECT_CACHE_CONTROL}
+
+    @staticmethod
+    def is_conditional(request: Request) -> bool:
+        """True if the request has an If-None-Match header to answer."""
+        return "if-none-match" in request.headers
+
+    @classmethod
+    def tag(cls, response: Response, project: Project) -> None:
+        """Send the ETag of a project the endpoint loaded itself."""
+        response.headers.update(cls._headers(cls.etag(project.id, project.data_version)))
+
+    @classmethod
+    async def not_modified(
+        cls,
+        db: AsyncSession,
+        request: Request,
+        response: Response,
+        condition: ColumnElement,
+        variant: str = "",
+    ) -> Optional[Response]:
+        """
+        Answer a conditional GET for one project's data.
+
+        The version is read before the endpoint loads anything, so a write
+        landing in between can only make the body newer than its ETag,
+        which the next request revalidates.
+
+        Args:
+            db: Async database session
+            request: Incoming request, for its If-None-Match header
+            response: The endpoint's response, which gets the ETag
+            condition: Selects the project, e.g. Project.id == project_id
+            variant: What else the body depends on, e.g. request.url.query
+                for a paginated list
+
+        Returns:
+            A 304 response if the client's copy is current, otherwise None
+            (also when no project matches) for the endpoint to carry on
+        """
+        row = (await db.execute(select(Project.id, Project.data_version).where(condition))).first()
+        if row is None:
+            return None
+        etag = cls.etag(row.id, row.data_version, variant)
+        headers = cls._headers(etag)
+        if etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+        return None
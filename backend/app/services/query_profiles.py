@@ -0,0 +1,78 @@
+"""
+Eager-loading profiles for the response schemas.
+Each profile loads exactly the relationships its schema serializes, so an
+endpoint issues a fixed number of queries however many rows it returns.
+Use with Query.options(*PROFILE) or select(Model).options(*PROFILE).
+
+The summary projections are column lists for the compact list schemas: they
+load no relationships at all, and count children with correlated COUNT
+subqueries that read only the foreign key indexes.
+Use with select(*PROJECTION).
+"""
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload, selectinload
+from app.models import Project, SurveyorALS, TitleDocument, Encumbrance, DocumentTask
+
+# EncumbranceResponse: action, status
+ENCUMBRANCE_RESPONSE = (
+    joinedload(Encumbrance.action),
+    joinedload(Encumbrance.status),
+)
+
+# TitleDocumentResponse: encumbrances -> EncumbranceResponse
+TITLE_DOCUMENT_RESPONSE = (
+    selectinload(TitleDocument.encumbrances).options(*ENCUMBRANCE_RESPONSE),
+)
+
+# DocumentTaskResponse: category, document_status, legal_document_template, legal_document
+DOCUMENT_TASK_RESPONSE = (
+    joinedload(DocumentTask.category),
+    joinedload(DocumentTask.document_status),
+    joinedload(DocumentTask.legal_document_template),
+    joinedload(DocumentTask.legal_document),
+)
+
+# ProjectResponse: surveyor
+PROJECT_RESPONSE = (
+    joinedload(Project.surveyor),
+)
+
+# ProjectDetailResponse: surveyor, title_documents -> TitleDocumentResponse,
+# document_tasks -> DocumentTaskResponse
+PROJECT_DETAIL_RESPONSE = PROJECT_RESPONSE + (
+    selectinload(Project.title_documents).options(*TITLE_DOCUMENT_RESPONSE),
+    selectinload(Project.document_tasks).options(*DOCUMENT_TASK_RESPONSE),
+)
+
+
+def _count(model, foreign_key, parent):
+    return (
+        select(func.count())
+        .select_from(model)
+        .where(foreign_key == parent.id)
+        .correlate(parent)
+        .scalar_subquery()
+    )
+
+
+# ProjectSummary: join SurveyorALS on Project.surveyor_id for surveyor_name
+PROJECT_SUMMARY = (
+    Project.id,
+    Project.proj_num,
+    Project.name,
+    Project.municipality,
+    Project.surveyor_id,
+    SurveyorALS.name.label("surveyor_name"),
+    _count(TitleDocument, TitleDocument.project_id, Project).label("title_document_count"),
+    _count(DocumentTask, DocumentTask.project_id, Project).label("document_task_count"),
+)
+
+# TitleDocumentSummary
+TITLE_DOCUMENT_SUMMARY = (
+    TitleDocument.id,
+    TitleDocument.project_id,
+    TitleDocument.file_path,
+    TitleDocument.uploaded_by,
+    TitleDocument.uploaded_at,
+    _count(Encumbrance, Encumbrance.title_document_id, TitleDocument).label("encumbrance_count"),
+)
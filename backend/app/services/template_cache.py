@@ -0,0 +1,126 @@
+"""
+In-memory cache of parsed DOCX templates.
+Each template file is parsed once and kept as a pristine Document keyed by
+path, modification time and size; callers get a private copy to render into.
+Entries are evicted least-recently-used by entry count and file size.
+"""
+import copy
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.part import XmlPart
+from app.config import TEMPLATE_CACHE_MAX_BYTES, TEMPLATE_CACHE_MAX_ENTRIES
+
+# (absolute path, mtime in ns, size in bytes)
+TemplateKey = Tuple[str, int, int]
+
+
+class _CachedTemplate:
+    """A parsed template plus the XML elements its copies can share."""
+
+    def __init__(self, doc: Document, size: int):
+        self.doc = doc
+        self.size = size
+
+        # Rendering only rewrites the body, headers and footers. Every other
+        # XML part (styles, numbering, theme, settings, ...) is shared with
+        # the copies instead of being deep-copied each time.
+        rendered_parts = {id(doc.part)}
+        for rel in doc.part.rels.values():
+            if rel.reltype in (RT.HEADER, RT.FOOTER) and not rel.is_external:
+                rendered_parts.add(id(rel.target_part))
+        self.shared_elements = {
+            id(part.element): part.element
+            for part in doc.part.package.iter_parts()
+            if isinstance(part, XmlPart) and id(part) not in rendered_parts
+        }
+
+    def copy(self) -> Document:
+        # Pre-seeding the memo makes deepcopy reuse the shared elements as-is
+        return copy.deepcopy(self.doc, dict(self.shared_elements))
+
+
+class TemplateCacheService:
+    """Hands out render-ready copies of templates, parsing each file only once."""
+
+    _lock = threading.Lock()
+    _entries: "OrderedDict[TemplateKey, _CachedTemplate]" = OrderedDict()
+    _bytes = 0
+    _hits = 0
+    _misses = 0
+    _evictions = 0
+
+    @staticmethod
+    def _key(template_path: str) -> TemplateKey:
+        stat = os.stat(template_path)
+        return os.path.abspath(template_path), stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def load(cls, template_path: str) -> Document:
+        """
+        Return a private copy of a template, parsing the file on a cache miss.
+
+        An edited template gets a new modification time and so a new key; the
+        stale entry ages out of the cache.
+
+        Args:
+            template_path: Path to the template DOCX file
+
+        Returns:
+            A Document that can be rendered and saved without touching the cache
+        """
+        key = cls._key(template_path)
+        with cls._lock:
+            cached = cls._entries.get(key)
+            if cached is not None:
+                cls._entries.move_to_end(key)
+                cls._hits += 1
+            else:
+                cls._misses += 1
+
+        if cached is None:
+            cached = _CachedTemplate(Document(template_path), key[2])
+            cls._store(key, cached)
+        return cached.copy()
+
+    @classmethod
+    def _store(cls, key: TemplateKey, cached: _CachedTemplate) -> None:
+        """Add a parsed template and evict least-recently-used entries if over budget."""
+        with cls._lock:
+            previous = cls._entries.pop(key, None)
+            if previous is not None:
+                cls._bytes -= previous.size
+            cls._entries[key] = cached
+            cls._bytes += cached.size
+
+            # The newest entry is always kept, even if it alone exceeds the budget
+            while len(cls._entries) > 1 and (
+                len(cls._entries) > TEMPLATE_CACHE_MAX_ENTRIES or cls._bytes > TEMPLATE_CACHE_MAX_BYTES
+            ):
+                _, evicted = cls._entries.popitem(last=False)
+                cls._bytes -= evicted.size
+                cls._evictions += 1
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop every cached template."""
+        with cls._lock:
+            cls._entries.clear()
+            cls._bytes = 0
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Return hit/miss counters and current cache size for this process."""
+        with cls._lock:
+            lookups = cls._hits + cls._misses
+            return {
+                "hits": cls._hits,
+                "misses": cls._misses,
+                "hit_rate": cls._hits / lookups if lookups else 0.0,
+                "evictions": cls._evictions,
+                "entries": len(cls._entries),
+                "bytes": cls._bytes,
+            }
@@ -0,0 +1,89 @@
+"""
+Service for writing uploaded files to disk.
+Copies uploads in fixed-size blocks, hashing as it goes, so memory use is
+bounded by the chunk size regardless of file size. Each upload is stored
+under a name of its own, so uploads that share a client filename never
+replace each other's file.
+"""
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from typing import BinaryIO
+from app.config import MAX_UPLOAD_SIZE, UPLOAD_CHUNK_SIZE
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured maximum size."""
+
+
+@dataclass
+class SavedUpload:
+    """A file written to disk by UploadWriterService."""
+    file_path: str
+    filename: str  # Name the client uploaded it under
+    size: int
+    sha256: str
+
+
+class UploadWriterService:
+    """Streams uploaded files to disk with size enforcement."""
+
+    @staticmethod
+    def save(
+        source: BinaryIO,
+        directory: str,
+        filename: str,
+        max_size: int = MAX_UPLOAD_SIZE,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+    ) -> SavedUpload:
+        """
+        Copy a file-like object to disk in blocks and atomically move it into place.
+
+        The data is written to a temporary file in the target directory and
+        only renamed to its final name once fully copied, so readers never
+        see a partial file. The final name is a new UUID with the upload's
+        extension.
+
+        Args:
+            source: Readable binary file object (e.g. UploadFile.file)
+            directory: Directory to save the file in
+            filename: Client's name for the file; any path components are discarded
+            max_size: Maximum allowed size in bytes
+            chunk_size: Size of each block read from the source
+
+        Returns:
+            SavedUpload with the final path, original filename, size and SHA-256 hex digest
+
+        Raises:
+            UploadTooLargeError: If the upload exceeds max_size
+        """
+        filename = os.path.basename(filename)
+        file_path = os.path.join(directory, uuid.uuid4().hex + os.path.splitext(filename)[1].lower())
+        digest = hashlib.sha256()
+        size = 0
+
+        # Created like open() would, so the kernel applies the umask; the final
+        # name is a fresh UUID, so O_EXCL never meets another upload's file
+        temp_path = file_path + ".part"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = source.read(chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_size:
+                        raise UploadTooLargeError(
+                            f"File exceeds the maximum upload size of {max_size / (1024 * 1024):g} MB"
+                        )
+                    digest.update(chunk)
+                    f.write(chunk)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return SavedUpload(file_path=file_path, filename=filename, size=size, sha256=digest.hexdigest())
@@ -0,0 +1,70 @@
+"""
+Process pools for CPU-bound work (PDF parsing, Excel exports, document
+rendering).
+Each service keeps one WorkerPool, started on first use. A worker process
+that dies (killed for running out of memory on a huge PDF, say) breaks its
+whole ProcessPoolExecutor for good, so the pool is replaced and the work
+resubmitted instead of every later request failing until a restart.
+"""
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Iterator, Optional
+from app.database import engine
+
+
+def _init_worker() -> None:
+    """Drop connections inherited from the parent process when forked."""
+    engine.dispose(close=False)
+
+
+class WorkerPool:
+    """A process pool that is started lazily and replaced when it breaks."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self, broken: Optional[ProcessPoolExecutor] = None) -> ProcessPoolExecutor:
+        """The current executor, replacing it first if it is the broken one."""
+        with self._lock:
+            if self._executor is not None and self._executor is broken:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+            return self._executor
+
+    def submit(self, fn: Callable, *args: Any) -> Future:
+        """Run fn(*args) in a worker process."""
+        executor = self._get_executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            return self._get_executor(broken=executor).submit(fn, *args)
+
+    def map(self, fn: Callable, iterable: Iterable) -> Iterator:
+        """Like ProcessPoolExecutor.map: results in the order of the arguments."""
+        args = list(iterable)
+        executor = self._get_executor()
+        try:
+            return executor.map(fn, args)
+        except BrokenProcessPool:
+            return self._get_executor(broken=executor).map(fn, args)
+
+    def resize(self, max_workers: int) -> None:
+        """Use a different number of workers from the next submission on."""
+        with self._lock:
+            if max_workers != self.max_workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+                self.max_workers = max_workers
+
+    def shutdown(self) -> None:
+        """Stop the workers and cancel work that has not started."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
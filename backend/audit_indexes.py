@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Audit the database's indexes against the models.
+Compares Base.metadata with the live schema and reports foreign keys that
+no index leads with, model indexes (the columns the app filters and sorts
+on) that have not been created, and tables that do not exist yet. An index
+only counts if it starts with the columns being looked up, since SQL Server
+can only seek on an index's leading columns.
+Run from backend directory: python audit_indexes.py [--sql]
+With --sql, prints CREATE statements for everything that is missing.
+"""
+import sys
+import os
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from sqlalchemy import Table, inspect  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.schema import CreateIndex, CreateTable  # noqa: E402
+
+
+@dataclass
+class Finding:
+    """One missing table or index."""
+    table: str
+    columns: Tuple[str, ...]
+    problem: str
+    sql: str
+
+    def __str__(self) -> str:
+        columns = f" ({', '.join(self.columns)})" if self.columns else ""
+        return f"{self.table}{columns}: {self.problem}"
+
+
+def _covered(columns: Sequence[str], indexed: List[Tuple[str, ...]]) -> bool:
+    """True if some index starts with exactly these columns."""
+    wanted = tuple(column.lower() for column in columns)
+    return any(index[:len(wanted)] == wanted for index in indexed)
+
+
+def _model_indexes(table: Table) -> List[Tuple[str, ...]]:
+    """Column lists the model itself declares an index, key or unique constraint on."""
+    indexed = [tuple(column.name.lower() for column in index.columns) for index in table.indexes]
+    indexed.append(tuple(column.name.lower() for column in table.primary_key.columns))
+    indexed.extend((column.name.lower(),) for column in table.columns if column.unique)
+    return indexed
+
+
+def _live_indexes(inspector, table_name: str) -> List[Tuple[str, ...]]:
+    """Column lists the database has an index, key or unique constraint on."""
+    indexed = [
+        tuple(column.lower() for column in index["column_names"] if column)
+        for index in inspector.get_indexes(table_name)
+    ]
+    indexed.append(tuple(column.lower() for column in inspector.get_pk_constraint(table_name)["constrained_columns"]))
+    indexed.extend(
+        tuple(column.lower() for column in constraint["column_names"])
+        for constraint in inspector.get_unique_constraints(table_name)
+    )
+    return indexed
+
+
+def audit_indexes(engine: Engine) -> List[Finding]:
+    """
+    Compare the models' tables and indexes with the database's.
+
+    Args:
+        engine: Engine connected to the database to audit
+
+    Returns:
+        Everything the database (or a model) is missing, in table order
+    """
+    import app.models  # noqa: F401  (registers every table on Base.metadata)
+    from app.database import Base
+
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    live_tables = {name.lower(): name for name in inspector.get_table_names()}
+    findings: List[Finding] = []
+
+    for table in Base.metadata.sorted_tables:
+        live_name = live_tables.get(table.name.lower())
+        if live_name is None:
+            statements = [CreateTable(table)] + [CreateIndex(index) for index in table.indexes]
+            sql = ";\n".join(str(s.compile(dialect=engine.dialect)).strip() for s in statements) + ";"
+            findings.append(Finding(table.name, (), "table does not exist", sql))
+            continue
+
+        declared = _model_indexes(table)
+        live = _live_indexes(inspector, live_name)
+
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            columns = tuple(column.name for column in index.columns)
+            if not _covered(columns, live):
+                sql = str(CreateIndex(index).compile(dialect=engine.dialect)).strip() + ";"
+                findings.append(Finding(table.name, columns, f"model index {index.name} is missing", sql))
+
+        for fk in sorted(table.foreign_key_constraints, key=lambda c: c.column_keys):
+            columns = tuple(column.name for column in fk.columns)
+            if _covered(columns, declared):
+                continue  # Reported above if the database lacks it
+            name = f"ix_{table.name}_{'_'.join(columns)}"
+            sql = (
+                f"CREATE INDEX {preparer.quote(name)} ON {preparer.format_table(table)} "
+                f"({', '.join(preparer.quote(column) for column in columns)});"
+            )
+            problem = "foreign key has no index in the model" + ("" if _covered(columns, live) else " or database")
+            findings.append(Finding(table.name, columns, problem, sql))
+
+    return findings
+
+
+def main() -> int:
+    from app.database import engine
+
+    print(f"Auditing indexes on: {engine.url.render_as_string(hide_password=True)}\n")
+    findings = audit_indexes(engine)
+    if "--sql" in sys.argv[1:]:
+        for finding in findings:
+            print(f"-- {finding}")
+            print(finding.sql)
+        return 1 if findings else 0
+
+    for finding in findings:
+        print(f"  ✗ {finding}")
+    if findings:
+        print(f"\n✗ {len(findings)} missing index(es) or table(s); run with --sql for the statements")
+        return 1
+    print("✓ Every foreign key and model index is covered")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
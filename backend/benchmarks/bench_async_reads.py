@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+"""
+Load-test the project list and detail endpoints with many concurrent clients.
+Compares the async routes (AsyncSession) with the previous sync routes, which
+hold a Starlette threadpool thread for the whole request.
+Run from the backend directory:
+    python benchmarks/bench_async_reads.py [clients] [requests_per_client] [latency_ms] [database_url]
+Without a database_url a temporary SQLite database is created and seeded,
+and every statement is delayed by latency_ms to stand in for the network
+round trip to SQL Server. With a database_url, the first project in that
+database is read (nothing is written) and no delay is added.
+
+The list endpoint is mostly waiting on the database and gains from async.
+The detail endpoint spends most of its time in Python, building and
+validating about 120 nested rows, which async cannot overlap, so expect it
+to run about even with the sync route (or a little behind, since the async
+driver adds a thread hop per statement).
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+CLIENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+REQUESTS_PER_CLIENT = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+LATENCY_MS = float(sys.argv[3]) if len(sys.argv) > 3 else 50.0
+DATABASE_URL = sys.argv[4] if len(sys.argv) > 4 else None
+
+_tmp = None
+if DATABASE_URL is None:
+    _tmp = tempfile.TemporaryDirectory()
+    DATABASE_URL = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ.pop("ASYNC_DATABASE_URL", None)
+# Give both engines more connections than the threadpool has threads, so the
+# sync routes are limited by threads and the async routes by connections
+os.environ.setdefault("DB_POOL_SIZE", "100")
+os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+
+import anyio.to_thread  # noqa: E402
+import httpx  # noqa: E402
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from app.database import Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import (  # noqa: E402
+    Project, SurveyorALS, TitleDocument, Encumbrance, DocumentTask,
+    EncumbranceAction, EncumbranceStatus, DocumentTaskStatus, DocumentCategory,
+)
+from app.schemas.project import ProjectResponse, ProjectDetailResponse  # noqa: E402
+from app.services.query_profiles import PROJECT_RESPONSE, PROJECT_DETAIL_RESPONSE  # noqa: E402
+
+
+def seed() -> int:
+    """Create one project with a few titles, encumbrances and tasks."""
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        action = EncumbranceAction(code="CONSENT", label="Consent")
+        enc_status = EncumbranceStatus(code="PREPARED", label="Prepared")
+        task_status = DocumentTaskStatus(code="PREPARED", label="Prepared")
+        category = DocumentCategory(code="URW", name="Utility Right of Way")
+        project = Project(proj_num="9999.0002.00", name="Benchmark project", surveyor=SurveyorALS(name="Surveyor"))
+        for t in range(5):
+            title_doc = TitleDocument(file_path=f"title_{t}.pdf")
+            for e in range(20):
+                title_doc.encumbrances.append(
+                    Encumbrance(item_no=e + 1, document_number=f"{t:03d} {e:03d} 000", action=action, status=enc_status)
+                )
+            project.title_documents.append(title_doc)
+        for d in range(20):
+            project.document_tasks.append(
+                DocumentTask(item_no=d + 1, doc_desc=f"Task {d}", category=category, document_status=task_status)
+            )
+        db.add(project)
+        db.commit()
+        return project.id
+
+
+def add_latency(seconds: float) -> None:
+    """Delay every SQLite statement in the thread that executes it, like a server round trip."""
+    def delay(statement):
+        time.sleep(seconds)
+
+    def on_connect(dbapi_connection, connection_record):
+        # aiosqlite runs the sqlite3 connection in its own thread; the sync
+        # driver runs it in the request's threadpool thread
+        raw = getattr(getattr(dbapi_connection, "_connection", None), "_conn", dbapi_connection)
+        raw.set_trace_callback(delay)
+
+    for sync_engine in (engine, async_engine.sync_engine):
+        event.listen(sync_engine, "connect", on_connect)
+
+
+def first_project_id() -> int:
+    with SessionLocal() as db:
+        return db.query(Project.id).order_by(Project.id).limit(1).scalar()
+
+
+# The project routes as they were before the async port. The session is
+# opened inside the handler rather than through the get_db dependency: with
+# more concurrent requests than pooled connections, the dependency version
+# deadlocks, because closing a session needs a threadpool thread while every
+# thread is waiting for a connection.
+@app.get("/legacy/projects", response_model=List[ProjectResponse], include_in_schema=False)
+def legacy_list_projects(skip: int = 0, limit: int = 10):
+    with SessionLocal() as db:
+        projects = (
+            db.query(Project)
+            .options(*PROJECT_RESPONSE)
+            .order_by(Project.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return [ProjectResponse.model_validate(project) for project in projects]
+
+
+@app.get("/legacy/projects/{project_id}", response_model=ProjectDetailResponse, include_in_schema=False)
+def legacy_get_project(project_id: int):
+    with SessionLocal() as db:
+        project = (
+            db.query(Project)
+            .options(*PROJECT_DETAIL_RESPONSE)
+            .filter(Project.id == project_id)
+            .first()
+        )
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return ProjectDetailResponse.model_validate(project)
+
+
+async def load(client: httpx.AsyncClient, path: str) -> tuple:
+    """Run CLIENTS concurrent clients, each sending REQUESTS_PER_CLIENT requests in turn."""
+    latencies = []
+
+    async def client_loop():
+        for _ in range(REQUESTS_PER_CLIENT):
+            start = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(CLIENTS)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[int(len(latencies) * 0.95)]
+    return len(latencies) / elapsed, p50, p95
+
+
+async def run() -> None:
+    if _tmp is not None:
+        project_id = seed()
+        engine.dispose()  # Every connection used below gets the delay
+        add_latency(LATENCY_MS / 1000)
+        backend = f"sqlite + {LATENCY_MS:g} ms per statement"
+    else:
+        project_id = first_project_id()
+        backend = engine.url.get_backend_name()
+    threads = anyio.to_thread.current_default_thread_limiter().total_tokens
+    print(
+        f"{CLIENTS} clients x {REQUESTS_PER_CLIENT} requests, threadpool of {threads}, "
+        f"pool of {engine.pool.size()}, {backend}"
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, path in (
+            ("list   sync", "/legacy/projects"),
+            ("list   async", "/api/projects"),
+            ("detail sync", f"/legacy/projects/{project_id}"),
+            ("detail async", f"/api/projects/{project_id}"),
+        ):
+            await client.get(path)  # warm up
+            throughput, p50, p95 = await load(client, path)
+            print(f"  {name:12} {throughput:8.0f} req/s   p50 {p50 * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms")
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
+    if _tmp is not None:
+        _tmp.cleanup()
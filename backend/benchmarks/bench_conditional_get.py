@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Benchmark GET /api/projects/{id} with compression and conditional GETs.
+Seeds a temporary SQLite database with one large project and compares the
+bytes sent with and without gzip, and the latency of a full response with
+a 304 Not Modified answered from the project's data version.
+Run from the backend directory:
+    python benchmarks/bench_conditional_get.py [encumbrances] [repeats]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+ENCUMBRANCES = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+REPEATS = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+ENCUMBRANCES_PER_TITLE = 50
+TASKS = 200
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from app.database import Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import (  # noqa: E402
+    Project, TitleDocument, Encumbrance, DocumentTask,
+    EncumbranceAction, EncumbranceStatus, DocumentTaskStatus, DocumentCategory,
+)
+
+
+def seed() -> None:
+    """One project with ENCUMBRANCES encumbrances over several titles, and TASKS tasks."""
+    Base.metadata.create_all(bind=engine)
+    titles = max(1, ENCUMBRANCES // ENCUMBRANCES_PER_TITLE)
+    with SessionLocal() as db:
+        db.add_all([
+            EncumbranceAction(code="CONSENT", label="Consent"),
+            EncumbranceStatus(code="PREPARED", label="Prepared"),
+            DocumentTaskStatus(code="PREPARED", label="Prepared"),
+            DocumentCategory(code="URW", name="Utility Right of Way"),
+            Project(proj_num="1000.0001.00", name="Large Project", municipality="Calgary"),
+        ])
+        db.flush()
+        db.execute(insert(TitleDocument), [
+            {"project_id": 1, "file_path": f"uploads/title_{t}.pdf"} for t in range(titles)
+        ])
+        db.execute(insert(Encumbrance), [
+            {
+                "title_document_id": i // ENCUMBRANCES_PER_TITLE + 1,
+                "item_no": i % ENCUMBRANCES_PER_TITLE + 1,
+                "document_number": f"{i:09d}",
+                "description": "CAVEAT RE : UTILITY RIGHT OF WAY",
+                "signatories": "ATCO GAS AND PIPELINES LTD.",
+                "circulation_notes": "Sent for signature",
+                "action_id": 1,
+                "status_id": 1,
+            }
+            for i in range(titles * ENCUMBRANCES_PER_TITLE)
+        ])
+        db.execute(insert(DocumentTask), [
+            {"project_id": 1, "item_no": d + 1, "doc_desc": f"Task {d}", "category_id": 1, "document_status_id": 1}
+            for d in range(TASKS)
+        ])
+        db.commit()
+
+
+async def timed_requests(client: httpx.AsyncClient, headers: Dict[str, str]) -> tuple:
+    """Median latency of REPEATS detail requests, and the last response's bytes on the wire."""
+    latencies = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        async with client.stream("GET", "/api/projects/1", headers=headers) as response:
+            sent = sum([len(chunk) async for chunk in response.aiter_raw()])
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies), sent, response.status_code
+
+
+async def run() -> None:
+    seed()
+    print(f"Project with {ENCUMBRANCES} encumbrances and {TASKS} tasks, {REPEATS} requests per measurement")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        etag = (await client.get("/api/projects/1")).headers["etag"]  # warm up
+        for label, headers in (
+            ("identity", {"Accept-Encoding": "identity"}),
+            ("gzip", {"Accept-Encoding": "gzip"}),
+            ("gzip, If-None-Match", {"Accept-Encoding": "gzip", "If-None-Match": etag}),
+        ):
+            p50, sent, status_code = await timed_requests(client, headers)
+            print(f"  {label:<20} {status_code} {sent / 1024:8.1f} KiB {p50 * 1000:7.1f} ms p50")
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
+    _tmp.cleanup()
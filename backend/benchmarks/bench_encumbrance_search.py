@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Benchmark GET /api/titles/encumbrances/search on a large encumbrance table.
+Seeds a temporary SQLite database with encumbrances spread over many
+projects, builds the search index, and times typical queries through the
+endpoint next to the equivalent LIKE scan.
+Run from the backend directory:
+    python benchmarks/bench_encumbrance_search.py [encumbrances] [repeats]
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+ENCUMBRANCES = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+REPEATS = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+ENCUMBRANCES_PER_TITLE = 20
+TITLES_PER_PROJECT = 5
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import httpx  # noqa: E402
+from sqlalchemy import and_, insert, select  # noqa: E402
+from app.database import Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Project, TitleDocument, Encumbrance  # noqa: E402
+from app.services.encumbrance_search import EncumbranceSearchService  # noqa: E402
+
+COMPANIES = [
+    "ATCO GAS AND PIPELINES LTD.", "ATCO ELECTRIC LTD.", "FORTISALBERTA INC.", "TELUS COMMUNICATIONS INC.",
+    "SHAW CABLESYSTEMS LIMITED", "ENMAX POWER CORPORATION", "THE CITY OF CALGARY", "ROCKY VIEW COUNTY",
+    "ALBERTA TREASURY BRANCHES", "ROYAL BANK OF CANADA", "NOVA GAS TRANSMISSION LTD.", "EPCOR WATER SERVICES INC.",
+]
+DESCRIPTIONS = [
+    "UTILITY RIGHT OF WAY", "CAVEAT RE : UTILITY RIGHT OF WAY", "MORTGAGE", "RESTRICTIVE COVENANT",
+    "CAVEAT RE : DEVELOPMENT AGREEMENT", "EASEMENT", "DISCHARGE", "CAVEAT RE : ENCROACHMENT AGREEMENT",
+]
+
+# (label, query, project_id)
+QUERIES = [
+    ("common company", "atco", None),
+    ("company name", "atco gas pipelines", None),
+    ("rare company", "epcor water", None),
+    ("description", "restrictive covenant", None),
+    ("instrument number", None, None),  # filled in from a seeded row
+    ("company in one project", "fortisalberta", 17),
+    ("no match", "no such company", None),
+]
+
+
+def seed() -> str:
+    """Create the encumbrances, index them, and return one instrument number."""
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(11)
+    titles = ENCUMBRANCES // ENCUMBRANCES_PER_TITLE
+    with SessionLocal() as db:
+        db.execute(insert(Project), [
+            {"proj_num": f"{p:04d}.0001.00", "name": f"Project {p}"}
+            for p in range(1, titles // TITLES_PER_PROJECT + 2)
+        ])
+        db.execute(insert(TitleDocument), [
+            {"project_id": t // TITLES_PER_PROJECT + 1, "file_path": f"title_{t}.pdf"}
+            for t in range(titles)
+        ])
+        db.execute(insert(Encumbrance), [
+            {
+                "title_document_id": i // ENCUMBRANCES_PER_TITLE + 1,
+                "item_no": i % ENCUMBRANCES_PER_TITLE + 1,
+                "document_number": f"{rng.randint(0, 999):03d} {rng.randint(0, 999):03d} {rng.randint(0, 999):03d}",
+                "description": rng.choice(DESCRIPTIONS),
+                "signatories": rng.choice(COMPANIES),
+            }
+            for i in range(titles * ENCUMBRANCES_PER_TITLE)
+        ])
+        db.commit()
+        sample = db.scalar(select(Encumbrance.document_number).where(Encumbrance.id == titles // 2))
+
+        start = time.perf_counter()
+        indexed = EncumbranceSearchService.rebuild(db)
+        print(f"Indexed {indexed} encumbrances in {time.perf_counter() - start:.1f}s")
+    return sample
+
+
+def like_scan(query: str, project_id) -> list:
+    """The same search as a LIKE scan over the encumbrance table."""
+    words = query.upper().split()
+    text = [
+        (Encumbrance.document_number + " " + Encumbrance.description + " " + Encumbrance.signatories).like(f"%{word}%")
+        for word in words
+    ]
+    stmt = (
+        select(Encumbrance.id)
+        .join(TitleDocument, Encumbrance.title_document_id == TitleDocument.id)
+        .where(and_(*text))
+    )
+    if project_id is not None:
+        stmt = stmt.where(TitleDocument.project_id == project_id)
+    with SessionLocal() as db:
+        return db.execute(stmt.limit(50)).all()
+
+
+async def run() -> None:
+    sample_number = seed()
+    print(f"{REPEATS} requests per query")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.get("/api/titles/encumbrances/search", params={"q": "warm up"})
+        for label, query, project_id in QUERIES:
+            query = query or sample_number
+            params = {"q": query}
+            if project_id is not None:
+                params["project_id"] = project_id
+
+            latencies = []
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                response = await client.get("/api/titles/encumbrances/search", params=params)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+            hits = len(response.json())
+
+            start = time.perf_counter()
+            like_scan(query, project_id)
+            like_ms = (time.perf_counter() - start) * 1000
+
+            latencies.sort()
+            print(
+                f"  {label:24} {query!r:24} {hits:3d} hits   endpoint {statistics.median(latencies) * 1000:7.1f} ms p50"
+                f" {latencies[int(len(latencies) * 0.95)] * 1000:7.1f} ms p95   LIKE scan {like_ms:7.1f} ms"
+            )
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
+    _tmp.cleanup()
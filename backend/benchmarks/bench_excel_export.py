@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Benchmark the project Excel export against a project with thousands of encumbrances.
+Compares the previous lazy relationship walk with ProjectExportService.
+Run from the backend directory: python benchmarks/bench_excel_export.py [encumbrances]
+"""
+import io
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models import (  # noqa: E402
+    Project, TitleDocument, Encumbrance, DocumentTask,
+    EncumbranceAction, EncumbranceStatus, DocumentTaskStatus, DocumentCategory,
+)
+from app.services.excel_generator import ExcelGeneratorService  # noqa: E402
+from app.services.project_export import ProjectExportService  # noqa: E402
+
+ENCUMBRANCES_PER_TITLE = 50
+
+
+def seed(db, encumbrances: int) -> int:
+    """Create one project with the requested number of encumbrances and a few tasks."""
+    actions = [EncumbranceAction(code=c, label=c) for c in ("CONSENT", "FULL_DISCHARGE")]
+    statuses = [EncumbranceStatus(code=c, label=c) for c in ("PREPARED", "COMPLETE")]
+    categories = [DocumentCategory(code=c, name=c) for c in ("SUBDIVISION", "URW", "NEW_AGREEMENT")]
+    task_status = DocumentTaskStatus(code="PREPARED", label="Prepared")
+    project = Project(proj_num="9999.0001.00", name="Benchmark project")
+    db.add_all(actions + statuses + categories + [task_status, project])
+    db.flush()
+
+    titles = [
+        TitleDocument(project_id=project.id, file_path=f"title_{t}.pdf")
+        for t in range((encumbrances + ENCUMBRANCES_PER_TITLE - 1) // ENCUMBRANCES_PER_TITLE)
+    ]
+    db.add_all(titles)
+    db.flush()
+
+    db.bulk_insert_mappings(Encumbrance, [
+        {
+            "title_document_id": titles[i // ENCUMBRANCES_PER_TITLE].id,
+            "item_no": i % ENCUMBRANCES_PER_TITLE + 1,
+            "document_number": f"{i:09d}",
+            "description": "UTILITY RIGHT OF WAY",
+            "signatories": "ATCO GAS AND PIPELINES LTD.\n",
+            "action_id": actions[i % 2].id,
+            "status_id": statuses[i % 2].id,
+        }
+        for i in range(encumbrances)
+    ])
+    db.bulk_insert_mappings(DocumentTask, [
+        {
+            "project_id": project.id,
+            "category_id": categories[i % 3].id,
+            "item_no": i + 1,
+            "doc_desc": f"Task {i}",
+            "document_status_id": task_status.id,
+        }
+        for i in range(60)
+    ])
+    db.commit()
+    return project.id
+
+
+def legacy_export(db, project_id: int, buffer) -> None:
+    """The export as previously written in the route: lazy loads per row, then dicts."""
+    project = db.query(Project).filter(Project.id == project_id).first()
+    encumbrances = {}
+    for title_doc in project.title_documents:
+        encumbrances[f"Title Document {title_doc.id}"] = [
+            {
+                "Document #": e.document_number,
+                "Description": e.description,
+                "Signatories": e.signatories,
+                "Circulation Notes": e.circulation_notes,
+                "Action": e.action.code if e.action else "",
+                "Status": e.status.code if e.status else "",
+            }
+            for e in title_doc.encumbrances
+        ]
+    plans = {}
+    exist_enc = []
+    for d in project.document_tasks:
+        row = {
+            "Document/Desc": d.doc_desc,
+            "Copies/Dept": d.copies_dept,
+            "Signatories": d.signatories,
+            "Condition of Approval": d.condition_of_approval,
+            "Circulation Notes": d.circulation_notes,
+            "Status": d.document_status.code if d.document_status else "",
+        }
+        if d.category.id == 3:
+            exist_enc.append(row)
+        else:
+            plans.setdefault(d.category.code if d.category else "UNCATEGORIZED", []).append(row)
+    ExcelGeneratorService.export_as_excel(
+        buffer, encumbrances=encumbrances, plans=plans, new_agreements=exist_enc, proj_num=project.proj_num
+    )
+
+
+def run(encumbrances: int) -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        project_id = seed(db, encumbrances)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    print(f"Project with {encumbrances} encumbrances:")
+    for name, export in (
+        ("lazy walk", legacy_export),
+        ("set-based", ProjectExportService.export_project),
+    ):
+        with Session() as db:
+            statements.clear()
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            export(db, project_id, buffer)
+            elapsed = time.perf_counter() - start
+        print(f"  {name:10} {elapsed:6.2f}s  {len(statements):5d} statements  {len(buffer.getvalue()) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
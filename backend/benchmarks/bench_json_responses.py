@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+Benchmark GET /api/projects/{id} with the fast JSON path vs FastAPI's default.
+Seeds a temporary SQLite database with one large project and times the
+detail endpoint served by the app (FastJSONRoute, TypeAdapter.dump_json)
+next to the same endpoint function mounted on a plain APIRoute with
+JSONResponse. The encoding step alone is also timed on rows loaded once.
+Run from the backend directory:
+    python benchmarks/bench_json_responses.py [encumbrances] [repeats]
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+ENCUMBRANCES = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+REPEATS = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+ENCUMBRANCES_PER_TITLE = 50
+TASKS = 200
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from app.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import (  # noqa: E402
+    Project, TitleDocument, Encumbrance, DocumentTask,
+    EncumbranceAction, EncumbranceStatus, DocumentTaskStatus, DocumentCategory,
+)
+from app.routes.projects import get_project  # noqa: E402
+from app.schemas.project import ProjectDetailResponse  # noqa: E402
+from app.services.query_profiles import PROJECT_DETAIL_RESPONSE  # noqa: E402
+
+# The same endpoint on FastAPI's default route class and response
+baseline = FastAPI()
+baseline.add_api_route(
+    "/api/projects/{project_id}", get_project, response_model=ProjectDetailResponse, response_class=JSONResponse
+)
+
+
+def seed() -> None:
+    """One project with ENCUMBRANCES encumbrances over several titles, and TASKS tasks."""
+    Base.metadata.create_all(bind=engine)
+    titles = max(1, ENCUMBRANCES // ENCUMBRANCES_PER_TITLE)
+    with SessionLocal() as db:
+        db.add_all([
+            EncumbranceAction(code="CONSENT", label="Consent"),
+            EncumbranceStatus(code="PREPARED", label="Prepared"),
+            DocumentTaskStatus(code="PREPARED", label="Prepared"),
+            DocumentCategory(code="URW", name="Utility Right of Way"),
+            Project(proj_num="1000.0001.00", name="Large Project", municipality="Calgary"),
+        ])
+        db.flush()
+        db.execute(insert(TitleDocument), [
+            {"project_id": 1, "file_path": f"uploads/title_{t}.pdf"} for t in range(titles)
+        ])
+        db.execute(insert(Encumbrance), [
+            {
+                "title_document_id": i // ENCUMBRANCES_PER_TITLE + 1,
+                "item_no": i % ENCUMBRANCES_PER_TITLE + 1,
+                "document_number": f"{i:09d}",
+                "description": "CAVEAT RE : UTILITY RIGHT OF WAY",
+                "signatories": "ATCO GAS AND PIPELINES LTD.",
+                "circulation_notes": "Sent for signature",
+                "action_id": 1,
+                "status_id": 1,
+            }
+            for i in range(titles * ENCUMBRANCES_PER_TITLE)
+        ])
+        db.execute(insert(DocumentTask), [
+            {"project_id": 1, "item_no": d + 1, "doc_desc": f"Task {d}", "category_id": 1, "document_status_id": 1}
+            for d in range(TASKS)
+        ])
+        db.commit()
+
+
+async def timed_requests(target: FastAPI) -> tuple:
+    """Median and p95 latency of REPEATS detail requests, and the last body."""
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.get("/api/projects/1")  # warm up
+        latencies = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            response = await client.get("/api/projects/1")
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95)], response.content
+
+
+def timed_encoding(project: Project) -> tuple:
+    """Median time to encode loaded rows: FastAPI's steps vs one dump_json."""
+    adapter = TypeAdapter(ProjectDetailResponse)
+
+    def default() -> bytes:
+        value = adapter.validate_python(project, from_attributes=True)
+        return JSONResponse(adapter.dump_python(value, mode="json")).body
+
+    def fast() -> bytes:
+        return adapter.dump_json(adapter.validate_python(project, from_attributes=True))
+
+    results: List[float] = []
+    for encode in (default, fast):
+        durations = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            encode()
+            durations.append(time.perf_counter() - start)
+        results.append(statistics.median(durations))
+    return tuple(results)
+
+
+async def run() -> None:
+    seed()
+    print(f"Project with {ENCUMBRANCES} encumbrances and {TASKS} tasks, {REPEATS} requests per measurement")
+
+    default_p50, default_p95, default_body = await timed_requests(baseline)
+    fast_p50, fast_p95, fast_body = await timed_requests(app)
+    assert json.loads(default_body) == json.loads(fast_body), "fast and default responses differ"
+    print(f"  response body        {len(fast_body) / 1024:7.0f} KiB")
+    print(f"  default JSONResponse {default_p50 * 1000:7.1f} ms p50 {default_p95 * 1000:7.1f} ms p95")
+    print(f"  FastJSONResponse     {fast_p50 * 1000:7.1f} ms p50 {fast_p95 * 1000:7.1f} ms p95")
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Project).options(*PROJECT_DETAIL_RESPONSE).where(Project.id == 1))
+        project = result.scalars().first()
+        default_encode, fast_encode = timed_encoding(project)
+    print(f"  encoding only: default {default_encode * 1000:.1f} ms, dump_json {fast_encode * 1000:.1f} ms"
+          f" ({default_encode / fast_encode:.1f}x)")
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
+    _tmp.cleanup()
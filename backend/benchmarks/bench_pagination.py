@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Benchmark deep pages of GET /api/projects: offset pagination vs cursors.
+Seeds a temporary SQLite database with many projects and times the same
+page fetched with skip and with the cursor of the page before it. Pages are
+given as a comma-separated list (page 1 needs no cursor and is not timed).
+Run from the backend directory:
+    python benchmarks/bench_pagination.py [projects] [pages] [limit] [repeats]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+PROJECTS = int(sys.argv[1]) if len(sys.argv) > 1 else 60000
+PAGES = [int(p) for p in sys.argv[2].split(",")] if len(sys.argv) > 2 else [2, 100, 1000]
+LIMIT = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+REPEATS = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import httpx  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from app.database import Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Project, SurveyorALS  # noqa: E402
+from app.services.pagination import encode_cursor  # noqa: E402
+
+
+def seed() -> None:
+    """Create PROJECTS projects sharing a handful of surveyors."""
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        surveyors = [SurveyorALS(name=f"Surveyor {s}") for s in range(10)]
+        db.add_all(surveyors)
+        db.flush()
+        db.bulk_insert_mappings(Project, [
+            {
+                # Out of id order, so sorting by proj_num walks a different index
+                "proj_num": f"{(i * 7919) % PROJECTS:05d}.{i % 100:04d}.00",
+                "name": f"Project {i}",
+                "surveyor_id": surveyors[i % 10].id,
+                "municipality": "Calgary",
+            }
+            for i in range(PROJECTS)
+        ])
+        db.commit()
+
+
+def cursor_before_page(sort: str, column, page: int) -> str:
+    """Cursor of the last row of the previous page, as a client would hold it."""
+    with SessionLocal() as db:
+        value, row_id = db.execute(
+            select(column, Project.id)
+            .order_by(column, Project.id)
+            .offset((page - 1) * LIMIT - 1)
+            .limit(1)
+        ).one()
+    return encode_cursor(sort, value, row_id)
+
+
+async def timed(client: httpx.AsyncClient, params: dict) -> tuple:
+    """Median and p95 latency of REPEATS requests for one page."""
+    ids = None
+    latencies = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        response = await client.get("/api/projects", params=params)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+        ids = [project["id"] for project in response.json()]
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95)], ids
+
+
+async def run() -> None:
+    seed()
+    print(f"{PROJECTS} projects, {LIMIT} per page, {REPEATS} requests per measurement")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.get("/api/projects")  # warm up
+        for sort, column in (("id", Project.id), ("proj_num", Project.proj_num)):
+            print(f"  sort={sort}")
+            for page in PAGES:
+                offset_params = {"sort": sort, "limit": LIMIT, "skip": (page - 1) * LIMIT}
+                cursor_params = {"sort": sort, "limit": LIMIT, "cursor": cursor_before_page(sort, column, page)}
+                offset_p50, offset_p95, offset_ids = await timed(client, offset_params)
+                cursor_p50, cursor_p95, cursor_ids = await timed(client, cursor_params)
+                assert offset_ids == cursor_ids, f"offset and cursor differ on page {page}"
+                print(
+                    f"    page {page:5d}   offset {offset_p50 * 1000:7.2f} ms p50 {offset_p95 * 1000:7.2f} ms p95"
+                    f"   cursor {cursor_p50 * 1000:7.2f} ms p50 {cursor_p95 * 1000:7.2f} ms p95"
+                )
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    if min(PAGES) < 2 or max(PAGES) * LIMIT > PROJECTS:
+        sys.exit(f"pages must be between 2 and {PROJECTS // LIMIT}")
+    asyncio.run(run())
+    _tmp.cleanup()
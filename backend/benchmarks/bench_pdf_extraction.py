@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Benchmark serial vs process-pool page extraction on a synthetic title certificate.
+Run from the backend directory: python benchmarks/bench_pdf_extraction.py [pages] [workers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.synthetic_pdf import write_title_pdf  # noqa: E402
+from app.services.pdf_processor import PDFProcessorService  # noqa: E402
+
+
+def run(pages: int, workers: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, "synthetic_title.pdf")
+        write_title_pdf(file_path, pages)
+        print(f"Synthetic title: {pages} pages, {os.path.getsize(file_path) / 1024:.0f} KB")
+
+        start = time.perf_counter()
+        serial = PDFProcessorService.process_title_file(file_path, workers=1)
+        serial_time = time.perf_counter() - start
+        print(f"  serial:             {serial_time:.2f}s")
+
+        # Warm the pool so worker start-up isn't counted against each request
+        PDFProcessorService.process_title_file(file_path, workers=workers, threshold=0)
+
+        start = time.perf_counter()
+        parallel = PDFProcessorService.process_title_file(file_path, workers=workers, threshold=0)
+        parallel_time = time.perf_counter() - start
+        print(f"  {workers} workers:          {parallel_time:.2f}s ({serial_time / parallel_time:.1f}x)")
+
+        assert serial == parallel, "Parallel extraction produced different results"
+        print(f"  instruments found:  {len(serial['inst_on_title'])}")
+
+    PDFProcessorService.shutdown()
+
+
+if __name__ == "__main__":
+    run(
+        pages=int(sys.argv[1]) if len(sys.argv) > 1 else 300,
+        workers=int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1),
+    )
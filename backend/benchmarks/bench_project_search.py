@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Benchmark type-ahead queries against GET /api/projects/search.
+Seeds a temporary SQLite database with many projects and times a set of
+partial queries through the search index, next to the equivalent LIKE
+query run straight against the database.
+Run from the backend directory:
+    python benchmarks/bench_project_search.py [projects] [repeats]
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+PROJECTS = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+REPEATS = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import httpx  # noqa: E402
+from sqlalchemy import and_, or_, select  # noqa: E402
+from app.database import Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Project, SurveyorALS  # noqa: E402
+
+NAMES = ["Smith", "Jones", "Heritage", "Ridge", "Valley", "Creek", "Meadows", "Park", "Crossing", "Landing"]
+KINDS = ["Subdivision", "URW", "Road Plan", "Condo", "Lot Split"]
+MUNICIPALITIES = ["Calgary", "Airdrie", "Cochrane", "Okotoks", "Chestermere", "Rocky View County"]
+
+# (query, surveyor_id)
+QUERIES = [
+    ("1", None),
+    ("1234", None),
+    ("1234.00", None),
+    ("sm", None),
+    ("herit", None),
+    ("ridge creek", None),
+    ("valley okotoks", None),
+    ("crossing", 3),
+    ("no such project", None),
+]
+
+
+def seed() -> None:
+    """Create PROJECTS projects with generated names spread over a few municipalities."""
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(7)
+    with SessionLocal() as db:
+        surveyors = [SurveyorALS(name=f"Surveyor {s}") for s in range(10)]
+        db.add_all(surveyors)
+        db.flush()
+        db.bulk_insert_mappings(Project, [
+            {
+                "proj_num": f"{rng.randint(1000, 9999)}.{i:05d}.00",
+                "name": f"{rng.choice(NAMES)} {rng.choice(NAMES)} {rng.choice(KINDS)}",
+                "municipality": rng.choice(MUNICIPALITIES),
+                "surveyor_id": surveyors[i % 10].id,
+            }
+            for i in range(PROJECTS)
+        ])
+        db.commit()
+
+
+def like_query(query: str, surveyor_id, limit: int = 20) -> list:
+    """The same search as a LIKE query: a scan for anything but the number prefix."""
+    words = query.lower().split()
+    text = [
+        or_(Project.name.ilike(f"%{word}%"), Project.municipality.ilike(f"%{word}%"))
+        for word in words
+    ]
+    stmt = select(Project.id).where(or_(Project.proj_num.like(f"{query}%"), and_(*text)))
+    if surveyor_id is not None:
+        stmt = stmt.where(Project.surveyor_id == surveyor_id)
+    with SessionLocal() as db:
+        return db.execute(stmt.order_by(Project.proj_num).limit(limit)).all()
+
+
+async def run() -> None:
+    seed()
+    print(f"{PROJECTS} projects, {REPEATS} requests per query")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        await client.get("/api/projects/search", params={"q": "warm up"})  # builds the index
+        print(f"  index built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        for query, surveyor_id in QUERIES:
+            params = {"q": query}
+            if surveyor_id is not None:
+                params["surveyor_id"] = surveyor_id
+
+            latencies = []
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                response = await client.get("/api/projects/search", params=params)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+            matches = len(response.json())
+
+            like_latencies = []
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                like_query(query, surveyor_id)
+                like_latencies.append(time.perf_counter() - start)
+
+            latencies.sort()
+            label = f"{query!r}" + (f" surveyor {surveyor_id}" if surveyor_id is not None else "")
+            print(
+                f"  {label:28} {matches:3d} hits   endpoint {statistics.median(latencies) * 1000:6.2f} ms p50"
+                f" {latencies[int(len(latencies) * 0.95)] * 1000:6.2f} ms p95"
+                f"   LIKE query {statistics.median(like_latencies) * 1000:6.2f} ms p50"
+            )
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
+    _tmp.cleanup()
@@ -0,0 +1,86 @@
+"""
+Minimal PDF writer for synthetic title certificates used by the benchmarks.
+Writes plain Courier text pages without any third-party dependency.
+"""
+from typing import List
+
+LINES_PER_PAGE = 60
+
+
+def title_lines(pages: int) -> List[str]:
+    """Build title certificate text long enough to fill the requested page count."""
+    lines = [
+        "LINC SHORT LEGAL TITLE NUMBER",
+        "0012 345 678 0123456;1;2 192 123 456",
+        "LEGAL DESCRIPTION",
+        "PLAN 0123456",
+        "BLOCK 1",
+        "LOT 2",
+        "EXCEPTING THEREOUT ALL MINES AND MINERALS",
+        "ESTATE: FEE SIMPLE",
+        "ATS REFERENCE: 4;24;53;1;NW",
+        "REGISTERED OWNER(S)",
+        "192 123 456 15/06/2019 TRANSFER OF LAND $1 $1",
+        "ENCUMBRANCES, LIENS & INTERESTS",
+    ]
+    inst_count = 0
+    while len(lines) < pages * LINES_PER_PAGE - 1:
+        inst_count += 1
+        lines += [
+            "%03d %03d %03d 12/03/2001 UTILITY RIGHT OF WAY" % (100 + inst_count % 900, inst_count % 1000, 7),
+            "GRANTEE - ATCO GAS AND PIPELINES LTD.",
+            "10035-105 STREET",
+            "EDMONTON",
+            "ALBERTA T5J2V6",
+            "AS TO PORTION OR PLAN:0012345",
+        ]
+    lines.append("TOTAL INSTRUMENTS: %03d" % (inst_count % 1000))
+    return lines
+
+
+def write_title_pdf(file_path: str, pages: int) -> None:
+    """Write a synthetic title certificate PDF with the given page count."""
+    lines = title_lines(pages)
+    page_lines = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+
+    objects: List[bytes] = [
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>",
+        b"",  # Page tree, filled in once the page object ids are known
+    ]
+    kids = []
+    for text in page_lines:
+        content = [b"BT /F1 9 Tf 12 TL 36 800 Td"]
+        for line in text:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            content.append(b"(" + escaped.encode("latin-1") + b") Tj T*")
+        content.append(b"ET")
+        stream = b"\n".join(content)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 1 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        len(kids),
+    )
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for obj_id, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % obj_id + obj + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        len(objects),
+        xref_offset,
+    )
+
+    with open(file_path, "wb") as f:
+        f.write(bytes(out))
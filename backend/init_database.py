@@ -1,15 +1,17 @@
 """
 Initialize the database by running the schema SQL file.
-Run this once to create all tables and seed data.
+Run this once to create all tables and seed data, then apply migrations:
+    python init_database.py migrations/001_add_indexes.sql
 """
+import sys
 from sqlalchemy import text
 from app.database import engine
 
-def init_database():
-    """Execute the database_schema.sql file to create tables."""
+def init_database(sql_path: str = "database_schema.sql"):
+    """Execute a SQL file (database_schema.sql by default) statement by statement."""
     
     # Read the SQL file
-    with open("database_schema.sql", "r") as f:
+    with open(sql_path, "r") as f:
         sql_content = f.read()
     
     # Split into individual statements (SQL Server uses GO or semicolons)
@@ -47,7 +49,8 @@ def init_database():
         print("\n✓ Database initialization complete!")
 
 if __name__ == "__main__":
-    print("Initializing database with schema from database_schema.sql...")
+    sql_path = sys.argv[1] if len(sys.argv) > 1 else "database_schema.sql"
+    print(f"Initializing database with schema from {sql_path}...")
     print(f"Connecting to: {engine.url}\n")
-    init_database()
+    init_database(sql_path)
 
@@ -0,0 +1,80 @@
+------------------------------------------------------------
+-- 001. Foreign key and filter column indexes
+-- Brings a database whose tables match the models (snake_case columns,
+-- e.g. one built with Base.metadata.create_all) up to the indexes declared
+-- on the models, and creates the tables added since then. Databases created
+-- from database_schema.sql use PascalCase columns and are not covered.
+-- Every statement checks first, so the script can be re-run safely:
+--     python init_database.py migrations/001_add_indexes.sql
+-- Afterwards, python audit_indexes.py should report nothing missing.
+------------------------------------------------------------
+
+------------------------------------------------------------
+-- 1. Foreign keys (every list and detail query filters on these)
+------------------------------------------------------------
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_TitleDocument_project_id' AND object_id = OBJECT_ID('dbo.TitleDocument')) CREATE INDEX ix_TitleDocument_project_id ON dbo.TitleDocument (project_id);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_LegalDocument_project_id' AND object_id = OBJECT_ID('dbo.LegalDocument')) CREATE INDEX ix_LegalDocument_project_id ON dbo.LegalDocument (project_id);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_EncumbranceRow_title_document_id' AND object_id = OBJECT_ID('dbo.EncumbranceRow')) CREATE INDEX ix_EncumbranceRow_title_document_id ON dbo.EncumbranceRow (title_document_id);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_EncumbranceRow_action_id' AND object_id = OBJECT_ID('dbo.EncumbranceRow')) CREATE INDEX ix_EncumbranceRow_action_id ON dbo.EncumbranceRow (action_id);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_EncumbranceRow_status_id' AND object_id = OBJECT_ID('dbo.EncumbranceRow')) CREATE INDEX ix_EncumbranceRow_status_id ON dbo.EncumbranceRow (status_id);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_EncumbranceRow_legal_document_id' AND object_id = OBJECT_ID('dbo.EncumbranceRow')) CREATE INDEX ix_EncumbranceRow_legal_document_id ON dbo.EncumbranceRow (legal_document_id);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_DocumentTaskRow_project_id' AND object_id = OBJECT_ID('dbo.DocumentTaskRow')) CREATE INDEX ix_DocumentTaskRow_project_id ON dbo.DocumentTaskRow (project_id);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_DocumentTaskRow_category_id' AND object_id = OBJECT_ID('dbo.DocumentTaskRow')) CREATE INDEX ix_DocumentTaskRow_category_id ON dbo.DocumentTaskRow (category_id);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_DocumentTaskRow_document_status_id' AND object_id = OBJECT_ID('dbo.DocumentTaskRow')) CREATE INDEX ix_DocumentTaskRow_document_status_id ON dbo.DocumentTaskRow (document_status_id);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_DocumentTaskRow_legal_document_template_id' AND object_id = OBJECT_ID('dbo.DocumentTaskRow')) CREATE INDEX ix_DocumentTaskRow_legal_document_template_id ON dbo.DocumentTaskRow (legal_document_template_id);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_DocumentTaskRow_legal_document_id' AND object_id = OBJECT_ID('dbo.DocumentTaskRow')) CREATE INDEX ix_DocumentTaskRow_legal_document_id ON dbo.DocumentTaskRow (legal_document_id);
+
+------------------------------------------------------------
+-- 2. Project search and list sorts
+------------------------------------------------------------
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_Project_surveyor_id_proj_num' AND object_id = OBJECT_ID('dbo.Project')) CREATE INDEX ix_Project_surveyor_id_proj_num ON dbo.Project (surveyor_id, proj_num);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_Project_name' AND object_id = OBJECT_ID('dbo.Project')) CREATE INDEX ix_Project_name ON dbo.Project (name);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_Project_municipality' AND object_id = OBJECT_ID('dbo.Project')) CREATE INDEX ix_Project_municipality ON dbo.Project (municipality);
+
+------------------------------------------------------------
+-- 3. Title ingestion jobs (polled by state on startup)
+------------------------------------------------------------
+
+IF OBJECT_ID('dbo.TitleIngestJob', 'U') IS NULL
+CREATE TABLE TitleIngestJob (
+    id                 INT IDENTITY(1,1) PRIMARY KEY,
+    project_id         INT NOT NULL,
+    file_path          NVARCHAR(500) NOT NULL,
+    state              NVARCHAR(20) NOT NULL DEFAULT 'queued',   -- queued, running, complete, failed
+    pages_total        INT NULL,
+    pages_done         INT NOT NULL DEFAULT 0,
+    title_document_id  INT NULL,
+    error              NVARCHAR(MAX) NULL,
+    created_at         DATETIME2(0) NOT NULL DEFAULT SYSDATETIME(),
+    updated_at         DATETIME2(0) NOT NULL DEFAULT SYSDATETIME(),
+    CONSTRAINT FK_TitleIngestJob_Project
+        FOREIGN KEY (project_id) REFERENCES Project(id)
+        ON DELETE CASCADE
+);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_TitleIngestJob_project_id' AND object_id = OBJECT_ID('dbo.TitleIngestJob')) CREATE INDEX ix_TitleIngestJob_project_id ON dbo.TitleIngestJob (project_id);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_TitleIngestJob_state' AND object_id = OBJECT_ID('dbo.TitleIngestJob')) CREATE INDEX ix_TitleIngestJob_state ON dbo.TitleIngestJob (state);
+
+------------------------------------------------------------
+-- 4. Encumbrance search index (fill with python reindex_encumbrances.py)
+------------------------------------------------------------
+
+IF OBJECT_ID('dbo.EncumbranceSearchTerm', 'U') IS NULL
+CREATE TABLE EncumbranceSearchTerm (
+    term            NVARCHAR(100) NOT NULL,
+    encumbrance_id  INT NOT NULL,
+    weight          INT NOT NULL,             -- occurrences, weighted by field
+    CONSTRAINT PK_EncumbranceSearchTerm
+        PRIMARY KEY (term, encumbrance_id),
+    CONSTRAINT FK_EncumbranceSearchTerm_EncumbranceRow
+        FOREIGN KEY (encumbrance_id) REFERENCES EncumbranceRow(id)
+        ON DELETE CASCADE
+);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_EncumbranceSearchTerm_term_weight' AND object_id = OBJECT_ID('dbo.EncumbranceSearchTerm')) CREATE INDEX ix_EncumbranceSearchTerm_term_weight ON dbo.EncumbranceSearchTerm (term, weight, encumbrance_id);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_EncumbranceSearchTerm_encumbrance_id' AND object_id = OBJECT_ID('dbo.EncumbranceSearchTerm')) CREATE INDEX ix_EncumbranceSearchTerm_encumbrance_id ON dbo.EncumbranceSearchTerm (encumbrance_id);
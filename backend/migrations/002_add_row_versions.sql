@@ -0,0 +1,11 @@
+------------------------------------------------------------
+-- 002. Row versions for optimistic concurrency
+-- Every update of an encumbrance or document task increments its version;
+-- the bulk PATCH endpoints reject rows whose version has moved on since the
+-- client read them. Existing rows start at version 1.
+--     python init_database.py migrations/002_add_row_versions.sql
+------------------------------------------------------------
+
+IF COL_LENGTH('dbo.EncumbranceRow', 'version') IS NULL ALTER TABLE dbo.EncumbranceRow ADD version INT NOT NULL CONSTRAINT DF_EncumbranceRow_version DEFAULT 1;
+
+IF COL_LENGTH('dbo.DocumentTaskRow', 'version') IS NULL ALTER TABLE dbo.DocumentTaskRow ADD version INT NOT NULL CONSTRAINT DF_DocumentTaskRow_version DEFAULT 1;
@@ -0,0 +1,10 @@
+------------------------------------------------------------
+-- 003. Project data version for conditional GETs
+-- Every write to a project, its titles, encumbrances or document tasks
+-- increments Project.data_version; the project detail and list endpoints
+-- send it as an ETag and answer If-None-Match with 304 Not Modified.
+-- Existing projects start at version 1.
+--     python init_database.py migrations/003_add_project_data_version.sql
+------------------------------------------------------------
+
+IF COL_LENGTH('dbo.Project', 'data_version') IS NULL ALTER TABLE dbo.Project ADD data_version INT NOT NULL CONSTRAINT DF_Project_data_version DEFAULT 1;
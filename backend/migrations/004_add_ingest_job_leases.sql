@@ -0,0 +1,11 @@
+------------------------------------------------------------
+-- 004. Ingestion job claims
+-- A worker process claims a title ingestion job by setting its owner and
+-- lease in one conditional UPDATE, so jobs requeued at startup are run by
+-- one process only. Existing jobs start unclaimed.
+--     python init_database.py migrations/004_add_ingest_job_leases.sql
+------------------------------------------------------------
+
+IF COL_LENGTH('dbo.TitleIngestJob', 'owner') IS NULL ALTER TABLE dbo.TitleIngestJob ADD owner NVARCHAR(100) NULL;
+
+IF COL_LENGTH('dbo.TitleIngestJob', 'lease_until') IS NULL ALTER TABLE dbo.TitleIngestJob ADD lease_until DATETIME2(0) NULL;
@@ -0,0 +1,22 @@
+------------------------------------------------------------
+-- 005. Document generation runs
+-- The latest document generation batch of each project, so every worker
+-- process reports the same progress and only one of them can run a
+-- project's batch at a time.
+--     python init_database.py migrations/005_add_document_generation_runs.sql
+------------------------------------------------------------
+
+IF OBJECT_ID('dbo.DocumentGenerationRun', 'U') IS NULL
+CREATE TABLE DocumentGenerationRun (
+    project_id   INT NOT NULL PRIMARY KEY,
+    state        NVARCHAR(20) NOT NULL,        -- running, complete, failed
+    total        INT NOT NULL DEFAULT 0,
+    done         INT NOT NULL DEFAULT 0,
+    failed       INT NOT NULL DEFAULT 0,
+    lease_until  DATETIME2(0) NULL,
+    started_at   DATETIME2(0) NOT NULL DEFAULT SYSDATETIME(),
+    finished_at  DATETIME2(0) NULL,
+    CONSTRAINT FK_DocumentGenerationRun_Project
+        FOREIGN KEY (project_id) REFERENCES Project(id)
+        ON DELETE CASCADE
+);
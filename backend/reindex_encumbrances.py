@@ -0,0 +1,25 @@
+"""
+Rebuild the encumbrance search index from the encumbrance table.
+Run once after creating the EncumbranceSearchTerm table, or whenever the
+index may have drifted (e.g. after editing encumbrances directly in SQL).
+New and edited encumbrances are indexed by the application as they are saved.
+"""
+import time
+from app.database import SessionLocal
+from app.services.encumbrance_search import EncumbranceSearchService
+
+
+def reindex_encumbrances():
+    """Rebuild the index in committed batches."""
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        indexed = EncumbranceSearchService.rebuild(db)
+        print(f"✓ Indexed {indexed} encumbrance(s) in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("Rebuilding the encumbrance search index...")
+    reindex_encumbrances()
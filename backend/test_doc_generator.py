@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Check placeholder substitution in generated Word documents.
+Builds small documents in memory with python-docx, so no template files or
+database are needed.
+Run from backend directory: python test_doc_generator.py
+"""
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from docx import Document  # noqa: E402
+
+
+def _document(*runs):
+    """A document with one paragraph made of the given runs."""
+    doc = Document()
+    paragraph = doc.add_paragraph()
+    for text in runs:
+        paragraph.add_run(text)
+    return doc
+
+
+def test_find_and_replace():
+    """Placeholders with and without "%" are replaced, in one run or split across runs."""
+    print("Testing find and replace...")
+    from app.services.doc_generator import DocumentGeneratorService
+
+    # (name, runs, values, expected paragraph text)
+    cases = [
+        ("find text without %", ["Hello NAME here"], {"NAME": "Jane"}, "Hello Jane here"),
+        ("find text without % split across runs", ["Hello NA", "ME here"], {"NAME": "Jane"}, "Hello Jane here"),
+        ("replacement containing the find text", ["NAME"], {"NAME": "NAME NAME"}, "NAME NAME"),
+        ("% placeholder", ["Surveyor: %SURVEYOR%"], {"%SURVEYOR%": "J. Smith"}, "Surveyor: J. Smith"),
+        ("% placeholder split across runs", ["Surveyor: %SURV", "EYOR%."], {"%SURVEYOR%": "J. Smith"}, "Surveyor: J. Smith."),
+        ("% and plain find texts together", ["%FILE% for NAME"], {"%FILE%": "1000", "NAME": "Jane"}, "1000 for Jane"),
+    ]
+
+    failures = []
+    for name, runs, values, expected in cases:
+        doc = _document(*runs)
+        if len(values) == 1:
+            (find_text, replace_text), = values.items()
+            DocumentGeneratorService.doc_find_and_replace(doc, find_text, replace_text)
+        else:
+            DocumentGeneratorService.render_template(doc, values)
+        text = doc.paragraphs[0].text
+        if text == expected:
+            print(f"  ✓ {name}")
+        else:
+            failures.append(name)
+            print(f"  ✗ {name}: {text!r}")
+
+    assert not failures, f"Wrong substitution: {', '.join(failures)}"
+
+
+def main():
+    """Run the document generator check."""
+    try:
+        test_find_and_replace()
+    except AssertionError as e:
+        print(f"\n❌ {e}")
+        return 1
+    print("\n✨ Placeholders replaced")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
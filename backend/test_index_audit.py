@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Check that every foreign key is indexed in the models, and that the index
+audit notices an index or table missing from the database.
+Builds a temporary SQLite database from Base.metadata, audits it, then drops
+an index and a table and audits it again.
+Run from backend directory: python test_index_audit.py
+"""
+import sys
+import os
+import tempfile
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+
+def test_index_audit():
+    """A database built from the models passes the audit; a damaged one does not."""
+    print("Testing index audit...")
+    import app.models  # noqa: F401  (registers every table on Base.metadata)
+    from app.database import Base
+    from audit_indexes import audit_indexes
+
+    directory = tempfile.TemporaryDirectory()
+    engine = create_engine(f"sqlite:///{os.path.join(directory.name, 'index_audit.db')}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        failures = [str(finding) for finding in audit_indexes(engine)]
+        if failures:
+            for failure in failures:
+                print(f"  ✗ {failure}")
+        else:
+            print("  ✓ Every foreign key and model index is covered")
+
+        with engine.begin() as conn:
+            conn.execute(text('DROP INDEX "ix_EncumbranceRow_title_document_id"'))
+            conn.execute(text('DROP TABLE "EncumbranceSearchTerm"'))
+        found = {(finding.table, finding.columns) for finding in audit_indexes(engine)}
+        for expected in (("EncumbranceRow", ("title_document_id",)), ("EncumbranceSearchTerm", ())):
+            if expected in found:
+                print(f"  ✓ Reported missing {expected[0]} {', '.join(expected[1])}".rstrip())
+            else:
+                failures.append(f"missing {expected} not reported")
+                print(f"  ✗ Missing {expected[0]} {', '.join(expected[1])} not reported".rstrip())
+    finally:
+        engine.dispose()
+        directory.cleanup()
+
+    assert not failures, "Fix the model indexes above and try again"
+
+
+def main():
+    """Run the index audit check."""
+    try:
+        test_index_audit()
+    except AssertionError as e:
+        print(f"\n❌ {e}")
+        return 1
+    print("\n✨ Every foreign key has an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+"""
+Check that the project/title/document endpoints issue a fixed number of SQL
+statements regardless of how many rows they return.
+Seeds a temporary SQLite database with a small and a large project and
+serves it through both the sync and the async session dependencies, then
+checks that bulk updates and task renumbering cost the same however many
+rows they change. Separate tests check that bulk updates reject stale
+versions and other titles' or projects' rows and skip rows that would not
+change, that conditional GETs of a project's data are answered from its
+data version, that each page of a list has its own weak ETag, and that
+cached lookup tables are served without touching the database.
+Run from backend directory: python test_query_counts.py
+"""
+import sys
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+# Maximum statements per request, whatever the project size
+QUERY_BUDGETS = {
+    "/api/projects?limit=100": 1,
+    "/api/projects/summary?limit=100": 1,
+    "/api/projects/{project_id}": 4,
+    "/api/projects/by-number/{proj_num}": 4,
+    "/api/titles?project_id={project_id}&limit=100": 3,
+    "/api/titles/summary?project_id={project_id}&limit=100": 1,
+    "/api/documents?project_id={project_id}&limit=100": 2,
+}
+
+# PATCH path: (path listing the rows it updates, maximum statements to update them all)
+BULK_UPDATE_BUDGETS = {
+    "/api/titles/{title_id}/encumbrances": ("/api/titles/{title_id}/encumbrances", 4),
+    "/api/documents?project_id={project_id}": ("/api/documents?project_id={project_id}&limit=100", 4),
+}
+
+# Maximum statements to renumber every task of a project's category
+REORDER_BUDGET = 5
+
+# Answered 304 Not Modified after reading only the project's data version
+CONDITIONAL_GETS = [
+    "/api/projects/{project_id}",
+    "/api/projects/by-number/{proj_num}",
+    "/api/titles?project_id={project_id}&limit=100",
+    "/api/documents?project_id={project_id}&limit=100",
+]
+
+# Served from the lookup cache once it has been filled
+CACHED_LOOKUPS = [
+    "/api/lookups/encumbrance-actions",
+    "/api/lookups/encumbrance-statuses",
+    "/api/lookups/new-document-statuses",
+    "/api/documents/category",
+]
+
+
+def _seed(db, proj_num, titles, encumbrances_per_title, tasks):
+    """Create a project with the given number of titles, encumbrances and tasks."""
+    from app.models import (
+        Project, SurveyorALS, TitleDocument, Encumbrance, DocumentTask,
+        EncumbranceAction, EncumbranceStatus, DocumentTaskStatus,
+        DocumentCategory, LegalDocumentTemplate,
+    )
+
+    action = db.query(EncumbranceAction).first() or EncumbranceAction(code="CONSENT", label="Consent")
+    enc_status = db.query(EncumbranceStatus).first() or EncumbranceStatus(code="PREPARED", label="Prepared")
+    task_status = db.query(DocumentTaskStatus).first() or DocumentTaskStatus(code="PREPARED", label="Prepared")
+    category = db.query(DocumentCategory).first() or DocumentCategory(code="URW", name="Utility Right of Way")
+    template = db.query(LegalDocumentTemplate).first() or LegalDocumentTemplate(
+        file_path="templates/consent.docx", document_type="CONSENT"
+    )
+
+    project = Project(
+        proj_num=proj_num,
+        name=f"Project {proj_num}",
+        surveyor=SurveyorALS(name=f"Surveyor {proj_num}"),
+    )
+    for t in range(titles):
+        title_doc = TitleDocument(file_path=f"{proj_num}_{t}.pdf")
+        for e in range(encumbrances_per_title):
+            title_doc.encumbrances.append(
+                Encumbrance(item_no=e + 1, document_number=f"{t:03d} {e:03d} 000", action=action, status=enc_status)
+            )
+        project.title_documents.append(title_doc)
+    for d in range(tasks):
+        project.document_tasks.append(
+            DocumentTask(
+                item_no=d + 1,
+                doc_desc=f"Task {d}",
+                category=category,
+                document_status=task_status,
+                legal_document_template=template,
+            )
+        )
+    db.add(project)
+    db.commit()
+    return project.id
+
+
+@contextmanager
+def _serve():
+    """
+    Serve the app from a temporary SQLite database seeded with a small and a large project.
+
+    Yields:
+        (TestClient, {"small"/"large": (proj_num, project_id)}, list of executed statements)
+    """
+    from fastapi.testclient import TestClient
+    from app.database import Base, get_db, get_async_db
+    from app.main import app
+    from app.services.lookup_cache import LookupCacheService
+
+    directory = tempfile.TemporaryDirectory()
+    db_path = os.path.join(directory.name, "query_counts.db")
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    AsyncTestingSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    db = TestingSession()
+    projects = {
+        "small": ("1000.0001.00", _seed(db, "1000.0001.00", titles=1, encumbrances_per_title=2, tasks=2)),
+        "large": ("1000.0002.00", _seed(db, "1000.0002.00", titles=6, encumbrances_per_title=40, tasks=30)),
+    }
+    db.close()
+
+    def override_get_db():
+        session = TestingSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as session:
+            yield session
+
+    statements = []
+    for counted_engine in (engine, async_engine.sync_engine):
+        event.listen(counted_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    LookupCacheService.clear()
+    try:
+        yield TestClient(app), projects, statements
+    finally:
+        LookupCacheService.clear()
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
+        engine.dispose()
+        directory.cleanup()
+
+
+def test_query_counts():
+    """Every endpoint stays within its statement budget for small and large projects."""
+    print("Testing query counts...")
+    passed = True
+    with _serve() as (client, projects, statements):
+        for path, budget in QUERY_BUDGETS.items():
+            counts = {}
+            for size, (proj_num, project_id) in projects.items():
+                url = path.format(project_id=project_id, proj_num=proj_num)
+                statements.clear()
+                response = client.get(url)
+                assert response.status_code == 200, f"{url} returned {response.status_code}"
+                counts[size] = len(statements)
+
+            ok = counts["small"] == counts["large"] and counts["large"] <= budget
+            passed = passed and ok
+            mark = "✓" if ok else "✗"
+            print(f"  {mark} {path}: {counts['small']} / {counts['large']} statements (budget {budget})")
+
+        for path, (list_path, budget) in BULK_UPDATE_BUDGETS.items():
+            counts = {}
+            for size, (proj_num, project_id) in projects.items():
+                title_id = client.get(f"/api/titles?project_id={project_id}").json()[0]["id"]
+                rows = client.get(list_path.format(project_id=project_id, title_id=title_id)).json()
+                url = path.format(project_id=project_id, title_id=title_id)
+                statements.clear()
+                response = client.patch(url, json=[
+                    {"id": row["id"], "version": row["version"], "circulation_notes": "Sent"} for row in rows
+                ])
+                assert response.status_code == 200, f"PATCH {url} returned {response.status_code}"
+                assert len(response.json()) == len(rows), f"PATCH {url} did not update every row"
+                counts[size] = len(statements)
+
+            ok = counts["small"] == counts["large"] and counts["large"] <= budget
+            passed = passed and ok
+            mark = "✓" if ok else "✗"
+            print(f"  {mark} PATCH {path}: {counts['small']} / {counts['large']} statements (budget {budget})")
+
+        counts = {}
+        for size, (proj_num, project_id) in projects.items():
+            tasks = client.get(f"/api/documents?project_id={project_id}&limit=100").json()
+            statements.clear()
+            response = client.post("/api/documents/reorder", json={
+                "project_id": project_id,
+                "category_id": tasks[0]["category_id"],
+                "task_ids": [task["id"] for task in reversed(tasks)],
+            })
+            assert response.status_code == 200, f"reorder returned {response.status_code}"
+            assert [task["item_no"] for task in response.json()] == list(range(1, len(tasks) + 1))
+            counts[size] = len(statements)
+
+        ok = counts["small"] == counts["large"] and counts["large"] <= REORDER_BUDGET
+        passed = passed and ok
+        mark = "✓" if ok else "✗"
+        print(f"  {mark} POST /api/documents/reorder: {counts['small']} / {counts['large']} statements (budget {REORDER_BUDGET})")
+
+    assert passed, "Statement count depends on row count or exceeds budget"
+
+
+def test_bulk_update_conflicts():
+    """
+    A stale version conflicts and writes nothing, another title's or project's
+    row is not found, and a row whose fields are already set is left out and
+    keeps its version.
+    """
+    print("Testing bulk update conflicts...")
+    with _serve() as (client, projects, statements):
+        ids = {}
+        for size, (proj_num, project_id) in projects.items():
+            ids[size] = (project_id, client.get(f"/api/titles?project_id={project_id}").json()[0]["id"])
+
+        for path, (list_path, budget) in BULK_UPDATE_BUDGETS.items():
+            url = path.format(project_id=ids["small"][0], title_id=ids["small"][1])
+            small_list = list_path.format(project_id=ids["small"][0], title_id=ids["small"][1])
+            first, second = client.get(small_list).json()[:2]
+            other = client.get(list_path.format(project_id=ids["large"][0], title_id=ids["large"][1])).json()[0]
+
+            response = client.patch(url, json=[
+                {"id": first["id"], "version": first["version"], "circulation_notes": "Returned"},
+                {"id": second["id"], "version": second["version"] - 1, "circulation_notes": "Returned"},
+            ])
+            assert response.status_code == 409, f"PATCH {url} with a stale version returned {response.status_code}"
+            assert client.get(small_list).json()[:2] == [first, second], f"PATCH {url} wrote rows despite a conflict"
+
+            response = client.patch(url, json=[
+                {"id": other["id"], "version": other["version"], "circulation_notes": "Returned"},
+            ])
+            assert response.status_code == 404, f"PATCH {url} with a foreign row returned {response.status_code}"
+
+            response = client.patch(url, json=[
+                {"id": first["id"], "version": first["version"], "circulation_notes": first["circulation_notes"]},
+                {"id": second["id"], "version": second["version"], "circulation_notes": "Returned"},
+            ])
+            assert response.status_code == 200, f"PATCH {url} returned {response.status_code}"
+            assert [row["id"] for row in response.json()] == [second["id"]], f"PATCH {url} returned unchanged rows"
+            unchanged = client.get(small_list).json()[0]
+            assert unchanged["version"] == first["version"], f"PATCH {url} bumped the version of an unchanged row"
+            print(f"  ✓ PATCH {path}: 409 on a stale version, 404 on a foreign row, unchanged rows skipped")
+
+
+def test_conditional_gets():
+    """A current ETag gets 304 after reading only the data version; any write changes the ETag."""
+    print("Testing conditional GETs...")
+    passed = True
+    with _serve() as (client, projects, statements):
+        proj_num, project_id = projects["large"]
+        for path in CONDITIONAL_GETS:
+            url = path.format(project_id=project_id, proj_num=proj_num)
+            etag = client.get(url).headers["etag"]
+            statements.clear()
+            response = client.get(url, headers={"If-None-Match": etag})
+            ok = response.status_code == 304 and len(statements) == 1
+            passed = passed and ok
+            mark = "✓" if ok else "✗"
+            print(f"  {mark} {path} (not modified): {len(statements)} statements (budget 1)")
+
+        etag = client.get(f"/api/projects/{project_id}").headers["etag"]
+        task = client.get(f"/api/documents?project_id={project_id}&limit=1").json()[0]
+        client.put(f"/api/documents/{task['id']}", json={"circulation_notes": "Returned"})
+        response = client.get(f"/api/projects/{project_id}", headers={"If-None-Match": etag})
+        ok = response.status_code == 200 and response.headers["etag"] != etag
+        passed = passed and ok
+        mark = "✓" if ok else "✗"
+        print(f"  {mark} /api/projects/{{project_id}} after a task update: {response.status_code}, new ETag")
+
+    assert passed, "A conditional GET loaded rows or kept its ETag after a write"
+
+
+def test_list_etags():
+    """Each page of a list has its own weak ETag."""
+    print("Testing list ETags...")
+    with _serve() as (client, projects, statements):
+        proj_num, project_id = projects["large"]
+        first = client.get(f"/api/titles?project_id={project_id}&limit=1").headers["etag"]
+        second = client.get(f"/api/titles?project_id={project_id}&limit=1&skip=1").headers["etag"]
+        response = client.get(f"/api/titles?project_id={project_id}&limit=1&skip=1", headers={"If-None-Match": first})
+        assert first.startswith('W/"'), f"List ETag {first} is not weak"
+        assert first != second, "Two pages of a list share an ETag"
+        assert response.status_code == 200, f"Another page's ETag returned {response.status_code}"
+        print("  ✓ /api/titles pages: weak ETags, another page's ETag gives 200")
+
+
+def test_cached_lookups():
+    """Lookup tables are answered from the cache without touching the database."""
+    print("Testing cached lookups...")
+    passed = True
+    with _serve() as (client, projects, statements):
+        for path in CACHED_LOOKUPS:
+            etag = client.get(path).headers["etag"]  # fills the cache
+            statements.clear()
+            response = client.get(path, headers={"If-None-Match": etag})
+            ok = response.status_code == 304 and not statements
+            passed = passed and ok
+            mark = "✓" if ok else "✗"
+            print(f"  {mark} {path} (cached): {len(statements)} statements (budget 0)")
+
+    assert passed, "A cached lookup read the database"
+
+
+def main():
+    """Run the query count checks."""
+    failures = []
+    for test in (
+        test_query_counts,
+        test_bulk_update_conflicts,
+        test_conditional_gets,
+        test_list_etags,
+        test_cached_lookups,
+    ):
+        try:
+            test()
+        except AssertionError as e:
+            failures.append(f"{test.__name__}: {e}")
+    if failures:
+        for failure in failures:
+            print(f"\n❌ {failure}")
+        return 1
+    print("\n✨ All endpoints within their query budgets")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())